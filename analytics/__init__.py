@@ -0,0 +1,136 @@
+"""
+Package d'analyse quantitative des portefeuilles
+"""
+
+from .bootstrap import (
+    stationary_bootstrap_indices,
+    circular_bootstrap_indices,
+    iter_bootstrap_indices,
+    iter_bootstrap_moments,
+    bootstrap_moments,
+    bootstrap_confidence_intervals
+)
+
+from .risk_measures import (
+    RISK_MEASURE_CODES,
+    RISK_MEASURE_ALIASES,
+    resolve_risk_measure,
+    risk_measures,
+    portfolio_risk
+)
+
+from .attribution import (
+    ANALYTIC_CODES,
+    risk_contributions
+)
+
+from .reports import (
+    portfolio_summary,
+    comparison_summary,
+    descriptive_table,
+    performance_table
+)
+
+from .rolling import (
+    rolling_volatility,
+    rolling_sharpe,
+    rolling_beta,
+    rolling_correlation,
+    drawdown_series,
+    rolling_analytics
+)
+
+from .clustering import (
+    CODEPENDENCE_METHODS,
+    codependence_matrix,
+    correlation_distance,
+    hierarchical_clustering,
+    block_average,
+    dendrogram_coordinates
+)
+
+from .statistics import (
+    STAT_COLUMNS,
+    asset_statistics
+)
+
+from .export import (
+    REPORT_SHEETS,
+    REPORT_FORMATS,
+    report_sheets,
+    write_xlsx_report,
+    write_parquet_bundle,
+    export_report
+)
+
+from .frequency import (
+    FREQUENCY_RULES,
+    DEFAULT_PERIODS,
+    STANDARD_PERIODS,
+    resample_prices,
+    periods_per_year
+)
+
+from .synthetic import (
+    synthetic_clusters,
+    synthetic_returns,
+    synthetic_prices
+)
+
+__all__ = [
+    # Bootstrap
+    'stationary_bootstrap_indices',
+    'circular_bootstrap_indices',
+    'iter_bootstrap_indices',
+    'iter_bootstrap_moments',
+    'bootstrap_moments',
+    'bootstrap_confidence_intervals',
+    # Risk measures
+    'RISK_MEASURE_CODES',
+    'RISK_MEASURE_ALIASES',
+    'resolve_risk_measure',
+    'risk_measures',
+    'portfolio_risk',
+    # Risk attribution
+    'ANALYTIC_CODES',
+    'risk_contributions',
+    # Reports
+    'portfolio_summary',
+    'comparison_summary',
+    'descriptive_table',
+    'performance_table',
+    # Rolling analytics
+    'rolling_volatility',
+    'rolling_sharpe',
+    'rolling_beta',
+    'rolling_correlation',
+    'drawdown_series',
+    'rolling_analytics',
+    # Clustering
+    'CODEPENDENCE_METHODS',
+    'codependence_matrix',
+    'correlation_distance',
+    'hierarchical_clustering',
+    'block_average',
+    'dendrogram_coordinates',
+    # Statistics
+    'STAT_COLUMNS',
+    'asset_statistics',
+    # Export
+    'REPORT_SHEETS',
+    'REPORT_FORMATS',
+    'report_sheets',
+    'write_xlsx_report',
+    'write_parquet_bundle',
+    'export_report',
+    # Frequency
+    'FREQUENCY_RULES',
+    'DEFAULT_PERIODS',
+    'STANDARD_PERIODS',
+    'resample_prices',
+    'periods_per_year',
+    # Synthetic data
+    'synthetic_clusters',
+    'synthetic_returns',
+    'synthetic_prices'
+]
@@ -0,0 +1,163 @@
+"""
+Décomposition du risque : contributions marginales et contributions au risque par actif
+"""
+
+import numpy as np
+import pandas as pd
+
+from .risk_measures import resolve_risk_measure, risk_measures
+
+
+# Mesures décomposées analytiquement ; les autres le sont par différences finies
+ANALYTIC_CODES = ['MV', 'variance', 'WR', 'VaR', 'CVaR', 'MDD', 'DaR', 'CDaR']
+
+
+def _tail_weights(losses, code, alpha):
+    """
+    Poids des scénarios dans le sous-gradient d'une mesure de queue (pertes positives)
+
+    Pour la CVaR historique de Riskfolio-Lib, avec index = ceil(alpha T) - 1, les index
+    pires scénarios reçoivent 1 / (alpha T) et le scénario de rang index (la VaR) reçoit
+    1 - index / (alpha T) ; la VaR, le pire cas et le drawdown maximum ne retiennent que
+    le scénario correspondant. Dans tous les cas sum(poids x pertes) = mesure.
+    """
+    T, K = losses.shape
+    cols = np.arange(K)
+    weights = np.zeros((T, K))
+
+    if code in ('WR', 'MDD'):
+        weights[losses.argmax(axis=0), cols] = 1.0
+        return weights
+
+    index = int(np.ceil(alpha * T) - 1)
+    order = np.argpartition(-losses, index, axis=0)
+    weights[order[index], cols] = 1.0
+    if code in ('CVaR', 'CDaR'):
+        weights[order[index], cols] -= index / (alpha * T)
+        if index > 0:
+            weights[order[:index], cols] = 1.0 / (alpha * T)
+    return weights
+
+
+def _analytic_gradients(X, W, code, alpha):
+    """Gradient (ou sous-gradient) de la mesure par rapport aux poids, forme (N, K)"""
+    T = X.shape[0]
+
+    if code in ('MV', 'variance'):
+        centered = X - X.mean(axis=0)
+        sigma_w = centered.T @ (centered @ W) / (T - 1)
+        variance = (W * sigma_w).sum(axis=0)
+        if code == 'variance':
+            return 2 * sigma_w
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return sigma_w / np.sqrt(variance)
+
+    if code in ('WR', 'VaR', 'CVaR'):
+        # Perte du scénario t : -x_t . w, de gradient -x_t
+        losses = -(X @ W)
+        return -X.T @ _tail_weights(losses, code, alpha)
+
+    # Drawdowns non composés : dd_t = nav_pic(t) - nav_t avec nav = 1 + cumsum(X) w
+    # (pic initial à 1), de gradient C_pic(t) - C_t où C = cumsum(X) précédé d'une ligne nulle
+    C = np.vstack([np.zeros((1, X.shape[1])), np.cumsum(X, axis=0)])
+    nav = C @ W
+    steps = np.arange(T + 1)[:, None]
+    is_peak = nav >= np.maximum.accumulate(nav, axis=0)
+    peak_idx = np.maximum.accumulate(np.where(is_peak, steps, 0), axis=0)
+    dd = nav[peak_idx, np.arange(W.shape[1])] - nav
+
+    A = _tail_weights(dd[1:], code, alpha)
+    # Report des poids des scénarios sur leur date de pic
+    B = np.zeros((T + 1, W.shape[1]))
+    cols = np.broadcast_to(np.arange(W.shape[1]), A.shape)
+    np.add.at(B, (peak_idx[1:], cols), A)
+    return C.T @ B - C[1:].T @ A
+
+
+def _numerical_gradients(returns, W, code, step=1e-6, max_block_bytes=64 * 2**20, **kwargs):
+    """Gradient par différences finies centrées, évalué par lots d'actifs vectorisés"""
+    X = returns.to_numpy(dtype=float)
+    T, N = X.shape
+    K = W.shape[1]
+    grads = np.empty((N, K))
+    block = int(max(1, max_block_bytes // (T * 2 * K * 8)))
+    base = X @ W
+
+    for start in range(0, N, block):
+        assets = np.arange(start, min(start + block, N))
+        # Colonnes : (actif, portefeuille) décalés de +step puis de -step
+        shift = X[:, assets, None] * step
+        plus = (base[:, None, :] + shift).reshape(T, -1)
+        minus = (base[:, None, :] - shift).reshape(T, -1)
+        values = risk_measures(np.hstack([plus, minus]), [code], **kwargs).iloc[:, 0].to_numpy()
+        half = len(assets) * K
+        grads[assets] = ((values[:half] - values[half:]) / (2 * step)).reshape(len(assets), K)
+
+    return grads
+
+
+def risk_contributions(returns, weights, measure='MV', alpha=0.05, **kwargs):
+    """
+    Contributions marginales et contributions au risque de chaque actif
+
+    Les contributions au risque sont w_i x dRisque/dw_i (décomposition d'Euler) : pour
+    une mesure homogène de degré 1 (écart-type, CVaR, CDaR, ...) leur somme est égale au
+    risque du portefeuille. L'écart-type est décomposé analytiquement, la VaR, la CVaR,
+    le pire cas et les drawdowns non composés (MDD, DaR, CDaR) par les sous-gradients de
+    leurs scénarios de queue ; les autres mesures par différences finies. Le calcul est
+    vectorisé sur les actifs et sur les K portefeuilles (frontière, dates de backtest).
+
+    Parameters:
+    -----------
+    returns : pd.DataFrame
+        Rendements des actifs (T x N)
+    weights : pd.DataFrame, pd.Series ou np.ndarray
+        Poids des portefeuilles (N x K ou N), alignés sur les colonnes de returns
+    measure : str
+        Code de la mesure de risque (code Riskfolio-Lib ou code HRP/HERC de l'application)
+    alpha : float
+        Niveau de signification des mesures de queue
+    **kwargs :
+        Paramètres transmis à risk_measures pour les mesures non analytiques
+
+    Returns:
+    --------
+    dict : {'risk': np.ndarray (K,), 'marginal': pd.DataFrame (N x K),
+            'component': pd.DataFrame (N x K), 'percent': pd.DataFrame (N x K)}
+    """
+    code = resolve_risk_measure(measure)
+
+    if isinstance(weights, (pd.DataFrame, pd.Series)):
+        weights = weights.reindex(returns.columns).fillna(0.0)
+        columns = weights.columns if isinstance(weights, pd.DataFrame) else [weights.name or 0]
+    else:
+        columns = None
+    W = np.asarray(weights, dtype=float)
+    if W.ndim == 1:
+        W = W.reshape(-1, 1)
+    if columns is None:
+        columns = range(W.shape[1])
+
+    if code in ANALYTIC_CODES:
+        grads = _analytic_gradients(returns.to_numpy(dtype=float), W, code, alpha)
+    else:
+        grads = _numerical_gradients(returns, W, code, alpha=alpha, **kwargs)
+
+    component = W * grads
+    if code == 'variance':
+        # Variance homogène de degré 2 : sum(w x grad) = 2 x variance
+        component = component / 2
+    risk = risk_measures(returns.to_numpy(dtype=float) @ W, [code], alpha=alpha, **kwargs).iloc[:, 0].to_numpy()
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        percent = component / component.sum(axis=0)
+
+    def frame(values):
+        return pd.DataFrame(values, index=returns.columns, columns=columns)
+
+    return {
+        'risk': risk,
+        'marginal': frame(grads),
+        'component': frame(component),
+        'percent': frame(percent)
+    }
@@ -0,0 +1,388 @@
+"""
+Bootstrap par blocs (stationnaire, circulaire) et intervalles de confiance des portefeuilles
+"""
+
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+
+from .frequency import DEFAULT_PERIODS
+
+
+METRIC_NAMES = ['Rendement Annuel Attendu', 'Volatilité Annuelle', 'Ratio de Sharpe']
+
+# État partagé par les workers (initialisé une seule fois par processus)
+_WORKER_STATE = {}
+
+# Marque les threads workers de _map_blocks (thread principal d'un processus worker,
+# ou thread d'un pool de threads) : un calcul imbriqué y reste séquentiel
+_WORKER_THREAD = threading.local()
+
+
+def stationary_bootstrap_indices(n_obs, n_samples, window=10, rng=None):
+    """
+    Génère des indices de rééchantillonnage par bootstrap stationnaire (Politis & Romano)
+
+    Les longueurs de blocs suivent une loi géométrique de moyenne `window`. Toutes les
+    séries d'un lot sont générées en une seule passe vectorisée.
+
+    Parameters:
+    -----------
+    n_obs : int
+        Nombre d'observations T de la série d'origine
+    n_samples : int
+        Nombre de rééchantillonnages à générer dans ce lot
+    window : float
+        Longueur moyenne des blocs
+    rng : np.random.Generator, int ou None
+        Générateur aléatoire ou graine
+
+    Returns:
+    --------
+    np.ndarray : matrice (n_samples, n_obs) d'indices dans [0, n_obs)
+    """
+    rng = np.random.default_rng(rng)
+    t = np.arange(n_obs)
+
+    # Début d'un nouveau bloc avec probabilité 1/window (toujours en t=0)
+    new_block = rng.random((n_samples, n_obs)) < 1.0 / window
+    new_block[:, 0] = True
+    starts = rng.integers(0, n_obs, size=(n_samples, n_obs))
+
+    # Position du début du bloc courant pour chaque t
+    block_start = np.where(new_block, t, 0)
+    np.maximum.accumulate(block_start, axis=1, out=block_start)
+
+    start_idx = np.take_along_axis(starts, block_start, axis=1)
+    return (start_idx + (t - block_start)) % n_obs
+
+
+def circular_bootstrap_indices(n_obs, n_samples, window=10, rng=None):
+    """
+    Génère des indices de rééchantillonnage par bootstrap circulaire par blocs
+
+    Les blocs ont une longueur fixe `window` et reviennent au début de la série
+    lorsqu'ils dépassent la dernière observation.
+
+    Parameters:
+    -----------
+    n_obs : int
+        Nombre d'observations T de la série d'origine
+    n_samples : int
+        Nombre de rééchantillonnages à générer dans ce lot
+    window : int
+        Longueur des blocs
+    rng : np.random.Generator, int ou None
+        Générateur aléatoire ou graine
+
+    Returns:
+    --------
+    np.ndarray : matrice (n_samples, n_obs) d'indices dans [0, n_obs)
+    """
+    rng = np.random.default_rng(rng)
+    window = int(window)
+    n_blocks = -(-n_obs // window)
+    starts = rng.integers(0, n_obs, size=(n_samples, n_blocks, 1))
+    indices = (starts + np.arange(window)) % n_obs
+    return indices.reshape(n_samples, n_blocks * window)[:, :n_obs]
+
+
+BOOTSTRAP_KINDS = {
+    'stationary': stationary_bootstrap_indices,
+    'circular': circular_bootstrap_indices
+}
+
+
+def iter_bootstrap_indices(n_obs, n_samples, window=10, block_size=50, seed=0, kind='stationary'):
+    """
+    Itère sur les indices bootstrap par lots de `block_size` rééchantillonnages
+
+    La mémoire reste bornée à block_size x n_obs indices quel que soit n_samples.
+    """
+    if kind not in BOOTSTRAP_KINDS:
+        raise ValueError(f"Méthode de bootstrap non reconnue: {kind}")
+    generate = BOOTSTRAP_KINDS[kind]
+    rng = np.random.default_rng(seed)
+    for start in range(0, n_samples, block_size):
+        yield generate(n_obs, min(block_size, n_samples - start), window, rng)
+
+
+def portfolio_metrics(weights, mu, cov, rf, periods=DEFAULT_PERIODS):
+    """
+    Calcule rendement annuel, volatilité annuelle et ratio de Sharpe d'un portefeuille
+
+    Mêmes conventions que `portfolio_summary` (rf par période, annualisé avec periods).
+    """
+    ret = float(mu @ weights) * periods
+    vol = float(np.sqrt(weights @ cov @ weights)) * np.sqrt(periods)
+    sharpe = (ret - rf * periods) / vol if vol > 0 else 0.0
+    return ret, vol, sharpe
+
+
+def _make_state(returns, optimize_func, params):
+    """Regroupe les données nécessaires à la ré-optimisation d'un lot"""
+    return {
+        'values': returns.to_numpy(),
+        'index': returns.index,
+        'columns': returns.columns,
+        'optimize_func': optimize_func,
+        'params': params
+    }
+
+
+def _init_worker(state):
+    """Initialise l'état d'un worker (évite de renvoyer les données à chaque lot)"""
+    _WORKER_STATE.clear()
+    _WORKER_STATE.update(state)
+    _WORKER_THREAD.active = True
+
+
+def _map_blocks(func, blocks, state, n_jobs=None, executor='process'):
+    """
+    Applique func(indices, state) à chaque lot d'indices, en parallèle si n_jobs > 1
+
+    Le nombre de lots en vol est borné pour garder la mémoire constante. Les résultats
+    sont renvoyés dans un ordre quelconque. Appelé depuis un worker (par exemple une
+    estimation bootstrap dans une ré-optimisation bootstrap), le calcul est séquentiel :
+    un pool par worker occuperait jusqu'à n_jobs² processus. Si n_jobs vaut None, un
+    worker est démarré par cœur : depuis un serveur, passer une valeur bornée.
+    """
+    if getattr(_WORKER_THREAD, 'active', False):
+        n_jobs = 1
+    n_jobs = n_jobs or os.cpu_count() or 1
+
+    if n_jobs == 1:
+        for indices in blocks:
+            yield func(indices, state)
+        return
+
+    pool_cls = ProcessPoolExecutor if executor == 'process' else ThreadPoolExecutor
+    pool = pool_cls(max_workers=n_jobs, initializer=_init_worker, initargs=(state,))
+    try:
+        pending = set()
+        for indices in blocks:
+            pending.add(pool.submit(func, indices))
+            if len(pending) >= 2 * n_jobs:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        for future in pending:
+            yield future.result()
+    except BaseException:
+        # Annulation (JobCancelled levée par le consommateur, générateur fermé) ou échec
+        # d'un lot : les lots en attente sont abandonnés sans attendre les lots en cours
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    pool.shutdown(wait=True)
+
+
+def _solve_block(indices, state=None):
+    """Ré-optimise le portefeuille pour chaque ligne d'indices d'un lot"""
+    state = _WORKER_STATE if state is None else state
+    values = state['values']
+    optimize_func = state['optimize_func']
+    params = state['params']
+    n_assets = values.shape[1]
+
+    weights = np.full((len(indices), n_assets), np.nan)
+    metrics = np.full((len(indices), len(METRIC_NAMES)), np.nan)
+
+    for i, idx in enumerate(indices):
+        sample_values = values[idx]
+        sample = pd.DataFrame(sample_values, index=state['index'], columns=state['columns'])
+        try:
+            w, _, _ = optimize_func(returns=sample, **params)
+        except Exception:
+            w = None
+        if w is None or w.sum().sum() == 0:
+            continue
+
+        w_vec = w.reindex(state['columns']).iloc[:, 0].to_numpy(dtype=float)
+        weights[i] = w_vec
+        metrics[i] = portfolio_metrics(
+            w_vec,
+            sample_values.mean(axis=0),
+            np.cov(sample_values, rowvar=False),
+            params['rf'],
+            state['periods']
+        )
+
+    return weights, metrics
+
+
+def bootstrap_confidence_intervals(returns, optimize_func, risk_measure, rf, n_samples=1000,
+                                   window=10, alpha=0.05, block_size=50, n_jobs=None,
+                                   executor='process', seed=0, progress=None, periods=DEFAULT_PERIODS, **kwargs):
+    """
+    Intervalles de confiance bootstrap des poids et métriques d'un modèle quelconque
+
+    Les rendements sont rééchantillonnés par bootstrap stationnaire, puis le modèle est
+    ré-optimisé sur chaque échantillon en parallèle. Les intervalles sont les percentiles
+    alpha/2 et 1-alpha/2 des distributions obtenues.
+
+    Parameters:
+    -----------
+    returns : pd.DataFrame
+        Matrice des rendements historiques
+    optimize_func : callable
+        Une des fonctions optimize_* du package models
+    risk_measure : str
+        Mesure de risque à utiliser
+    rf : float
+        Taux sans risque par période
+    n_samples : int
+        Nombre de rééchantillonnages
+    window : float
+        Longueur moyenne des blocs du bootstrap stationnaire
+    alpha : float
+        Niveau de signification des intervalles (0.05 pour 95%)
+    block_size : int
+        Nombre de rééchantillonnages générés et envoyés à un worker en une fois
+    n_jobs : int ou None
+        Nombre de workers (None = nombre de CPU, 1 = exécution séquentielle)
+    executor : str
+        'process' ou 'thread'
+    seed : int
+        Graine du générateur aléatoire
+    progress : callable ou None
+        progress(done, n_samples) appelé après chaque lot ; une exception levée par
+        progress interrompt le calcul (annulation)
+    periods : int
+        Nombre de périodes par an (annualisation des métriques)
+    **kwargs :
+        Paramètres additionnels transmis à optimize_func (risk_aversion, uncertainty, ...)
+
+    Returns:
+    --------
+    dict : {'weights': pd.DataFrame, 'metrics': pd.DataFrame,
+            'weights_samples': np.ndarray, 'metrics_samples': np.ndarray,
+            'n_samples': int, 'n_failed': int}
+    """
+    params = dict(kwargs, risk_measure=risk_measure, rf=rf)
+    blocks = iter_bootstrap_indices(len(returns), n_samples, window=window, block_size=block_size, seed=seed)
+    state = dict(_make_state(returns, optimize_func, params), periods=periods)
+
+    weights_parts = []
+    metrics_parts = []
+    done = 0
+    for w, m in _map_blocks(_solve_block, blocks, state, n_jobs=n_jobs, executor=executor):
+        weights_parts.append(w)
+        metrics_parts.append(m)
+        done += len(w)
+        if progress is not None:
+            progress(done, n_samples)
+
+    weights_samples = np.vstack(weights_parts)
+    metrics_samples = np.vstack(metrics_parts)
+    valid = ~np.isnan(metrics_samples).any(axis=1)
+    weights_samples = weights_samples[valid]
+    metrics_samples = metrics_samples[valid]
+
+    if len(weights_samples) == 0:
+        raise ValueError("Aucun rééchantillonnage n'a pu être optimisé.")
+
+    return {
+        'weights': _percentile_table(weights_samples, returns.columns, alpha),
+        'metrics': _percentile_table(metrics_samples, METRIC_NAMES, alpha),
+        'weights_samples': weights_samples,
+        'metrics_samples': metrics_samples,
+        'n_samples': int(valid.sum()),
+        'n_failed': int((~valid).sum())
+    }
+
+
+def _percentile_table(samples, index, alpha):
+    """Construit le tableau médiane / bornes à partir des échantillons bootstrap"""
+    lower, median, upper = np.percentile(samples, [alpha / 2 * 100, 50, (1 - alpha / 2) * 100], axis=0)
+    return pd.DataFrame({
+        'Médiane': median,
+        'Borne Inférieure': lower,
+        'Borne Supérieure': upper
+    }, index=index)
+
+
+def _moments_block(indices, state=None):
+    """Moyennes et covariances (triangle supérieur) de chaque rééchantillonnage d'un lot"""
+    state = _WORKER_STATE if state is None else state
+    values = state['values']
+    n_obs, n_assets = values.shape
+
+    samples = values[indices]
+    means = samples.mean(axis=1)
+    samples -= means[:, None, :]
+    covs = np.matmul(samples.transpose(0, 2, 1), samples) / (n_obs - 1)
+
+    rows, cols = np.triu_indices(n_assets)
+    return means, covs[:, rows, cols]
+
+
+def iter_bootstrap_moments(returns, n_sim=3000, window=3, kind='stationary', n_jobs=None,
+                           executor='process', seed=0, max_block_bytes=64 * 2**20):
+    """
+    Itère sur les moments bootstrap par lots de rééchantillonnages
+
+    La taille des lots est choisie pour que les tableaux d'un lot ((lot, T, N) pour les
+    séries, (lot, N, N) pour les covariances) tiennent dans `max_block_bytes` ; la
+    mémoire reste bornée quel que soit n_sim. Avec la même graine, deux itérations
+    produisent les mêmes rééchantillonnages (dans un ordre de lots quelconque si n_jobs > 1).
+
+    Parameters:
+    -----------
+    Voir bootstrap_moments
+
+    Returns:
+    --------
+    générateur de tuples (means, covs_triu) de formes (lot, N) et (lot, N(N+1)/2)
+    """
+    values = returns.to_numpy(dtype=float)
+    n_obs, n_assets = values.shape
+    sample_bytes = (n_obs * n_assets + 2 * n_assets ** 2) * 8
+    block_size = int(max(1, min(n_sim, max_block_bytes // sample_bytes)))
+    blocks = iter_bootstrap_indices(n_obs, n_sim, window=window, block_size=block_size,
+                                    seed=seed, kind=kind)
+    yield from _map_blocks(_moments_block, blocks, {'values': values}, n_jobs=n_jobs, executor=executor)
+
+
+def bootstrap_moments(returns, n_sim=3000, window=3, kind='stationary', n_jobs=None,
+                      executor='process', seed=0, max_block_bytes=64 * 2**20):
+    """
+    Distribution bootstrap du vecteur de moyennes et de la matrice de covariance
+
+    Les rééchantillonnages sont traités par lots (voir iter_bootstrap_moments) et les
+    lots sont répartis entre les workers ; le résultat conserve tous les
+    rééchantillonnages, iter_bootstrap_moments permet de les réduire au fil de l'eau.
+
+    Parameters:
+    -----------
+    returns : pd.DataFrame
+        Matrice des rendements historiques
+    n_sim : int
+        Nombre de rééchantillonnages
+    window : int
+        Longueur (moyenne pour 'stationary') des blocs
+    kind : str
+        'stationary' ou 'circular'
+    n_jobs : int ou None
+        Nombre de workers (None = nombre de CPU, 1 = exécution séquentielle)
+    executor : str
+        'process' ou 'thread'
+    seed : int
+        Graine du générateur aléatoire
+    max_block_bytes : int
+        Taille mémoire maximale d'un lot de rééchantillonnages
+
+    Returns:
+    --------
+    tuple : (means, covs_triu) de formes (n_sim, N) et (n_sim, N(N+1)/2)
+    """
+    means_parts = []
+    covs_parts = []
+    for means, covs in iter_bootstrap_moments(returns, n_sim=n_sim, window=window, kind=kind, n_jobs=n_jobs,
+                                              executor=executor, seed=seed, max_block_bytes=max_block_bytes):
+        means_parts.append(means)
+        covs_parts.append(covs)
+
+    return np.vstack(means_parts), np.vstack(covs_parts)
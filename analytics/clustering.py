@@ -0,0 +1,147 @@
+"""
+Classification hiérarchique des actifs (codépendance, distance, ordre des feuilles) et
+agrégation par blocs des matrices de grande taille
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# Mesures de codépendance (méthodes de pd.DataFrame.corr)
+CODEPENDENCE_METHODS = ('pearson', 'spearman', 'kendall')
+
+
+def codependence_matrix(returns, codependence='pearson'):
+    """
+    Matrice de codépendance (corrélation) des rendements
+
+    Parameters:
+    -----------
+    returns : pd.DataFrame
+        Matrice des rendements (T x N)
+    codependence : str
+        'pearson', 'spearman' ou 'kendall' (Pearson pour toute autre valeur)
+
+    Returns:
+    --------
+    pd.DataFrame : matrice N x N ; les corrélations indéfinies (série constante) valent 0
+    """
+    method = codependence if codependence in CODEPENDENCE_METHODS else 'pearson'
+    data = returns.to_numpy(dtype=float)
+    if method != 'kendall' and len(data) > 1 and not np.isnan(data).any():
+        # Sans valeur manquante : un produit matriciel (BLAS) au lieu de la boucle par
+        # paire de pandas ; Spearman est la corrélation de Pearson des rangs
+        if method == 'spearman':
+            data = returns.rank().to_numpy(dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values = np.atleast_2d(np.corrcoef(data, rowvar=False))
+    else:
+        values = returns.corr(method=method).to_numpy(dtype=float, copy=True)
+    values = np.nan_to_num(np.clip(values, -1.0, 1.0))
+    np.fill_diagonal(values, 1.0)
+    return pd.DataFrame(values, index=returns.columns, columns=returns.columns)
+
+
+def correlation_distance(corr):
+    """Distance angulaire d = sqrt((1 - ρ) / 2), comprise entre 0 et 1"""
+    return np.sqrt(np.clip(0.5 * (1.0 - np.asarray(corr, dtype=float)), 0.0, 1.0))
+
+
+def hierarchical_clustering(returns, linkage='ward', codependence='pearson'):
+    """
+    Classification hiérarchique des actifs sur la distance de corrélation
+
+    Parameters:
+    -----------
+    returns : pd.DataFrame
+        Matrice des rendements (T x N)
+    linkage : str
+        Méthode d'agrégation de scipy ('ward', 'single', 'complete', 'average', ...)
+    codependence : str
+        Mesure de codépendance (voir codependence_matrix)
+
+    Returns:
+    --------
+    dict : {'corr': matrice de codépendance, 'linkage': matrice de liaison scipy,
+            'order': actifs dans l'ordre des feuilles}
+    """
+    # scipy (0,5 s à l'import) n'est chargé qu'au premier appel
+    from scipy.cluster.hierarchy import leaves_list, linkage as sp_linkage
+    from scipy.spatial.distance import squareform
+
+    corr = codependence_matrix(returns, codependence)
+    if len(corr) < 2:
+        return {'corr': corr, 'linkage': np.empty((0, 4)), 'order': list(corr.columns)}
+    condensed = squareform(correlation_distance(corr.values), checks=False)
+    Z = sp_linkage(condensed, method=linkage)
+    return {'corr': corr, 'linkage': Z, 'order': list(corr.columns[leaves_list(Z)])}
+
+
+def block_average(matrix, n_blocks):
+    """
+    Moyenne d'une matrice carrée par blocs contigus de lignes et de colonnes
+
+    Appliquée à une matrice triée selon la classification, chaque bloc regroupe des
+    actifs voisins dans l'arbre : la structure par clusters reste lisible.
+
+    Parameters:
+    -----------
+    matrix : pd.DataFrame
+        Matrice carrée N x N
+    n_blocks : int
+        Nombre de blocs par côté (au plus N)
+
+    Returns:
+    --------
+    tuple : (np.ndarray n_blocks x n_blocks des moyennes,
+             liste des (premier, dernier, taille) de chaque bloc)
+    """
+    values = np.asarray(matrix, dtype=float)
+    n = len(values)
+    n_blocks = max(1, min(n_blocks, n))
+    starts = np.linspace(0, n, n_blocks + 1).astype(int)[:-1]
+    sizes = np.diff(np.append(starts, n))
+    sums = np.add.reduceat(np.add.reduceat(values, starts, axis=0), starts, axis=1)
+    labels = list(matrix.columns) if isinstance(matrix, pd.DataFrame) else list(range(n))
+    blocks = [(labels[start], labels[start + size - 1], int(size)) for start, size in zip(starts, sizes)]
+    return sums / np.outer(sizes, sizes), blocks
+
+
+def dendrogram_coordinates(linkage):
+    """
+    Segments du dendrogramme d'une matrice de liaison, à tracer en une seule ligne
+
+    Mêmes coordonnées que scipy.cluster.hierarchy.dendrogram (feuilles en 5, 15, 25, ...)
+    mais calculées en une passe sur les fusions, sans récursion ni dictionnaires
+    intermédiaires : chaque lien est un « ⊓ » de quatre points suivi d'un NaN qui
+    interrompt la ligne.
+
+    Parameters:
+    -----------
+    linkage : np.ndarray
+        Matrice de liaison scipy ((N - 1) x 4)
+
+    Returns:
+    --------
+    tuple : (x, y, leaf_positions) ; x et y de longueur 5 x (N - 1), positions des
+            feuilles dans l'ordre des feuilles
+    """
+    from scipy.cluster.hierarchy import leaves_list
+
+    Z = np.asarray(linkage, dtype=float)
+    n_leaves = len(Z) + 1
+    if len(Z) == 0:
+        return np.empty(0), np.empty(0), np.array([5.0])
+
+    position = np.zeros(2 * n_leaves - 1)
+    height = np.zeros(2 * n_leaves - 1)
+    position[leaves_list(Z)] = 5.0 + 10.0 * np.arange(n_leaves)
+    x = np.full((len(Z), 5), np.nan)
+    y = np.full((len(Z), 5), np.nan)
+    for i, (left, right, distance, _) in enumerate(Z):
+        left, right = int(left), int(right)
+        position[n_leaves + i] = 0.5 * (position[left] + position[right])
+        height[n_leaves + i] = distance
+        x[i, :4] = (position[left], position[left], position[right], position[right])
+        y[i, :4] = (height[left], distance, distance, height[right])
+    return x.ravel(), y.ravel(), 5.0 + 10.0 * np.arange(n_leaves)
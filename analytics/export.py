@@ -0,0 +1,154 @@
+"""
+Export des rapports d'optimisation : classeur XLSX multi-feuilles écrit en flux et lot
+de fichiers Parquet
+"""
+
+import io
+import zipfile
+
+import pandas as pd
+
+
+# Tables d'un rapport : nom de fichier (lot Parquet) -> titre de la feuille (XLSX)
+REPORT_SHEETS = {
+    'poids': "Poids",
+    'metriques': "Métriques",
+    'intervalles': "Intervalles",
+    'statistiques': "Statistiques",
+    'performance': "Performance",
+    'contributions': "Contributions",
+    'frontiere': "Frontière",
+    'frontiere_poids': "Frontière - Poids"
+}
+
+# Formats d'export : extension du fichier et type MIME
+REPORT_FORMATS = {
+    'xlsx': ('xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+    'parquet': ('zip', 'application/zip')
+}
+
+# Lignes converties à la fois lors de l'écriture d'une feuille
+CHUNK_ROWS = 2000
+
+
+def report_sheets(**tables):
+    """
+    Rassemble les tables d'un rapport dans l'ordre de REPORT_SHEETS
+
+    Parameters:
+    -----------
+    **tables : pd.DataFrame, pd.Series ou None
+        Tables nommées par les clés de REPORT_SHEETS (poids=..., performance=..., ...) ;
+        les tables absentes ou None sont ignorées, l'index est conservé en première colonne
+
+    Returns:
+    --------
+    dict : {nom: pd.DataFrame} aux colonnes de type str
+    """
+    unknown = set(tables) - set(REPORT_SHEETS)
+    if unknown:
+        raise ValueError(f"Tables de rapport non reconnues: {', '.join(sorted(unknown))}")
+
+    sheets = {}
+    for name in REPORT_SHEETS:
+        table = tables.get(name)
+        if table is None:
+            continue
+        frame = table.to_frame() if isinstance(table, pd.Series) else table
+        frame = frame.reset_index()
+        frame.columns = [str(column) for column in frame.columns]
+        sheets[name] = frame
+    return sheets
+
+
+def _cell_rows(frame, chunk_rows):
+    """Lignes de cellules Python (None pour les valeurs manquantes), converties par blocs"""
+    for start in range(0, len(frame), chunk_rows):
+        block = frame.iloc[start:start + chunk_rows].astype(object)
+        values = block.where(block.notna(), None).to_numpy()
+        for row in values.tolist():
+            yield [value.tz_localize(None) if isinstance(value, pd.Timestamp) and value.tz is not None
+                   else value for value in row]
+
+
+def _sheet_title(title):
+    # Excel : 31 caractères au plus, sans []:*?/\
+    for char in '[]:*?/\\':
+        title = title.replace(char, '-')
+    return title[:31]
+
+
+def write_xlsx_report(sheets, target, chunk_rows=CHUNK_ROWS):
+    """
+    Écrit un rapport XLSX, une feuille par table, avec un classeur en écriture seule
+
+    Le classeur en écriture seule d'openpyxl sérialise chaque ligne au fil de l'eau au
+    lieu de conserver un objet par cellule : la mémoire reste bornée par le bloc de
+    lignes en cours de conversion, quel que soit le nombre d'actifs.
+
+    Parameters:
+    -----------
+    sheets : dict
+        Tables du rapport (voir report_sheets)
+    target : str, Path ou fichier binaire
+        Destination du classeur
+    chunk_rows : int
+        Lignes converties à la fois
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    for name, frame in sheets.items():
+        sheet = workbook.create_sheet(title=_sheet_title(REPORT_SHEETS.get(name, name)))
+        sheet.append(list(frame.columns))
+        for row in _cell_rows(frame, chunk_rows):
+            sheet.append(row)
+    workbook.save(target)
+
+
+def write_parquet_bundle(sheets, target, chunk_rows=CHUNK_ROWS):
+    """
+    Écrit un lot Parquet : une archive ZIP contenant un fichier Parquet par table
+
+    Chaque fichier est écrit directement dans l'archive (sans fichier intermédiaire) par
+    groupes de chunk_rows lignes ; l'archive n'est pas recompressée, les fichiers Parquet
+    l'étant déjà.
+
+    Parameters:
+    -----------
+    sheets : dict
+        Tables du rapport (voir report_sheets)
+    target : str, Path ou fichier binaire
+        Destination de l'archive
+    chunk_rows : int
+        Lignes par groupe de lignes Parquet
+    """
+    with zipfile.ZipFile(target, 'w', compression=zipfile.ZIP_STORED) as archive:
+        for name, frame in sheets.items():
+            with archive.open(f"{name}.parquet", 'w', force_zip64=True) as handle:
+                frame.to_parquet(handle, index=False, row_group_size=chunk_rows)
+
+
+def export_report(sheets, fmt='xlsx'):
+    """
+    Produit le fichier d'un rapport en mémoire
+
+    Parameters:
+    -----------
+    sheets : dict
+        Tables du rapport (voir report_sheets)
+    fmt : str
+        'xlsx' (classeur multi-feuilles) ou 'parquet' (archive ZIP de fichiers Parquet)
+
+    Returns:
+    --------
+    bytes : contenu du fichier (extension et type MIME dans REPORT_FORMATS)
+    """
+    if fmt not in REPORT_FORMATS:
+        raise ValueError(f"Format d'export non reconnu: {fmt}")
+    buffer = io.BytesIO()
+    if fmt == 'xlsx':
+        write_xlsx_report(sheets, buffer)
+    else:
+        write_parquet_bundle(sheets, buffer)
+    return buffer.getvalue()
@@ -0,0 +1,86 @@
+"""
+Fréquence des données : rééchantillonnage des prix et facteur d'annualisation
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# Règles de rééchantillonnage des prix (dernier cours de chaque période)
+FREQUENCY_RULES = {
+    'daily': None,
+    'weekly': 'W-FRI',
+    'monthly': 'ME'
+}
+
+# Nombre de périodes par an sans index de dates exploitable (jours ouvrés)
+DEFAULT_PERIODS = 252
+
+# Fréquences usuelles (périodes par an) vers lesquelles la fréquence observée est arrondie
+STANDARD_PERIODS = (365, 252, 52, 12, 4, 1)
+
+# Écart relatif maximal entre la fréquence observée et la fréquence usuelle retenue
+_PERIODS_TOLERANCE = 0.2
+
+
+def resample_prices(prices, frequency='daily'):
+    """
+    Rééchantillonne des prix à la fréquence demandée
+
+    Parameters:
+    -----------
+    prices : pd.DataFrame
+        Prix (dates x actifs), index de dates
+    frequency : str
+        'daily' (prix inchangés), 'weekly' (dernier cours de chaque semaine, arrêtée
+        au vendredi) ou 'monthly' (dernier cours de chaque mois)
+
+    Returns:
+    --------
+    pd.DataFrame : prix à la fréquence demandée, datés du dernier jour coté de chaque période
+                   (ValueError si l'index n'est pas un index de dates)
+    """
+    if frequency not in FREQUENCY_RULES:
+        raise ValueError(f"Fréquence non reconnue: {frequency}")
+    rule = FREQUENCY_RULES[frequency]
+    if rule is None:
+        return prices
+    if not isinstance(prices.index, pd.DatetimeIndex):
+        raise ValueError(
+            "Les prix doivent être indexés par des dates pour être rééchantillonnés "
+            "(première colonne du fichier : dates)"
+        )
+    dates = pd.Series(prices.index, index=prices.index)
+    resampled = prices.resample(rule).last()
+    resampled.index = pd.DatetimeIndex(dates.resample(rule).last())
+    return resampled[resampled.index.notna()].dropna(how='all')
+
+
+def periods_per_year(index):
+    """
+    Nombre de périodes par an déduit des dates des données
+
+    Le nombre d'observations par année écoulée est arrondi à la fréquence usuelle la plus
+    proche (252 jours ouvrés, 52 semaines, 12 mois, ...) s'il s'en écarte de moins de
+    20 % ; sinon il est conservé tel quel (par exemple 365 pour des cotations continues).
+
+    Parameters:
+    -----------
+    index : pd.Index
+        Dates des rendements
+
+    Returns:
+    --------
+    int : facteur d'annualisation (DEFAULT_PERIODS sans index de dates ou avec moins de
+          trois dates)
+    """
+    if not isinstance(index, pd.DatetimeIndex) or len(index) < 3:
+        return DEFAULT_PERIODS
+    years = (index.max() - index.min()).days / 365.25
+    if years <= 0:
+        return DEFAULT_PERIODS
+    observed = (len(index) - 1) / years
+    nearest = min(STANDARD_PERIODS, key=lambda periods: abs(np.log(observed / periods)))
+    if abs(observed / nearest - 1) <= _PERIODS_TOLERANCE:
+        return nearest
+    return max(int(round(observed)), 1)
@@ -0,0 +1,160 @@
+"""
+Tableaux de résultats (métriques du portefeuille, statistiques et performance des actifs)
+
+Fonctions sans dépendance à l'interface, partagées par l'application et le mode batch.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .frequency import DEFAULT_PERIODS
+from .risk_measures import RELATIVISTIC_CODES, resolve_risk_measure, risk_measures, portfolio_risk
+from .statistics import asset_statistics
+
+
+def portfolio_summary(weights, port, risk_measure=None, periods=DEFAULT_PERIODS):
+    """
+    Calcule les métriques du portefeuille optimisé
+
+    Parameters:
+    -----------
+    weights : pd.DataFrame
+        Poids optimaux (une colonne, indexés par actif)
+    port : rp.Portfolio
+        Portefeuille dont les moments ont été estimés (mu, cov, returns, alpha ; rf par période)
+    risk_measure : str ou None
+        Mesure de risque optimisée, évaluée par période si fournie
+    periods : int
+        Nombre de périodes par an des rendements (voir periods_per_year)
+
+    Returns:
+    --------
+    dict : rendement et volatilité annuels, ratio de Sharpe et mesure de risque
+    """
+    metrics = {}
+    metrics['Rendement Annuel Attendu'] = (port.mu @ weights).iloc[0, 0] * periods
+    metrics['Volatilité Annuelle'] = np.sqrt(weights.T @ port.cov @ weights).iloc[0, 0] * np.sqrt(periods)
+
+    if metrics['Volatilité Annuelle'] > 0:
+        excess = metrics['Rendement Annuel Attendu'] - port.rf * periods
+        metrics['Ratio de Sharpe'] = excess / metrics['Volatilité Annuelle']
+    else:
+        metrics['Ratio de Sharpe'] = 0
+
+    if risk_measure is not None:
+        metrics['Mesure de Risque'] = portfolio_risk(port.returns, weights, risk_measure, alpha=port.alpha)[0]
+
+    return metrics
+
+
+def comparison_summary(weights, port, risk_measure=None, periods=DEFAULT_PERIODS):
+    """
+    Calcule les métriques de plusieurs portefeuilles sur les mêmes moments
+
+    Mêmes indicateurs que portfolio_summary, en une passe pour toutes les colonnes :
+    les modèles comparés sont évalués sur les mêmes rendements, moments et mesure de
+    risque, quels que soient le modèle et la mesure optimisés.
+
+    Parameters:
+    -----------
+    weights : pd.DataFrame
+        Poids des portefeuilles (N x K), une colonne par portefeuille
+    port : rp.Portfolio
+        Portefeuille dont les moments ont été estimés (mu, cov, returns, alpha ; rf par période)
+    risk_measure : str ou None
+        Mesure de risque évaluée par période si fournie
+    periods : int
+        Nombre de périodes par an des rendements
+
+    Returns:
+    --------
+    pd.DataFrame : une ligne par portefeuille (colonnes de weights)
+    """
+    W = weights.reindex(port.returns.columns).fillna(0.0)
+    values = W.to_numpy(dtype=float)
+    annual_return = (np.asarray(port.mu, dtype=float) @ values).ravel() * periods
+    variance = np.einsum('ik,ij,jk->k', values, np.asarray(port.cov, dtype=float), values)
+    annual_vol = np.sqrt(np.maximum(variance, 0.0)) * np.sqrt(periods)
+    sharpe = np.divide(annual_return - port.rf * periods, annual_vol, out=np.zeros_like(annual_vol), where=annual_vol > 0)
+
+    table = pd.DataFrame({
+        'Rendement Annuel Attendu': annual_return,
+        'Volatilité Annuelle': annual_vol,
+        'Ratio de Sharpe': sharpe
+    }, index=weights.columns)
+    if risk_measure is not None:
+        table['Mesure de Risque'] = portfolio_risk(port.returns, W, risk_measure, alpha=port.alpha)
+    return table
+
+
+def descriptive_table(stats, periods=DEFAULT_PERIODS):
+    """
+    Met en forme les statistiques descriptives des actifs (valeurs annualisées en %)
+
+    Parameters:
+    -----------
+    stats : pd.DataFrame
+        Statistiques retournées par asset_statistics
+    periods : int
+        Nombre de périodes par an des rendements
+
+    Returns:
+    --------
+    pd.DataFrame : une ligne par actif
+    """
+    return pd.DataFrame({
+        'Rendement Moyen (%)': stats['mean'] * periods * 100,
+        'Volatilité (%)': stats['std'] * np.sqrt(periods) * 100,
+        'Min (%)': stats['min'] * 100,
+        'Max (%)': stats['max'] * 100,
+        'Skewness': stats['skew'],
+        'Kurtosis': stats['kurtosis']
+    })
+
+
+def performance_table(returns, rf, risk_measure=None, alpha=0.05, stats=None, periods=DEFAULT_PERIODS):
+    """
+    Tableau de performance et d'indicateurs de risque de chaque actif
+
+    Parameters:
+    -----------
+    returns : pd.DataFrame
+        Matrice des rendements des actifs
+    rf : float
+        Taux sans risque annuel
+    risk_measure : str ou None
+        Mesure de risque sélectionnée, ajoutée en colonne (sauf mesures relativistes)
+    alpha : float
+        Niveau de signification de la mesure de risque sélectionnée
+    stats : pd.DataFrame ou None
+        Statistiques déjà calculées par asset_statistics (recalculées si None)
+    periods : int
+        Nombre de périodes par an des rendements
+
+    Returns:
+    --------
+    pd.DataFrame : une ligne par actif
+    """
+    # Moments, drawdown, VaR et CVaR en une seule passe sur les rendements
+    if stats is None:
+        stats = asset_statistics(returns, alpha=0.05)
+
+    annual_returns = stats['mean'] * periods
+    annual_vol = stats['std'] * np.sqrt(periods)
+    sharpe = (annual_returns - rf) / annual_vol
+
+    performance_df = pd.DataFrame({
+        'Rendement Annuel (%)': annual_returns * 100,
+        'Volatilité Annuelle (%)': annual_vol * 100,
+        'Ratio de Sharpe': sharpe,
+        'Drawdown Maximum (%)': stats['max_drawdown'] * 100,
+        'VaR 95% (%)': stats['var'] * 100,
+        'CVaR 95% (%)': stats['cvar'] * 100
+    })
+
+    # Mesure de risque sélectionnée, chaque actif étant vu comme un portefeuille
+    # (les mesures relativistes, résolues actif par actif, sont trop coûteuses ici)
+    if risk_measure is not None and resolve_risk_measure(risk_measure) not in RELATIVISTIC_CODES:
+        performance_df[f'Mesure {risk_measure}'] = risk_measures(returns, [risk_measure], alpha=alpha)[risk_measure]
+
+    return performance_df
@@ -0,0 +1,325 @@
+"""
+Mesures de risque vectorisées pour plusieurs portefeuilles à la fois
+
+Toutes les mesures suivent les définitions de `riskfolio.RiskFunctions` (valeurs par
+période, pertes positives) mais sont évaluées en une passe sur une matrice T x K de
+rendements de portefeuilles (K = actifs, points de frontière, dates de backtest...).
+"""
+
+import functools
+
+import numpy as np
+import pandas as pd
+
+
+# Codes Riskfolio-Lib des mesures calculées
+RISK_MEASURE_CODES = [
+    'MV', 'variance', 'KT', 'MAD', 'GMD', 'CVRG', 'TGRG', 'RG',
+    'MSV', 'SKT', 'FLPM', 'SLPM', 'VaR', 'CVaR', 'EVaR', 'RLVaR', 'TG', 'WR',
+    'MDD', 'ADD', 'UCI', 'DaR', 'CDaR', 'EDaR', 'RLDaR',
+    'MDD_Rel', 'ADD_Rel', 'UCI_Rel', 'DaR_Rel', 'CDaR_Rel', 'EDaR_Rel', 'RLDaR_Rel'
+]
+
+# Mesures relativistes : résolues par optimisation conique colonne par colonne (coûteuses)
+RELATIVISTIC_CODES = ['RLVaR', 'RLDaR', 'RLDaR_Rel']
+
+# Correspondance des codes HRP/HERC de l'application vers les codes Riskfolio-Lib
+RISK_MEASURE_ALIASES = {
+    'vol': 'MV',
+    'variance': 'variance',
+    'kurt': 'KT',
+    'mad': 'MAD',
+    'gmd': 'GMD',
+    'cvrg': 'CVRG',
+    'tgrg': 'TGRG',
+    'rg': 'RG',
+    'semi': 'MSV',
+    'skurt': 'SKT',
+    'flpm': 'FLPM',
+    'slpm': 'SLPM',
+    'var': 'VaR',
+    'cvar': 'CVaR',
+    'evar': 'EVaR',
+    'rlvar': 'RLVaR',
+    'tg': 'TG',
+    'wr': 'WR',
+    'mdd': 'MDD',
+    'add': 'ADD',
+    'uci': 'UCI',
+    'dar': 'DaR',
+    'cdar': 'CDaR',
+    'edar': 'EDaR',
+    'rdar': 'RLDaR',
+    'mdd_rel': 'MDD_Rel',
+    'add_rel': 'ADD_Rel',
+    'uci_rel': 'UCI_Rel',
+    'dar_rel': 'DaR_Rel',
+    'cdar_rel': 'CDaR_Rel',
+    'edar_rel': 'EDaR_Rel',
+    'rdar_rel': 'RLDaR_Rel'
+}
+
+_GOLDEN = (np.sqrt(5) - 1) / 2
+
+
+def resolve_risk_measure(code):
+    """Retourne le code Riskfolio-Lib d'une mesure (accepte les codes HRP/HERC de l'application)"""
+    if code in RISK_MEASURE_CODES:
+        return code
+    if code in RISK_MEASURE_ALIASES:
+        return RISK_MEASURE_ALIASES[code]
+    raise ValueError(f"Mesure de risque non reconnue: {code}")
+
+
+class _Kernel:
+    """Intermédiaires partagés (tri, écarts, drawdowns) calculés au plus une fois"""
+
+    def __init__(self, X, alpha, mar, a_sim, beta, b_sim, kappa):
+        self.X = X
+        self.T = X.shape[0]
+        self.alpha = alpha
+        self.mar = mar
+        self.a_sim = a_sim
+        self.beta = beta
+        self.b_sim = b_sim
+        self.kappa = kappa
+
+    @functools.cached_property
+    def centered(self):
+        return self.X - self.X.mean(axis=0)
+
+    @functools.cached_property
+    def sorted(self):
+        return np.sort(self.X, axis=0)
+
+    @functools.cached_property
+    def drawdowns_abs(self):
+        # NAV non composée 1 + cumsum(X), le pic initial vaut 1 (comme MDD_Abs)
+        nav = 1 + np.cumsum(self.X, axis=0)
+        peak = np.maximum(np.maximum.accumulate(nav, axis=0), 1.0)
+        return peak - nav
+
+    @functools.cached_property
+    def drawdowns_rel(self):
+        # NAV composée cumprod(1 + X), le pic initial vaut 1 (comme MDD_Rel)
+        nav = np.cumprod(1 + self.X, axis=0)
+        peak = np.maximum(np.maximum.accumulate(nav, axis=0), 1.0)
+        return (peak - nav) / peak
+
+    def owa(self, name, **kwargs):
+        from riskfolio.src import OwaWeights as owa
+        weights = getattr(owa, name)(self.T, **kwargs)
+        return np.asarray(weights).reshape(-1) @ self.sorted
+
+
+def _tail(Y, alpha, sorted_Y=None):
+    """VaR et CVaR historiques (pertes positives) de chaque colonne de Y"""
+    T = Y.shape[0]
+    index = int(np.ceil(alpha * T) - 1)
+    if sorted_Y is None:
+        # Sélection partielle : seules les index + 1 plus petites valeurs sont utiles
+        sorted_Y = np.partition(Y, index, axis=0)
+    var = -sorted_Y[index]
+    cvar = var - (sorted_Y[:index + 1] + var).sum(axis=0) / (alpha * T)
+    return var, cvar
+
+
+def _evar(Y, alpha, n_iter=60):
+    """
+    EVaR historique de chaque colonne de Y
+
+    Minimise z (log E[exp(-Y/z)] - log alpha) par section dorée en log z, simultanément
+    pour toutes les colonnes.
+    """
+    T, K = Y.shape
+    log_T_alpha = np.log(T) + np.log(alpha)
+
+    # log-sum-exp stabilisé : max(-Y/z) = -min(Y)/z pour tout z > 0
+    y_min = Y.min(axis=0)
+    D = Y - y_min
+
+    def entropic(log_z):
+        z = np.exp(log_z)
+        lse = np.log(np.exp(-D / z).sum(axis=0)) - y_min / z
+        return z * (lse - log_T_alpha)
+
+    scale = np.maximum(np.abs(Y).max(axis=0), 1e-12)
+    a = np.log(scale) - 25
+    b = np.log(scale) + 10
+    c = b - _GOLDEN * (b - a)
+    d = a + _GOLDEN * (b - a)
+    fc, fd = entropic(c), entropic(d)
+
+    for _ in range(n_iter):
+        left = fc < fd
+        a, b = np.where(left, a, c), np.where(left, d, b)
+        new_x = np.where(left, b - _GOLDEN * (b - a), a + _GOLDEN * (b - a))
+        f_new = entropic(new_x)
+        c, d, fc, fd = (
+            np.where(left, new_x, d),
+            np.where(left, c, new_x),
+            np.where(left, f_new, fd),
+            np.where(left, fc, f_new)
+        )
+
+    value = entropic((a + b) / 2)
+    # Limite z -> 0 : pire réalisation
+    return np.minimum(value, -y_min)
+
+
+def _per_column(func, X, **kwargs):
+    """Applique une fonction Riskfolio-Lib colonne par colonne (mesures non vectorisables)"""
+    return np.array([func(X[:, [k]], **kwargs) for k in range(X.shape[1])], dtype=float)
+
+
+def _compute(kernel, code):
+    """Calcule une mesure (code Riskfolio-Lib) pour toutes les colonnes"""
+    X = kernel.X
+    T = kernel.T
+    alpha = kernel.alpha
+
+    if code == 'MV':
+        return np.sqrt((kernel.centered ** 2).sum(axis=0) / (T - 1))
+    if code == 'variance':
+        return (kernel.centered ** 2).sum(axis=0) / (T - 1)
+    if code == 'KT':
+        return np.sqrt((kernel.centered ** 4).sum(axis=0) / T)
+    if code == 'SKT':
+        return np.sqrt((np.minimum(kernel.centered, 0) ** 4).sum(axis=0) / T)
+    if code == 'MAD':
+        return np.abs(kernel.centered).mean(axis=0)
+    if code == 'MSV':
+        return np.sqrt((np.minimum(kernel.centered, 0) ** 2).sum(axis=0) / (T - 1))
+    if code == 'FLPM':
+        return np.maximum(kernel.mar - X, 0).sum(axis=0) / T
+    if code == 'SLPM':
+        return np.sqrt((np.maximum(kernel.mar - X, 0) ** 2).sum(axis=0) / (T - 1))
+    if code == 'WR':
+        return -X.min(axis=0)
+    if code in ('VaR', 'CVaR'):
+        sorted_X = kernel.__dict__.get('sorted')
+        var, cvar = _tail(X, alpha, sorted_X)
+        return var if code == 'VaR' else cvar
+    if code == 'EVaR':
+        return _evar(X, alpha)
+    if code == 'GMD':
+        # Poids OWA de owa_gmd : 2 (2i - 1 - T) / (T (T - 1))
+        weights = 2 * (2 * np.arange(1, T + 1) - 1 - T) / (T * (T - 1))
+        return weights @ kernel.sorted
+    if code == 'RG':
+        return kernel.sorted[-1] - kernel.sorted[0]
+    if code == 'TG':
+        return kernel.owa('owa_tg', alpha=alpha, a_sim=kernel.a_sim)
+    if code == 'CVRG':
+        return kernel.owa('owa_cvrg', alpha=alpha, beta=kernel.beta)
+    if code == 'TGRG':
+        return kernel.owa('owa_tgrg', alpha=alpha, a_sim=kernel.a_sim, beta=kernel.beta, b_sim=kernel.b_sim)
+    if code == 'RLVaR':
+        from riskfolio.src.RiskFunctions import RLVaR_Hist
+        return _per_column(RLVaR_Hist, X, alpha=alpha, kappa=kernel.kappa)
+
+    # Mesures de drawdown
+    relative = code.endswith('_Rel')
+    base = code[:-4] if relative else code
+    dd = kernel.drawdowns_rel if relative else kernel.drawdowns_abs
+
+    if base == 'MDD':
+        return dd.max(axis=0)
+    if base == 'ADD':
+        return dd.sum(axis=0) / T
+    if base == 'UCI':
+        return np.sqrt((dd ** 2).sum(axis=0) / T)
+    if base in ('DaR', 'CDaR'):
+        var, cvar = _tail(-dd, alpha)
+        return var if base == 'DaR' else cvar
+    if base == 'EDaR':
+        return _evar(-dd, alpha)
+    if base == 'RLDaR':
+        from riskfolio.src.RiskFunctions import RLDaR_Abs, RLDaR_Rel
+        return _per_column(RLDaR_Rel if relative else RLDaR_Abs, X, alpha=alpha, kappa=kernel.kappa)
+
+    raise ValueError(f"Mesure de risque non reconnue: {code}")
+
+
+def risk_measures(returns, measures=None, alpha=0.05, mar=0.0, a_sim=100, beta=None,
+                  b_sim=None, kappa=0.3):
+    """
+    Évalue plusieurs mesures de risque pour K portefeuilles en une passe vectorisée
+
+    Parameters:
+    -----------
+    returns : pd.DataFrame, pd.Series ou np.ndarray
+        Rendements des portefeuilles, de forme (T, K) ou (T,)
+    measures : list ou None
+        Codes des mesures (codes Riskfolio-Lib ou codes HRP/HERC de l'application).
+        None = toutes les mesures de RISK_MEASURE_CODES sauf les relativistes, qui ne
+        sont calculées que sur demande explicite
+    alpha : float
+        Niveau de signification des mesures de queue (VaR, CVaR, EVaR, DaR...)
+    mar : float
+        Rendement minimum acceptable des moments partiels inférieurs (FLPM, SLPM)
+    a_sim, beta, b_sim : int, float, int
+        Paramètres des mesures Tail Gini et des plages (TG, CVRG, TGRG)
+    kappa : float
+        Paramètre de déformation des mesures relativistes (RLVaR, RLDaR)
+
+    Returns:
+    --------
+    pd.DataFrame : une ligne par portefeuille, une colonne par mesure demandée
+    """
+    if isinstance(returns, pd.Series):
+        returns = returns.to_frame()
+    index = returns.columns if isinstance(returns, pd.DataFrame) else None
+
+    X = np.asarray(returns, dtype=float)
+    if X.ndim == 1:
+        X = X.reshape(-1, 1)
+    if not np.all(np.isfinite(X)):
+        raise ValueError("Les rendements ne doivent pas contenir de valeurs manquantes ou infinies.")
+
+    if measures is None:
+        measures = [code for code in RISK_MEASURE_CODES if code not in RELATIVISTIC_CODES]
+    measures = list(measures)
+    kernel = _Kernel(X, alpha, mar, a_sim, beta, b_sim, kappa)
+
+    # Le tri complet n'est effectué que si une mesure OWA en a besoin
+    if any(resolve_risk_measure(m) in ('GMD', 'RG', 'TG', 'CVRG', 'TGRG') for m in measures):
+        kernel.sorted
+
+    results = {}
+    computed = {}
+    for measure in measures:
+        code = resolve_risk_measure(measure)
+        if code not in computed:
+            computed[code] = _compute(kernel, code)
+        results[measure] = computed[code]
+
+    return pd.DataFrame(results, index=index)
+
+
+def portfolio_risk(returns, weights, measure, **kwargs):
+    """
+    Mesure de risque d'un ou plusieurs portefeuilles à partir des rendements des actifs
+
+    Parameters:
+    -----------
+    returns : pd.DataFrame
+        Rendements des actifs (T x N)
+    weights : pd.DataFrame ou np.ndarray
+        Poids des portefeuilles (N x K), alignés sur les colonnes de returns
+    measure : str
+        Code de la mesure de risque
+    **kwargs :
+        Paramètres transmis à risk_measures
+
+    Returns:
+    --------
+    np.ndarray : valeur de la mesure pour chacun des K portefeuilles
+    """
+    if isinstance(weights, (pd.DataFrame, pd.Series)):
+        weights = weights.reindex(returns.columns)
+    W = np.asarray(weights, dtype=float)
+    if W.ndim == 1:
+        W = W.reshape(-1, 1)
+    portfolio_returns = returns.to_numpy(dtype=float) @ W
+    return risk_measures(portfolio_returns, [measure], **kwargs).iloc[:, 0].to_numpy()
@@ -0,0 +1,219 @@
+"""
+Indicateurs glissants (volatilité, Sharpe, bêta, corrélation, drawdown) en O(T)
+"""
+
+import numpy as np
+import pandas as pd
+
+
+PORTFOLIO_COLUMN = 'Portefeuille'
+
+
+def _window_sums(values, window):
+    """
+    Sommes glissantes de chaque colonne par différence de sommes préfixes
+
+    Chaque somme coûte O(1) quelle que soit la longueur de la fenêtre. Les
+    window - 1 premières lignes, incomplètes, valent NaN (comme pandas.rolling).
+    """
+    n_obs = len(values)
+    sums = np.full(values.shape, np.nan)
+    if window > n_obs:
+        return sums
+    prefix = np.cumsum(values, axis=0)
+    sums[window - 1] = prefix[window - 1]
+    sums[window:] = prefix[window:] - prefix[:-window]
+    return sums
+
+
+def _centered(values):
+    """Centre les colonnes sur leur moyenne pour limiter l'erreur d'annulation des sommes préfixes"""
+    return values - values.mean(axis=0)
+
+
+def _rolling_moments(x, window):
+    """Moyenne glissante et variance glissante (ddof=1) de chaque colonne"""
+    offset = x.mean(axis=0)
+    xc = x - offset
+    s1 = _window_sums(xc, window)
+    s2 = _window_sums(xc * xc, window)
+    mean_c = s1 / window
+    var = np.maximum(s2 - s1 * mean_c, 0.0) / (window - 1)
+    return mean_c + offset, var
+
+
+def _rolling_covariance(x, y, window):
+    """Covariance glissante (ddof=1) de chaque colonne de x avec le vecteur y"""
+    xc = _centered(x)
+    yc = _centered(y)[:, None]
+    sx = _window_sums(xc, window)
+    sy = _window_sums(yc, window)
+    sxy = _window_sums(xc * yc, window)
+    return (sxy - sx * sy / window) / (window - 1)
+
+
+def _as_frame(values, like):
+    """Emballe un tableau dans un DataFrame avec l'index et les colonnes des rendements"""
+    return pd.DataFrame(values, index=like.index, columns=like.columns)
+
+
+def rolling_volatility(returns, window=63, periods=252):
+    """
+    Volatilité glissante annualisée de chaque série
+
+    Parameters:
+    -----------
+    returns : pd.DataFrame
+        Matrice des rendements (T x N)
+    window : int
+        Longueur de la fenêtre en périodes
+    periods : int
+        Nombre de périodes par an (252 pour des données journalières)
+
+    Returns:
+    --------
+    pd.DataFrame : volatilités glissantes (NaN pour les window - 1 premières dates)
+    """
+    _, var = _rolling_moments(returns.to_numpy(dtype=float), window)
+    return _as_frame(np.sqrt(var * periods), returns)
+
+
+def rolling_sharpe(returns, window=63, rf=0.0, periods=252):
+    """
+    Ratio de Sharpe glissant annualisé de chaque série
+
+    Parameters:
+    -----------
+    returns : pd.DataFrame
+        Matrice des rendements (T x N)
+    window : int
+        Longueur de la fenêtre en périodes
+    rf : float
+        Taux sans risque annuel
+    periods : int
+        Nombre de périodes par an
+
+    Returns:
+    --------
+    pd.DataFrame : ratios de Sharpe glissants
+    """
+    mean, var = _rolling_moments(returns.to_numpy(dtype=float), window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = (mean * periods - rf) / np.sqrt(var * periods)
+    return _as_frame(sharpe, returns)
+
+
+def rolling_beta(returns, benchmark, window=63):
+    """
+    Bêta glissant de chaque série par rapport à une série de référence
+
+    Parameters:
+    -----------
+    returns : pd.DataFrame
+        Matrice des rendements (T x N)
+    benchmark : pd.Series
+        Rendements de la référence (par exemple le portefeuille optimisé)
+    window : int
+        Longueur de la fenêtre en périodes
+
+    Returns:
+    --------
+    pd.DataFrame : bêtas glissants
+    """
+    x = returns.to_numpy(dtype=float)
+    y = benchmark.reindex(returns.index).to_numpy(dtype=float)
+    cov = _rolling_covariance(x, y, window)
+    _, var_y = _rolling_moments(y[:, None], window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        beta = cov / var_y
+    return _as_frame(beta, returns)
+
+
+def rolling_correlation(returns, benchmark, window=63):
+    """
+    Corrélation glissante de chaque série avec une série de référence
+
+    Parameters:
+    -----------
+    returns : pd.DataFrame
+        Matrice des rendements (T x N)
+    benchmark : pd.Series
+        Rendements de la référence
+    window : int
+        Longueur de la fenêtre en périodes
+
+    Returns:
+    --------
+    pd.DataFrame : corrélations glissantes dans [-1, 1]
+    """
+    x = returns.to_numpy(dtype=float)
+    y = benchmark.reindex(returns.index).to_numpy(dtype=float)
+    cov = _rolling_covariance(x, y, window)
+    _, var_x = _rolling_moments(x, window)
+    _, var_y = _rolling_moments(y[:, None], window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr = cov / np.sqrt(var_x * var_y)
+    return _as_frame(np.clip(corr, -1.0, 1.0), returns)
+
+
+def drawdown_series(returns, window=None):
+    """
+    Série des drawdowns (perte relative depuis le plus haut) de chaque série
+
+    Parameters:
+    -----------
+    returns : pd.DataFrame
+        Matrice des rendements (T x N)
+    window : int ou None
+        None : plus haut historique depuis le début de la série ; sinon plus haut
+        atteint sur les `window` dernières périodes (filtre de van Herk, O(T))
+
+    Returns:
+    --------
+    pd.DataFrame : drawdowns (valeurs négatives ou nulles)
+    """
+    wealth = np.cumprod(1.0 + returns.to_numpy(dtype=float), axis=0)
+    if window is None:
+        peak = np.maximum.accumulate(wealth, axis=0)
+    else:
+        from scipy.ndimage import maximum_filter1d
+        # Fenêtre alignée à droite : [t - window + 1, t]
+        peak = maximum_filter1d(wealth, size=window, axis=0, origin=(window - 1) // 2, mode='nearest')
+    return _as_frame(wealth / peak - 1.0, returns)
+
+
+def rolling_analytics(returns, weights, window=63, rf=0.0, periods=252):
+    """
+    Calcule tous les indicateurs glissants des actifs et du portefeuille optimisé
+
+    Les rendements du portefeuille (poids constants) sont ajoutés en colonne
+    'Portefeuille' ; le bêta et la corrélation sont mesurés par rapport à ce portefeuille.
+
+    Parameters:
+    -----------
+    returns : pd.DataFrame
+        Matrice des rendements des actifs
+    weights : pd.DataFrame
+        Poids optimaux (une colonne, indexés par actif)
+    window : int
+        Longueur de la fenêtre en périodes
+    rf : float
+        Taux sans risque annuel
+    periods : int
+        Nombre de périodes par an
+
+    Returns:
+    --------
+    dict : {'volatility', 'sharpe', 'beta', 'correlation', 'drawdown'} -> pd.DataFrame
+    """
+    w = weights.reindex(returns.columns).fillna(0.0).iloc[:, 0]
+    portfolio = returns @ w
+    series = returns.assign(**{PORTFOLIO_COLUMN: portfolio})
+
+    return {
+        'volatility': rolling_volatility(series, window, periods),
+        'sharpe': rolling_sharpe(series, window, rf, periods),
+        'beta': rolling_beta(series, portfolio, window),
+        'correlation': rolling_correlation(series, portfolio, window),
+        'drawdown': drawdown_series(series)
+    }
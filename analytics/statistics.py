@@ -0,0 +1,160 @@
+"""
+Statistiques par actif calculées en une seule passe sur la matrice des rendements
+"""
+
+import numpy as np
+import pandas as pd
+
+
+STAT_COLUMNS = ['mean', 'std', 'min', 'max', 'skew', 'kurtosis', 'max_drawdown', 'var', 'cvar']
+
+
+def asset_statistics(returns, alpha=0.05, chunk_rows=256, chunk_cols=256):
+    """
+    Calcule toutes les statistiques descriptives et de risque de chaque actif
+
+    Les moments centrés (jusqu'à l'ordre 4), le min, le max et le drawdown maximum sont
+    accumulés par blocs de lignes : les moments de chaque bloc sont fusionnés avec les
+    formules de Pébay (numériquement stables) et le drawdown suit la richesse et son
+    maximum courant d'un bloc à l'autre. La VaR et la CVaR historiques sont obtenues par
+    np.partition sur des blocs de colonnes. Aucun tableau T x N intermédiaire n'est créé.
+
+    Les conventions sont celles de pandas : écart-type avec ddof=1, skewness et kurtosis
+    (excès) avec correction de biais, quantile par interpolation linéaire.
+
+    Parameters:
+    -----------
+    returns : pd.DataFrame
+        Matrice des rendements (T x N), sans valeurs manquantes
+    alpha : float
+        Niveau de la VaR et de la CVaR (0.05 pour 95%)
+    chunk_rows : int
+        Nombre de lignes traitées par bloc pour les moments et le drawdown
+    chunk_cols : int
+        Nombre de colonnes traitées par bloc pour la VaR et la CVaR
+
+    Returns:
+    --------
+    pd.DataFrame : une ligne par actif, colonnes STAT_COLUMNS (valeurs par période,
+                   non annualisées ; drawdown, VaR et CVaR sont négatifs en cas de perte)
+    """
+    values = np.asarray(returns, dtype=float)
+    n_obs, n_assets = values.shape
+
+    count = 0
+    mean = np.zeros(n_assets)
+    m2 = np.zeros(n_assets)
+    m3 = np.zeros(n_assets)
+    m4 = np.zeros(n_assets)
+    col_min = np.full(n_assets, np.inf)
+    col_max = np.full(n_assets, -np.inf)
+
+    wealth = np.ones(n_assets)
+    peak = np.full(n_assets, -np.inf)
+    max_dd = np.zeros(n_assets)
+
+    for start in range(0, n_obs, chunk_rows):
+        chunk = values[start:start + chunk_rows]
+        n_b = len(chunk)
+
+        # Moments centrés du bloc
+        mean_b = chunk.mean(axis=0)
+        dev = chunk - mean_b
+        dev2 = dev * dev
+        m2_b = dev2.sum(axis=0)
+        m3_b = (dev2 * dev).sum(axis=0)
+        m4_b = (dev2 * dev2).sum(axis=0)
+
+        # Fusion avec les moments accumulés (Pébay, 2008)
+        n_a = count
+        n = n_a + n_b
+        delta = mean_b - mean
+        delta_n = delta / n
+        m4 = (m4 + m4_b
+              + delta * delta_n**3 * n_a * n_b * (n_a * n_a - n_a * n_b + n_b * n_b)
+              + 6 * delta_n**2 * (n_a * n_a * m2_b + n_b * n_b * m2)
+              + 4 * delta_n * (n_a * m3_b - n_b * m3))
+        m3 = (m3 + m3_b
+              + delta * delta_n**2 * n_a * n_b * (n_a - n_b)
+              + 3 * delta_n * (n_a * m2_b - n_b * m2))
+        m2 = m2 + m2_b + delta * delta_n * n_a * n_b
+        mean = mean + delta_n * n_b
+        count = n
+
+        np.minimum(col_min, chunk.min(axis=0), out=col_min)
+        np.maximum(col_max, chunk.max(axis=0), out=col_max)
+
+        # Drawdown : richesse cumulée et maximum courant, reportés entre les blocs
+        path = np.cumprod(1.0 + chunk, axis=0)
+        path *= wealth
+        wealth = path[-1].copy()
+        running_max = np.maximum.accumulate(path, axis=0)
+        np.maximum(running_max, peak, out=running_max)
+        peak = running_max[-1].copy()
+        np.minimum(max_dd, ((path - running_max) / running_max).min(axis=0), out=max_dd)
+
+    std, skew, kurt = _standardized_moments(count, m2, m3, m4)
+    var, cvar = _historical_var_cvar(values, alpha, chunk_cols)
+
+    return pd.DataFrame({
+        'mean': mean,
+        'std': std,
+        'min': col_min,
+        'max': col_max,
+        'skew': skew,
+        'kurtosis': kurt,
+        'max_drawdown': max_dd,
+        'var': var,
+        'cvar': cvar
+    }, index=getattr(returns, 'columns', None))
+
+
+def _standardized_moments(n, m2, m3, m4):
+    """Écart-type, skewness et kurtosis corrigés du biais à partir des sommes centrées"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        std = np.sqrt(m2 / (n - 1)) if n > 1 else np.full_like(m2, np.nan)
+
+        # Variance nulle : pandas renvoie 0 pour la skewness et la kurtosis
+        flat = m2 <= 1e-14 * np.maximum(1.0, n)
+        skew = np.full_like(m2, np.nan)
+        kurt = np.full_like(m2, np.nan)
+        if n > 2:
+            skew = np.where(flat, 0.0, np.sqrt(n * (n - 1)) / (n - 2) * (m3 / n) / (m2 / n)**1.5)
+        if n > 3:
+            g2 = n * m4 / (m2 * m2) - 3.0
+            kurt = np.where(flat, 0.0, (n - 1) / ((n - 2) * (n - 3)) * ((n + 1) * g2 + 6.0))
+
+    return std, skew, kurt
+
+
+def _historical_var_cvar(values, alpha, chunk_cols):
+    """VaR (quantile à interpolation linéaire) et CVaR (moyenne des rendements <= VaR)"""
+    n_obs, n_assets = values.shape
+    var = np.full(n_assets, np.nan)
+    cvar = np.full(n_assets, np.nan)
+    if n_obs == 0:
+        return var, cvar
+
+    h = (n_obs - 1) * alpha
+    lo = int(np.floor(h))
+    hi = min(lo + 1, n_obs - 1)
+    frac = h - lo
+
+    for start in range(0, n_assets, chunk_cols):
+        block = np.partition(values[:, start:start + chunk_cols], [lo, hi], axis=0)
+        var_b = block[lo] + frac * (block[hi] - block[lo])
+
+        # Seuls les éléments jusqu'à hi (et leurs ex aequo au-delà) peuvent être <= VaR
+        head = block[:hi + 1]
+        below = head <= var_b
+        total = np.where(below, head, 0.0).sum(axis=0)
+        n_below = below.sum(axis=0)
+        if hi + 1 < n_obs and (block[hi] == var_b).any():
+            ties = block[hi + 1:] == var_b
+            total += np.where(ties, var_b, 0.0).sum(axis=0)
+            n_below += ties.sum(axis=0)
+
+        var[start:start + chunk_cols] = var_b
+        cvar[start:start + chunk_cols] = total / n_below
+
+    return var, cvar
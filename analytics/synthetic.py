@@ -0,0 +1,203 @@
+"""
+Générateur de données de marché synthétiques pour les tests reproductibles et à grande échelle
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# Volatilités annuelles typiques (marché, secteurs, spécifique) et nombre de périodes par an
+_MARKET_VOL = 0.16
+_CLUSTER_VOL = 0.10
+_IDIO_VOL = (0.15, 0.35)
+_PERIODS_PER_YEAR = 252
+
+
+def _student_t(rng, df, size, dtype):
+    """Innovations de Student réduites (variance unitaire) ; gaussiennes si df est None"""
+    if df is None or np.isinf(df):
+        return rng.standard_normal(size, dtype=dtype)
+    if df <= 2:
+        raise ValueError("degrees_of_freedom doit être supérieur à 2.")
+    # t = N / racine(chi2 / df), tiré directement dans le type demandé (plus rapide que standard_t)
+    z = rng.standard_normal(size, dtype=dtype)
+    scale = rng.standard_gamma(df / 2.0, size, dtype=dtype)
+    scale *= 2.0 / (df - 2.0)
+    np.sqrt(scale, out=scale)
+    z /= scale
+    return z
+
+
+def _garch_inplace(z, variance, alpha, beta):
+    """
+    Applique une récurrence GARCH(1,1) en place sur des innovations réduites (T x k)
+
+    La variance inconditionnelle de chaque colonne est `variance` ; la boucle ne porte que
+    sur le temps, chaque pas étant vectorisé sur les colonnes.
+    """
+    if alpha <= 0:
+        z *= np.sqrt(variance)
+        return z
+    if alpha + beta >= 1:
+        raise ValueError("La persistance GARCH (alpha + beta) doit être inférieure à 1.")
+
+    omega = variance * (1.0 - alpha - beta)
+    sigma2 = np.array(variance, dtype=z.dtype) * np.ones(z.shape[1], dtype=z.dtype)
+    for t in range(z.shape[0]):
+        z[t] *= np.sqrt(sigma2)
+        sigma2 = omega + alpha * z[t] ** 2 + beta * sigma2
+    return z
+
+
+def synthetic_clusters(n_assets, n_clusters, seed=0):
+    """
+    Affecte les actifs à des blocs de tailles inégales, dans un ordre mélangé
+
+    Returns:
+    --------
+    np.ndarray : numéro de bloc de chaque actif
+    """
+    rng = np.random.default_rng([seed, 1])
+    n_clusters = max(1, min(n_clusters, n_assets))
+    sizes = rng.dirichlet(np.full(n_clusters, 2.0)) * (n_assets - n_clusters)
+    counts = 1 + np.floor(sizes).astype(int)
+    counts[: n_assets - counts.sum()] += 1
+    return rng.permutation(np.repeat(np.arange(n_clusters), counts))
+
+
+def _log_returns(n_assets, n_periods, n_clusters, degrees_of_freedom, garch, missing, late_start, start,
+                 freq, seed, dtype):
+    """Log-rendements générés (valeurs manquantes comprises), index, colonnes et blocs"""
+    dtype = np.dtype(dtype)
+    rng = np.random.default_rng(seed)
+    alpha, beta = garch
+    if n_clusters is None:
+        n_clusters = max(1, int(round(np.sqrt(n_assets))))
+    clusters = synthetic_clusters(n_assets, n_clusters, seed)
+    n_clusters = clusters.max() + 1
+
+    # Facteurs : marché (1) et secteurs (n_clusters), GARCH vectorisé sur les colonnes
+    factors = _student_t(rng, degrees_of_freedom, (n_periods, 1 + n_clusters), dtype)
+    _garch_inplace(factors[:, :1], (_MARKET_VOL ** 2) / _PERIODS_PER_YEAR, alpha, beta)
+    _garch_inplace(factors[:, 1:], (_CLUSTER_VOL ** 2) / _PERIODS_PER_YEAR, alpha, beta)
+
+    # Terme spécifique : volatilité propre à chaque actif
+    idio_vol = rng.uniform(*_IDIO_VOL, n_assets) / np.sqrt(_PERIODS_PER_YEAR)
+    values = _student_t(rng, degrees_of_freedom, (n_periods, n_assets), dtype)
+    _garch_inplace(values, 1.0, alpha, beta)
+    values *= idio_vol.astype(dtype)
+
+    market_beta = rng.uniform(0.5, 1.5, n_assets).astype(dtype)
+    cluster_beta = rng.uniform(0.5, 1.5, n_assets).astype(dtype)
+    drift = (rng.normal(0.06, 0.04, n_assets) / _PERIODS_PER_YEAR).astype(dtype)
+
+    exposure = np.take(factors[:, 1:], clusters, axis=1)
+    exposure *= cluster_beta
+    values += exposure
+    del exposure
+    values += factors[:, :1] * market_beta
+    values += drift
+
+    if late_start > 0:
+        late = rng.random(n_assets) < late_start
+        starts = rng.integers(1, max(2, n_periods // 2), late.sum())
+        rows = np.arange(n_periods)[:, None]
+        values[:, late] = np.where(rows < starts, np.nan, values[:, late])
+    if missing > 0:
+        values[rng.random((n_periods, n_assets)) < missing] = np.nan
+
+    width = len(str(n_assets - 1))
+    columns = [f"A{i:0{width}d}" for i in range(n_assets)]
+    index = pd.date_range(start, periods=n_periods, freq=freq, name='Date')
+    return values, index, columns, pd.Series(clusters, index=columns, name='cluster')
+
+
+def synthetic_returns(n_assets=50, n_periods=1250, n_clusters=None, degrees_of_freedom=5.0,
+                      garch=(0.08, 0.9), missing=0.0, late_start=0.0, start='2015-01-02', freq='B',
+                      seed=0, dtype='float64', return_clusters=False):
+    """
+    Génère des rendements synthétiques à facteurs, reproductibles
+
+    Chaque rendement combine un facteur de marché, un facteur sectoriel propre au bloc de
+    l'actif (structure de corrélation par blocs, exploitable par HRP, HERC et NCO) et un
+    terme spécifique. Les innovations suivent une loi de Student (queues épaisses) et leur
+    variance une récurrence GARCH(1,1) (regroupement de volatilité). La génération est
+    vectorisée sur les actifs : seule la récurrence GARCH boucle sur le temps.
+
+    Parameters:
+    -----------
+    n_assets : int
+        Nombre d'actifs
+    n_periods : int
+        Nombre de périodes
+    n_clusters : int ou None
+        Nombre de blocs (par défaut environ racine de n_assets)
+    degrees_of_freedom : float ou None
+        Degrés de liberté de la loi de Student (None : innovations gaussiennes)
+    garch : tuple
+        (alpha, beta) de la récurrence GARCH(1,1) ; alpha = 0 désactive le regroupement
+    missing : float
+        Proportion de valeurs manquantes tirées au hasard
+    late_start : float
+        Proportion d'actifs dont l'historique commence plus tard (valeurs manquantes initiales)
+    start : str
+        Première date de l'index
+    freq : str
+        Fréquence de l'index (jours ouvrés par défaut)
+    seed : int
+        Graine du générateur aléatoire
+    dtype : str
+        Type des valeurs ('float32' divise la mémoire par deux pour les grands panels)
+    return_clusters : bool
+        Si True, retourne aussi le bloc de chaque actif
+
+    Returns:
+    --------
+    pd.DataFrame : rendements (dates x actifs), ou (rendements, pd.Series des blocs)
+    """
+    values, index, columns, clusters = _log_returns(
+        n_assets, n_periods, n_clusters, degrees_of_freedom, garch, missing, late_start, start, freq, seed, dtype
+    )
+    np.expm1(values, out=values)
+    frame = pd.DataFrame(values, index=index, columns=columns, copy=False)
+    return (frame, clusters) if return_clusters else frame
+
+
+def synthetic_prices(n_assets=50, n_periods=1250, initial_price=100.0, n_clusters=None, degrees_of_freedom=5.0,
+                     garch=(0.08, 0.9), missing=0.0, late_start=0.0, start='2015-01-02', freq='B', seed=0,
+                     dtype='float64', return_clusters=False):
+    """
+    Génère un panel de prix synthétiques au format des fichiers importés (dates x actifs)
+
+    Les prix composent depuis initial_price les rendements de synthetic_returns (mêmes
+    paramètres, même graine) ; les valeurs manquantes restent manquantes dans les prix (le
+    nettoyage ffill/bfill de l'application s'applique comme pour un fichier réel).
+
+    Parameters:
+    -----------
+    n_assets : int
+        Nombre d'actifs
+    n_periods : int
+        Nombre de dates
+    initial_price : float
+        Prix initial de chaque actif
+    n_clusters, degrees_of_freedom, garch, missing, late_start, start, freq, seed, dtype, return_clusters
+        Voir synthetic_returns
+
+    Returns:
+    --------
+    pd.DataFrame : prix (dates x actifs), ou (prix, pd.Series des blocs) si return_clusters
+    """
+    values, index, columns, clusters = _log_returns(
+        n_assets, n_periods, n_clusters, degrees_of_freedom, garch, missing, late_start, start, freq, seed, dtype
+    )
+    gaps = np.isnan(values)
+    values[0] = 0.0
+    np.nan_to_num(values, copy=False, nan=0.0)
+    np.cumsum(values, axis=0, out=values)
+    np.exp(values, out=values)
+    values *= initial_price
+    values[gaps] = np.nan
+
+    prices = pd.DataFrame(values, index=index, columns=columns, copy=False)
+    return (prices, clusters) if return_clusters else prices
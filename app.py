@@ -5,30 +5,47 @@ Application d'Optimisation de Portefeuille avec Riskfolio-Lib, Plotly et yfinanc
 import streamlit as st
 import pandas as pd
 import numpy as np
-import yfinance as yf
-import plotly.graph_objects as go
-import plotly.express as px
+import copy
 from datetime import datetime, timedelta
-import riskfolio as rp
+import uuid
 import warnings
 from io import BytesIO
 
-# Import des modèles d'optimisation
-from models import (
-    optimize_max_return,
-    optimize_min_risk,
-    optimize_max_sharpe,
-    optimize_max_utility,
-    optimize_risk_parity,
-    optimize_relaxed_risk_parity,
-    optimize_robust_max_return,
-    optimize_robust_min_risk,
-    optimize_robust_max_sharpe,
-    optimize_robust_max_utility,
-    optimize_hrp,
-    optimize_herc,
-    optimize_nco
+from runtime.cache import cached_stage, stage_key
+from runtime.figure_cache import cached_figure, figure_cache_info
+from runtime.jobs import MAX_TASK_PROCESSES, JobCancelled, get_job_queue
+from runtime.memory import MemoryTracker
+from runtime.price_store import get_price_store
+from runtime.store import get_run_store
+from runtime.timing import Timeline, span, write_timeline
+from runtime.lazy import lazy_import, start_warm_up
+
+# Modules lourds importés à la première utilisation (page d'optimisation) ou
+# préchargés en arrière-plan après l'affichage de la page d'accueil
+yf = lazy_import('yfinance')
+go = lazy_import('plotly.graph_objects')
+rp = lazy_import('riskfolio')
+figures = lazy_import('figures')
+
+# Import des modèles d'optimisation (Riskfolio-Lib, cvxpy)
+models = lazy_import('models')
+
+from analytics import (
+    asset_statistics,
+    bootstrap_confidence_intervals,
+    descriptive_table,
+    hierarchical_clustering,
+    performance_table,
+    comparison_summary,
+    portfolio_risk,
+    portfolio_summary,
+    resolve_risk_measure,
+    risk_contributions,
+    rolling_analytics
 )
+from analytics.export import REPORT_FORMATS, export_report, report_sheets
+from analytics.frequency import DEFAULT_PERIODS, periods_per_year, resample_prices
+from analytics.rolling import PORTFOLIO_COLUMN
 
 warnings.filterwarnings('ignore')
 
@@ -54,82 +71,25 @@ st.session_state.page = page
 
 st.sidebar.markdown("---")
 
-# Dictionnaire de traduction des mesures de risque (modèles classiques)
-RISK_MEASURES_DICT = {
-    "MV": "Variance (Écart-type)",
-    "MAD": "Écart Absolu Moyen (MAD)",
-    "MSV": "Semi-Variance",
-    "FLPM": "Moment Partiel Inférieur du Premier Ordre",
-    "SLPM": "Moment Partiel Inférieur du Second Ordre",
-    "CVaR": "Valeur à Risque Conditionnelle (CVaR)",
-    "EVaR": "Valeur à Risque Entropic (EVaR)",
-    "WR": "Pire Réalisation (Worst Realization)",
-    "MDD": "Drawdown Maximum",
-    "ADD": "Drawdown Moyen",
-    "CDaR": "Drawdown Conditionnel à Risque (CDaR)",
-    "UCI": "Indice Ulcer",
-    "EDaR": "Drawdown Entropic à Risque (EDaR)"
-}
-
-# Dictionnaire des 32 mesures de risque pour HRP et HERC
-HRP_HERC_RISK_MEASURES = {
-    # Mesures de Dispersion
-    "vol": "Écart-type (Standard Deviation)",
-    "variance": "Variance",
-    "kurt": "Racine Carrée de la Kurtosis",
-    "mad": "Écart Absolu Moyen (MAD)",
-    "gmd": "Différence Moyenne de Gini (GMD)",
-    "cvrg": "Plage CVaR (CVaR Range)",
-    "tgrg": "Plage Tail Gini (Tail Gini Range)",
-    "rg": "Plage (Range)",
-    
-    # Mesures de Risque à la Baisse
-    "semi": "Écart-type Semi (Semi Standard Deviation)",
-    "skurt": "Racine Carrée Semi-Kurtosis",
-    "flpm": "Premier Moment Partiel Inférieur (Omega Ratio)",
-    "slpm": "Second Moment Partiel Inférieur (Sortino Ratio)",
-    "var": "Valeur à Risque (VaR)",
-    "cvar": "Valeur à Risque Conditionnelle (CVaR)",
-    "evar": "Valeur à Risque Entropic (EVaR)",
-    "rlvar": "Valeur à Risque Relativiste (RLVaR)",
-    "tg": "Tail Gini",
-    "wr": "Pire Réalisation (Minimax)",
-    
-    # Mesures de Drawdown (rendements composés)
-    "mdd": "Drawdown Maximum (Calmar Ratio)",
-    "add": "Drawdown Moyen",
-    "uci": "Indice Ulcer",
-    "dar": "Drawdown à Risque (DaR)",
-    "cdar": "Drawdown Conditionnel à Risque (CDaR)",
-    "edar": "Drawdown Entropic à Risque (EDaR)",
-    "rdar": "Drawdown Relativiste à Risque (RDaR)",
-    
-    # Mesures de Drawdown (rendements non composés)
-    "mdd_rel": "Drawdown Maximum - Non Composé",
-    "add_rel": "Drawdown Moyen - Non Composé",
-    "uci_rel": "Indice Ulcer - Non Composé",
-    "dar_rel": "DaR - Non Composé",
-    "cdar_rel": "CDaR - Non Composé",
-    "edar_rel": "EDaR - Non Composé",
-    "rdar_rel": "RDaR - Non Composé"
-}
-
 # Functions
-@st.cache_data
+def fetch_close_prices(tickers, start_date, end_date):
+    """Télécharge les cours de clôture bruts depuis Yahoo Finance (une colonne par symbole)"""
+    data = yf.download(tickers, start=start_date, end=end_date, progress=False)
+    if isinstance(data.columns, pd.MultiIndex):
+        return data['Close']
+    return data[['Close']].set_axis(tickers[:1], axis=1)
+
 def download_data(tickers, start_date, end_date):
-    """Télécharge les données historiques depuis Yahoo Finance"""
+    """
+    Données historiques depuis Yahoo Finance, via le magasin des cours partagé par les sessions
+    
+    Seuls les symboles absents du magasin (ou sur une période plus courte) sont
+    téléchargés ; le tableau retourné est en lecture seule et partage ses cours avec
+    ceux des autres sessions. Les dates sans aucun cours sont retirées et les cours
+    manquants complétés (ffill puis bfill).
+    """
     try:
-        data = yf.download(tickers, start=start_date, end=end_date, progress=False)
-        if isinstance(data.columns, pd.MultiIndex):
-            prices = data['Close']
-        else:
-            prices = data[['Close']]
-        
-        # Clean data
-        prices = prices.dropna(how='all')
-        prices = prices.ffill().bfill()
-        
-        return prices
+        return get_price_store().panel(tickers, start_date, end_date, fetch_close_prices)
     except Exception as e:
         st.error(f"Erreur lors du téléchargement des données: {str(e)}")
         return None
@@ -154,131 +114,36 @@ def read_uploaded_file(uploaded_file):
         st.error(f"Erreur lors de la lecture du fichier: {str(e)}")
         return None
 
-def calculate_portfolio(prices, model, risk_measure, rf, risk_aversion, uncertainty):
-    """
-    Calcule les poids optimaux du portefeuille selon le modèle sélectionné
-    Utilise les modules séparés dans le dossier models/
-    """
-    try:
-        # Calculate returns
-        returns = prices.pct_change().dropna()
-        
-        # Dictionnaire de mapping des modèles vers les fonctions
-        model_functions = {
-            "Portefeuille de Rendement Maximum": optimize_max_return,
-            "Portefeuille de Risque Minimum": optimize_min_risk,
-            "Portefeuille de Sharpe Maximum": optimize_max_sharpe,
-            "Portefeuille d'Utilité Maximum": optimize_max_utility,
-            "Portefeuille de Parité de Risque": optimize_risk_parity,
-            "Portefeuille de Parité de Risque Relaxée": optimize_relaxed_risk_parity,
-            "Portefeuille Robuste - Rendement Maximum": optimize_robust_max_return,
-            "Portefeuille Robuste - Risque Minimum": optimize_robust_min_risk,
-            "Portefeuille Robuste - Sharpe Maximum": optimize_robust_max_sharpe,
-            "Portefeuille Robuste - Utilité Maximum": optimize_robust_max_utility,
-            "Hierarchical Risk Parity (HRP)": optimize_hrp,
-            "Hierarchical Equal Risk Contribution (HERC)": optimize_herc,
-            "Nested Clustered Optimization (NCO)": optimize_nco
-        }
-        
-        # Obtenir la fonction d'optimisation correspondante
-        optimize_func = model_functions.get(model)
-        
-        if optimize_func is None:
-            st.error(f"Modèle non reconnu: {model}")
-            return None, None, None
-        
-        # Appeler la fonction d'optimisation avec les paramètres appropriés
-        w, port, returns_calc = optimize_func(
-            returns=returns,
-            risk_measure=risk_measure,
-            rf=rf,
-            risk_aversion=risk_aversion,
-            uncertainty=uncertainty
-        )
-        
-        if w is None or w.sum().sum() == 0:
-            st.error("L'optimisation a échoué. Essayez différents paramètres.")
-            return None, None, None
-            
-        return w, port, returns_calc
-        
-    except Exception as e:
-        st.error(f"Erreur lors de l'optimisation: {str(e)}")
-        return None, None, None
-        
-    except Exception as e:
-        st.error(f"Erreur lors de l'optimisation: {str(e)}")
-        return None, None
+def render_optimization_error(result):
+    """Affiche l'échec d'une optimisation à partir de son résultat structuré"""
+    if result.status == 'infeasible':
+        st.error("L'optimisation a échoué. Essayez différents paramètres.")
+        st.caption(result.error)
+    else:
+        st.error(result.error)
+        if result.error_type:
+            st.caption(f"Type d'erreur : {result.error_type}")
 
-def calculate_metrics(weights, port):
-    """Calcule les métriques du portefeuille"""
+def calculate_metrics(weights, port, risk_measure=None, periods=DEFAULT_PERIODS):
+    """Calcule les métriques du portefeuille, dont la mesure de risque optimisée"""
     try:
-        metrics = {}
-        
-        # Expected return
-        metrics['Rendement Annuel Attendu'] = (port.mu @ weights).iloc[0, 0] * 252
-        
-        # Volatility
-        metrics['Volatilité Annuelle'] = np.sqrt(weights.T @ port.cov @ weights).iloc[0, 0] * np.sqrt(252)
-        
-        # Sharpe Ratio
-        if metrics['Volatilité Annuelle'] > 0:
-            metrics['Ratio de Sharpe'] = (metrics['Rendement Annuel Attendu'] - port.rf) / metrics['Volatilité Annuelle']
-        else:
-            metrics['Ratio de Sharpe'] = 0
-        
-        return metrics
+        return portfolio_summary(weights, port, risk_measure, periods)
     except Exception as e:
         st.error(f"Erreur lors du calcul des métriques: {str(e)}")
         return None
 
-def get_descriptive_stats(prices):
+def get_descriptive_stats(prices, stats=None, periods=DEFAULT_PERIODS):
     """Calcule les statistiques descriptives pour les actifs"""
-    returns = prices.pct_change().dropna()
-    
-    stats = pd.DataFrame({
-        'Rendement Moyen (%)': returns.mean() * 252 * 100,
-        'Volatilité (%)': returns.std() * np.sqrt(252) * 100,
-        'Min (%)': returns.min() * 100,
-        'Max (%)': returns.max() * 100,
-        'Skewness': returns.skew(),
-        'Kurtosis': returns.kurtosis()
-    })
+    if stats is None:
+        stats = asset_statistics(prices.pct_change().dropna())
     
-    return stats
+    return descriptive_table(stats, periods)
 
-def get_performance_table(prices, returns, port):
-    """Génère un tableau de performance avec indicateurs de risque"""
+def get_performance_table(prices, returns, port, risk_measure=None, stats=None, periods=DEFAULT_PERIODS):
+    """Génère un tableau de performance avec indicateurs de risque (port.rf est par période)"""
     try:
-        # Calcul des rendements annualisés
-        annual_returns = returns.mean() * 252
-        
-        # Calcul des volatilités annualisées
-        annual_vol = returns.std() * np.sqrt(252)
-        
-        # Sharpe ratio
-        sharpe = (annual_returns - port.rf) / annual_vol
-        
-        # Max drawdown
-        cumulative_returns = (1 + returns).cumprod()
-        running_max = cumulative_returns.cummax()
-        drawdown = (cumulative_returns - running_max) / running_max
-        max_dd = drawdown.min()
-        
-        # VaR et CVaR
-        var_95 = returns.quantile(0.05)
-        cvar_95 = returns[returns <= var_95].mean()
-        
-        performance_df = pd.DataFrame({
-            'Rendement Annuel (%)': annual_returns * 100,
-            'Volatilité Annuelle (%)': annual_vol * 100,
-            'Ratio de Sharpe': sharpe,
-            'Drawdown Maximum (%)': max_dd * 100,
-            'VaR 95% (%)': var_95 * 100,
-            'CVaR 95% (%)': cvar_95 * 100
-        })
-        
-        return performance_df
+        return performance_table(returns, port.rf * periods, risk_measure, alpha=port.alpha, stats=stats,
+                                 periods=periods)
     except Exception as e:
         st.error(f"Erreur lors du calcul du tableau de performance: {str(e)}")
         return None
@@ -307,6 +172,40 @@ def plot_weights(weights):
     
     return fig
 
+def plot_risk_contributions(weights, contributions, risk_measure):
+    """Compare les poids et les contributions au risque de chaque actif"""
+    table = pd.DataFrame({
+        'Poids': weights.iloc[:, 0],
+        'Contribution': contributions.iloc[:, 0]
+    })
+    table = table[(table['Poids'] > 0.001) | (table['Contribution'].abs() > 0.001)]
+    table = table.sort_values('Contribution', ascending=False)
+    
+    fig = go.Figure(data=[
+        go.Bar(
+            x=table.index,
+            y=table['Poids'] * 100,
+            name='Poids',
+            marker_color='indianred'
+        ),
+        go.Bar(
+            x=table.index,
+            y=table['Contribution'] * 100,
+            name='Contribution au Risque',
+            marker_color='steelblue'
+        )
+    ])
+    
+    fig.update_layout(
+        title=f"Contributions au Risque ({risk_measure})",
+        xaxis_title="Actifs",
+        yaxis_title="Part du Total (%)",
+        barmode='group',
+        height=400
+    )
+    
+    return fig
+
 def plot_pie_chart(weights):
     """Affiche les poids du portefeuille en diagramme circulaire"""
     weights_df = weights.copy()
@@ -326,29 +225,50 @@ def plot_pie_chart(weights):
     
     return fig
 
-def plot_efficient_frontier(port, weights, risk_measure):
-    """Affiche la frontière efficiente"""
+def frontier_table(port, frontier, risk_measure, periods=DEFAULT_PERIODS):
+    """
+    Rendement annuel attendu et risque de chaque point de la frontière efficiente
+    
+    Calculés en une passe pour tous les points ; la variance est exprimée en volatilité
+    annualisée (periods périodes par an), les autres mesures par période.
+    
+    Returns:
+    --------
+    pd.DataFrame : indexé par le numéro du point, colonnes 'Rendement Attendu' et 'Risque'
+    """
+    risk_scale = np.sqrt(periods) if risk_measure == 'MV' else 1
+    return pd.DataFrame({
+        'Rendement Attendu': (port.mu.to_numpy() @ frontier.to_numpy()).ravel() * periods,
+        'Risque': portfolio_risk(port.returns, frontier, risk_measure, alpha=port.alpha) * risk_scale
+    }, index=pd.RangeIndex(1, frontier.shape[1] + 1, name='Point'))
+
+def efficient_frontier(port, risk_measure, points=None):
+    """
+    Poids des points de la frontière efficiente d'un portefeuille estimé
+    
+    Riskfolio-Lib modifie le portefeuille pendant le calcul (limites de risque, frontier) ;
+    le portefeuille d'un résultat mis en cache étant partagé par les sessions et les
+    tâches, le calcul porte sur une copie superficielle (moments partagés, non modifiés).
+    """
+    points = FRONTIER_POINTS if points is None else points
+    return copy.copy(port).efficient_frontier(model='Classic', rm=risk_measure, points=points, rf=port.rf, hist=True)
+
+def plot_efficient_frontier(port, weights, risk_measure, frontier=None, periods=DEFAULT_PERIODS):
+    """Affiche la frontière efficiente (calculée ici si `frontier` n'est pas fournie)"""
     try:
-        points = 50
-        frontier = port.efficient_frontier(model='Classic', rm=risk_measure, points=points, rf=port.rf, hist=True)
+        if frontier is None:
+            frontier = efficient_frontier(port, risk_measure)
         
         if frontier is None:
             return None
         
-        # Calculate risk and return for each point
-        risk_values = []
-        return_values = []
-        
-        for i in range(frontier.shape[1]):
-            w = frontier.iloc[:, i:i+1]
-            ret = (port.mu @ w).iloc[0, 0] * 252
-            vol = np.sqrt(w.T @ port.cov @ w).iloc[0, 0] * np.sqrt(252)
-            return_values.append(ret)
-            risk_values.append(vol)
+        points = frontier_table(port, frontier, risk_measure, periods)
+        return_values, risk_values = points['Rendement Attendu'], points['Risque']
         
         # Calculate current portfolio
-        current_ret = (port.mu @ weights).iloc[0, 0] * 252
-        current_vol = np.sqrt(weights.T @ port.cov @ weights).iloc[0, 0] * np.sqrt(252)
+        risk_scale = np.sqrt(periods) if risk_measure == 'MV' else 1
+        current_ret = (port.mu @ weights).iloc[0, 0] * periods
+        current_vol = portfolio_risk(port.returns, weights, risk_measure, alpha=port.alpha)[0] * risk_scale
         
         fig = go.Figure()
         
@@ -372,7 +292,7 @@ def plot_efficient_frontier(port, weights, risk_measure):
         
         fig.update_layout(
             title="Frontière Efficiente",
-            xaxis_title="Risque (Volatilité)",
+            xaxis_title="Risque (Volatilité)" if risk_measure == 'MV' else f"Risque ({risk_measure})",
             yaxis_title="Rendement Attendu",
             height=500,
             showlegend=True
@@ -383,102 +303,861 @@ def plot_efficient_frontier(port, weights, risk_measure):
         st.warning(f"Impossible d'afficher la frontière efficiente: {str(e)}")
         return None
 
-def plot_correlation_matrix(returns):
-    """Affiche la matrice de corrélation"""
-    corr = returns.corr()
-    
-    fig = go.Figure(data=go.Heatmap(
-        z=corr.values,
-        x=corr.columns,
-        y=corr.columns,
-        colorscale='RdBu',
-        zmid=0,
-        text=corr.values,
-        texttemplate='%{text:.2f}',
-        textfont={"size": 10},
-        colorbar=dict(title="Corrélation")
-    ))
+def plot_comparison_frontier(port, weights, risk_measure, frontier=None, periods=DEFAULT_PERIODS):
+    """Place les modèles comparés (une colonne de poids par modèle) sur la frontière efficiente"""
+    points = frontier_table(port, weights, risk_measure, periods)
+    
+    fig = go.Figure()
+    
+    if frontier is not None:
+        line = frontier_table(port, frontier, risk_measure, periods)
+        fig.add_trace(go.Scatter(
+            x=line['Risque'],
+            y=line['Rendement Attendu'],
+            mode='lines',
+            name='Frontière Efficiente',
+            line=dict(color='blue', width=2)
+        ))
+    
+    for model, expected_return, risk in zip(weights.columns, points['Rendement Attendu'], points['Risque']):
+        fig.add_trace(go.Scatter(
+            x=[risk],
+            y=[expected_return],
+            mode='markers',
+            name=model,
+            marker=dict(size=12, symbol='diamond')
+        ))
     
     fig.update_layout(
-        title="Matrice de Corrélation",
+        title="Modèles Comparés",
+        xaxis_title="Risque (Volatilité)" if risk_measure == 'MV' else f"Risque ({risk_measure})",
+        yaxis_title="Rendement Attendu",
         height=500,
-        xaxis_showgrid=False,
-        yaxis_showgrid=False,
-        yaxis_autorange='reversed'
+        showlegend=True
     )
     
     return fig
 
-def plot_dendrogram(returns, linkage='ward', codependence='pearson'):
-    """Affiche le dendrogramme pour les modèles hiérarchiques"""
-    try:
-        from scipy.cluster.hierarchy import dendrogram, linkage as sp_linkage
-        from scipy.spatial.distance import squareform
-        
-        # Calculate distance matrix based on codependence method
-        if codependence == 'pearson':
-            corr = returns.corr()
-            # Convert correlation to distance: d = sqrt(0.5 * (1 - corr))
-            dist = np.sqrt(0.5 * (1 - corr))
-        elif codependence == 'spearman':
-            corr = returns.corr(method='spearman')
-            dist = np.sqrt(0.5 * (1 - corr))
-        elif codependence == 'kendall':
-            corr = returns.corr(method='kendall')
-            dist = np.sqrt(0.5 * (1 - corr))
+def plot_rolling_metric(frame, title, yaxis_title, max_assets=10, percent=False):
+    """Affiche un indicateur glissant du portefeuille (s'il est présent) et des principaux actifs"""
+    scale = 100 if percent else 1
+    assets = [col for col in frame.columns if col != PORTFOLIO_COLUMN][:max_assets]
+    
+    fig = go.Figure()
+    for asset in assets:
+        fig.add_trace(go.Scatter(
+            x=frame.index,
+            y=frame[asset] * scale,
+            mode='lines',
+            name=asset,
+            line=dict(width=1),
+            opacity=0.6
+        ))
+    if PORTFOLIO_COLUMN in frame.columns:
+        fig.add_trace(go.Scatter(
+            x=frame.index,
+            y=frame[PORTFOLIO_COLUMN] * scale,
+            mode='lines',
+            name=PORTFOLIO_COLUMN,
+            line=dict(color='black', width=3)
+        ))
+    
+    fig.update_layout(
+        title=title,
+        xaxis_title="Date",
+        yaxis_title=yaxis_title,
+        height=450,
+        hovermode='x unified'
+    )
+    
+    return fig
+
+def show_chart(name, build, deps=(), data=(), params=None):
+    """
+    Affiche une figure Plotly depuis le cache des figures (runtime.figure_cache)
+    
+    La figure n'est construite que si les étapes, données ou paramètres qui l'alimentent
+    ont changé ; sa construction et sa sérialisation sont chronométrées (chronologie de
+    la page).
+    
+    Parameters:
+    -----------
+    name : str
+        Nom de la figure (clé du cache et nom des étapes chronométrées)
+    build : callable
+        build() -> go.Figure ou None
+    deps, data, params :
+        Clés des étapes amont, données brutes et paramètres de la figure
+    """
+    fig, _ = cached_figure(name, build, deps=deps, data=data, params=params)
+    if fig is not None:
+        with span(f"rendu : {name}"):
+            st.plotly_chart(fig, use_container_width=True)
+
+# Intervalle de rafraîchissement de la progression d'une optimisation (secondes)
+JOB_POLL_SECONDS = 0.5
+
+# Nombre de points de la frontière efficiente (réduit par le budget mémoire pour les gros problèmes)
+FRONTIER_POINTS = 50
+
+# Fréquences des données proposées (voir analytics.frequency)
+FREQUENCY_LABELS = {
+    'daily': "Journalière",
+    'weekly': "Hebdomadaire",
+    'monthly': "Mensuelle"
+}
+
+def _model_params(request):
+    """Paramètres optionnels de run_model d'une demande d'optimisation"""
+    return {
+        'risk_aversion': request['risk_aversion'],
+        'uncertainty': request['uncertainty'],
+        'uncertainty_set': request['uncertainty_set'],
+        'bootstrap_method': request['bootstrap_method'],
+        'linkage': request['linkage'],
+        'codependence': request['codependence']
+    }
+
+def solve_stage(request, model, risk_measure):
+    """
+    Étape « optimisation » d'un modèle, mise en cache et mesurée en mémoire
+    
+    Partagée par l'optimisation simple et la comparaison de modèles : un modèle déjà
+    optimisé avec les mêmes rendements et paramètres n'est pas ré-optimisé.
+    
+    Returns:
+    --------
+    tuple : (OptimizationResult, clé de l'étape, pic de mémoire en octets) ; un échec
+            n'est pas mis en cache
+    """
+    rf = request['rf_period']
+    model_params = _model_params(request)
+    failure = {}
+    
+    def solve():
+        # Une demande identique à une exécution réussie est relue dans l'historique
+        result = models.run_model(request['solve_returns'], model, risk_measure, rf, store=get_run_store(), **model_params)
+        if result.ok:
+            return result
+        # Les échecs ne sont pas mis en cache (l'erreur est réaffichée)
+        failure['result'] = result
+        return None
+    
+    # Seuls les paramètres utilisés par le modèle entrent dans la clé : modifier
+    # l'aversion au risque ne ré-optimise que les modèles d'utilité
+    with MemoryTracker() as memory:
+        result, portfolio_key = cached_stage(
+            'optimisation',
+            solve,
+            deps=[request['solve_returns_key']],
+            params=dict(
+                {name: model_params[name] for name in models.model_parameters(model)},
+                model=model,
+                risk_measure=risk_measure,
+                rf=rf
+            )
+        )
+    return (result if result is not None else failure['result']), portfolio_key, memory.peak_delta
+
+def optimization_job(job, request):
+    """
+    Tâche d'arrière-plan : optimisation, frontière efficiente et intervalles bootstrap
+    
+    S'exécute hors du contexte Streamlit (aucun appel à st.*) : les erreurs sont
+    renvoyées dans le résultat et affichées par la page. Chaque étape passe par le
+    cache des étapes et l'annulation est vérifiée entre deux étapes (et entre deux
+    lots de rééchantillonnages bootstrap).
+    
+    L'optimisation porte sur la fenêtre retenue par le budget mémoire (voir
+    submit_optimization) ; le pic de mémoire de chaque étape de calcul est mesuré.
+    
+    Returns:
+    --------
+    dict : {'result', 'portfolio_key', 'frontier', 'frontier_error', 'intervals', 'bootstrap_error',
+            'timeline', 'memory'} ; la chronologie des étapes est aussi ajoutée au journal des
+            durées, memory associe à chaque étape son pic de mémoire (octets)
+    """
+    model = request['model']
+    risk_measure = request['risk_measure']
+    rf = request['rf_period']
+    model_params = _model_params(request)
+    with_frontier = model not in models.HIERARCHICAL_MODELS
+    with_bootstrap = request['run_bootstrap']
+    # Répartition de la barre de progression entre les étapes
+    steps = [0.0, 0.5 if (with_frontier or with_bootstrap) else 1.0]
+    if with_frontier:
+        steps.append(0.75 if with_bootstrap else 1.0)
+    
+    outcome = {
+        'result': None,
+        'portfolio_key': None,
+        'frontier': None,
+        'frontier_error': None,
+        'intervals': None,
+        'bootstrap_error': None,
+        'timeline': Timeline('tâche', session=request.get('session'), model=model, risk_measure=risk_measure),
+        'memory': {}
+    }
+    
+    with outcome['timeline'].activate():
+        try:
+            job.report(steps[0], f"Optimisation : {model}")
+            result, portfolio_key, outcome['memory']['optimisation'] = solve_stage(request, model, risk_measure)
+            outcome['result'] = result
+            outcome['portfolio_key'] = portfolio_key
+            if not result.ok:
+                return outcome
+    
+            if with_frontier:
+                job.report(steps[1], "Calcul de la frontière efficiente")
+                port = result.port
+                points = request['plan']['frontier_points']
+                try:
+                    with MemoryTracker() as memory:
+                        outcome['frontier'], _ = cached_stage(
+                            'frontiere',
+                            lambda: efficient_frontier(port, risk_measure, points),
+                            deps=[portfolio_key],
+                            params={'points': points}
+                        )
+                    outcome['memory']['frontiere'] = memory.peak_delta
+                except Exception as e:
+                    outcome['frontier_error'] = str(e)
+    
+            if with_bootstrap:
+                start = steps[-1]
+                n_bootstrap = request['n_bootstrap']
+                job.report(start, f"Intervalles bootstrap ({n_bootstrap} rééchantillonnages)")
+        
+                def progress(done, total):
+                    job.report(start + (1 - start) * done / total, f"Intervalles bootstrap ({done}/{total})")
+        
+                try:
+                    bootstrap_params = dict(model_params)
+                    if model in models.ROBUST_MODELS:
+                        # Ensembles d'incertitude de l'échantillon de base (en cache), recentrés
+                        # sur chaque rééchantillonnage au lieu d'être réestimés
+                        bootstrap_params['uncertainty_sets'] = models.get_uncertainty_sets(
+                            result.returns,
+                            method=request['bootstrap_method'],
+                            ellip_cov=(request['uncertainty_set'] == 'ellip'),
+                            n_jobs=MAX_TASK_PROCESSES
+                        )
+                    outcome['intervals'], _ = cached_stage(
+                        'bootstrap',
+                        lambda: bootstrap_confidence_intervals(
+                            result.returns,
+                            models.MODEL_FUNCTIONS[model],
+                            risk_measure=risk_measure,
+                            rf=rf,
+                            n_samples=n_bootstrap,
+                            n_jobs=MAX_TASK_PROCESSES,
+                            progress=progress,
+                            periods=request['periods'],
+                            **bootstrap_params
+                        ),
+                        deps=[portfolio_key],
+                        params={'n_samples': n_bootstrap}
+                    )
+                except JobCancelled:
+                    raise
+                except Exception as e:
+                    outcome['bootstrap_error'] = str(e)
+    
+            return outcome
+        finally:
+            try:
+                write_timeline(outcome['timeline'])
+            except OSError:
+                pass
+
+def comparison_job(job, request, model):
+    """
+    Tâche d'arrière-plan d'un modèle de la comparaison : optimisation seule
+    
+    Chaque modèle comparé est une tâche de la file partagée, exécutée en parallèle des
+    autres sur les mêmes rendements ; les moments historiques sont estimés une seule
+    fois pour tous (models.historical_portfolio).
+    
+    Returns:
+    --------
+    dict : {'result', 'portfolio_key', 'risk_measure', 'timeline', 'memory'} ; risk_measure
+           est la mesure optimisée par le modèle (voir models.comparable_risk_measure)
+    """
+    risk_measure = request['risk_measures'][model]
+    outcome = {
+        'result': None,
+        'portfolio_key': None,
+        'risk_measure': risk_measure,
+        'timeline': Timeline('tâche', session=request.get('session'), model=model, risk_measure=risk_measure),
+        'memory': {}
+    }
+    
+    with outcome['timeline'].activate():
+        try:
+            job.report(0.0, f"Optimisation : {model}")
+            outcome['result'], outcome['portfolio_key'], outcome['memory']['optimisation'] = solve_stage(
+                request, model, risk_measure
+            )
+            return outcome
+        finally:
+            try:
+                write_timeline(outcome['timeline'])
+            except OSError:
+                pass
+
+def comparison_frontier_job(job, request):
+    """
+    Tâche d'arrière-plan de la comparaison : frontière efficiente de la mesure choisie
+    
+    Calculée sur les moments partagés par les modèles comparés, pour y placer chacun
+    d'eux ; sans objet pour les mesures propres à HRP/HERC sans équivalent classique.
+    
+    Returns:
+    --------
+    pd.DataFrame ou None : poids des points de la frontière (N x points)
+    """
+    risk_measure = request['frontier_measure']
+    points = request['plan']['frontier_points']
+    rf = request['rf_period']
+    
+    def frontier():
+        job.report(0.0, f"Frontière efficiente ({risk_measure})")
+        port = models.historical_portfolio(request['solve_returns'], rf)
+        return port.efficient_frontier(model='Classic', rm=risk_measure, points=points, rf=rf, hist=True)
+    
+    timeline = Timeline('tâche', session=request.get('session'), model='comparaison', risk_measure=risk_measure)
+    with timeline.activate():
+        try:
+            weights, _ = cached_stage(
+                'frontiere_comparaison',
+                frontier,
+                deps=[request['solve_returns_key']],
+                params={'risk_measure': risk_measure, 'rf': rf, 'points': points}
+            )
+            return weights
+        finally:
+            try:
+                write_timeline(timeline)
+            except OSError:
+                pass
+
+def session_id():
+    """Identifiant de la session Streamlit (regroupe ses durées dans le journal)"""
+    if 'session_id' not in st.session_state:
+        st.session_state['session_id'] = uuid.uuid4().hex[:12]
+    return st.session_state['session_id']
+
+def cancel_session_jobs():
+    """Annule les tâches non terminées de la session (optimisation ou comparaison)"""
+    comparison_ids = [st.session_state.get('comparison_frontier_job')]
+    comparison_ids += list((st.session_state.get('comparison_jobs') or {}).values())
+    jobs = [get_job_queue().get(st.session_state.get('optimization_job'))]
+    jobs += [get_job_queue('comparaison').get(job_id) for job_id in comparison_ids]
+    for job in jobs:
+        if job is not None and not job.done:
+            job.cancel()
+
+def prepare_returns(request):
+    """
+    Ajoute à la demande ses rendements et l'identifiant de la session
+    
+    Les prix sont rééchantillonnés à la fréquence demandée avant le calcul des rendements
+    (étapes mises en cache) ; le facteur d'annualisation est déduit des dates des
+    rendements obtenus et le taux sans risque annuel converti par période.
+    """
+    prices = request['prices']
+    frequency = request.get('frequency', 'daily')
+    request['session'] = session_id()
+    prices_key = request['prices_key']
+    if frequency != 'daily':
+        # Les prix journaliers sont utilisés tels quels (sans étape en cache qui retiendrait
+        # le tableau du magasin des cours)
+        prices, prices_key = cached_stage(
+            'reechantillonnage', lambda: resample_prices(prices, frequency), deps=[prices_key],
+            params={'frequency': frequency}
+        )
+    request['returns'], request['returns_key'] = cached_stage(
+        'rendements', lambda: prices.pct_change().dropna(), deps=[prices_key]
+    )
+    request['periods'] = periods_per_year(request['returns'].index)
+    request['rf_period'] = request['rf'] / request['periods']
+
+def select_window(request, n_periods):
+    """Ajoute à la demande les rendements optimisés : les n_periods plus récentes (budget mémoire)"""
+    returns = request['returns']
+    request['solve_returns'], request['solve_returns_key'] = returns, request['returns_key']
+    if n_periods < len(returns):
+        request['solve_returns'], request['solve_returns_key'] = cached_stage(
+            'fenetre', lambda: returns.iloc[-n_periods:], deps=[request['returns_key']], params={'n_periods': n_periods}
+        )
+
+def submit_optimization(request):
+    """
+    Soumet une optimisation en arrière-plan et l'associe à la session
+    
+    La tâche précédente de la session, si elle n'est pas terminée, est annulée.
+    Les rendements (étape mise en cache) sont ajoutés à la demande, ainsi que le plan
+    du budget mémoire (models.plan_run) : une demande trop volumineuse n'est pas
+    soumise, une demande réduite est optimisée sur les périodes les plus récentes.
+    
+    Returns:
+    --------
+    Job ou None : None si le budget mémoire refuse la demande
+    """
+    cancel_session_jobs()
+    prepare_returns(request)
+    returns = request['returns']
+    plan = models.plan_run(
+        len(returns.columns),
+        len(returns),
+        request['model'],
+        request['risk_measure'],
+        frontier_points=FRONTIER_POINTS,
+        uncertainty_set=request['uncertainty_set']
+    )
+    request['plan'] = plan
+    if plan['action'] == 'refuse':
+        st.session_state['optimization_request'] = request
+        st.session_state['optimization_job'] = None
+        return None
+    
+    select_window(request, plan['n_periods'])
+    job = get_job_queue().submit(optimization_job, request, name=request['model'])
+    st.session_state['optimization_request'] = request
+    st.session_state['optimization_job'] = job.id
+    return job
+
+def submit_comparison(request):
+    """
+    Soumet la comparaison de plusieurs modèles : une tâche par modèle, en parallèle
+    
+    La mesure de risque choisie est traduite pour chaque modèle
+    (models.comparable_risk_measure). Chaque modèle est confronté au budget mémoire
+    (models.plan_run) : les modèles refusés sont écartés et les autres sont optimisés
+    sur la plus courte des fenêtres retenues, pour rester comparables. La frontière
+    efficiente de la mesure choisie est une tâche supplémentaire.
+    
+    Returns:
+    --------
+    dict ou None : {modèle: Job}, None si aucun modèle ne tient dans le budget
+    """
+    cancel_session_jobs()
+    prepare_returns(request)
+    returns = request['returns']
+    request['risk_measures'] = {
+        model: models.comparable_risk_measure(model, request['risk_measure']) for model in request['models']
+    }
+    plans = {
+        model: models.plan_run(
+            len(returns.columns),
+            len(returns),
+            model,
+            request['risk_measures'][model],
+            frontier_points=FRONTIER_POINTS,
+            uncertainty_set=request['uncertainty_set']
+        )
+        for model in request['models']
+    }
+    runnable = [model for model, plan in plans.items() if plan['action'] != 'refuse']
+    actions = {plan['action'] for plan in plans.values()}
+    request['plan'] = {
+        'action': 'refuse' if not runnable else ('run' if actions == {'run'} else 'downgrade'),
+        'n_periods': min((plans[model]['n_periods'] for model in runnable), default=len(returns)),
+        'frontier_points': min((plans[model]['frontier_points'] for model in runnable
+                                if plans[model]['frontier_points']), default=FRONTIER_POINTS),
+        'estimate': max((plans[model]['estimate'] for model in runnable), default=0),
+        'budget': next(iter(plans.values()))['budget'],
+        'reasons': [f"{model} : {reason}" for model, plan in plans.items() for reason in plan['reasons']]
+    }
+    st.session_state['optimization_request'] = request
+    st.session_state['optimization_job'] = None
+    st.session_state['comparison_jobs'] = {}
+    st.session_state['comparison_frontier_job'] = None
+    if not runnable:
+        return None
+    
+    request['models'] = runnable
+    measure = resolve_risk_measure(request['risk_measure'])
+    request['frontier_measure'] = measure if measure in models.RISK_MEASURES_DICT else None
+    select_window(request, request['plan']['n_periods'])
+    
+    queue = get_job_queue('comparaison')
+    jobs = {model: queue.submit(comparison_job, request, model, name=model) for model in runnable}
+    st.session_state['comparison_jobs'] = {model: job.id for model, job in jobs.items()}
+    if request['frontier_measure'] is not None:
+        frontier_job = queue.submit(comparison_frontier_job, request, name='Frontière efficiente')
+        st.session_state['comparison_frontier_job'] = frontier_job.id
+    return jobs
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def show_job_progress(job_id):
+    """Affiche la progression d'une tâche et relance la page à sa fin"""
+    job = get_job_queue().get(job_id)
+    if job is None or job.done:
+        st.rerun()
+    
+    st.progress(job.progress, text=job.message or "En attente d'un worker...")
+    col1, col2 = st.columns([1, 4])
+    with col1:
+        if st.button("⏹️ Annuler", disabled=job.cancel_requested):
+            job.cancel()
+    with col2:
+        if job.cancel_requested:
+            st.caption("Annulation demandée, arrêt à la fin de l'étape en cours...")
         else:
-            corr = returns.corr()
-            dist = np.sqrt(0.5 * (1 - corr))
-        
-        # Convert to condensed distance matrix
-        dist_condensed = squareform(dist, checks=False)
-        
-        # Perform hierarchical clustering
-        Z = sp_linkage(dist_condensed, method=linkage)
-        
-        # Create dendrogram
-        fig = go.Figure()
-        
-        # Calculate dendrogram data
-        dendro = dendrogram(Z, labels=returns.columns.tolist(), no_plot=True)
-        
-        # Add lines for dendrogram
-        icoord = np.array(dendro['icoord'])
-        dcoord = np.array(dendro['dcoord'])
-        
-        for i in range(len(icoord)):
-            fig.add_trace(go.Scatter(
-                x=icoord[i],
-                y=dcoord[i],
-                mode='lines',
-                line=dict(color='rgb(100,100,100)', width=1),
-                showlegend=False,
-                hoverinfo='skip'
-            ))
-        
-        # Add labels
-        labels = dendro['ivl']
-        x_labels = np.arange(5, len(labels) * 10 + 5, 10)
-        
-        fig.update_layout(
-            title=f"Dendrogramme (Clustering Hiérarchique - {linkage.capitalize()})",
-            xaxis=dict(
-                tickmode='array',
-                tickvals=x_labels,
-                ticktext=labels,
-                tickangle=-45
-            ),
-            yaxis_title="Distance",
-            height=500,
-            showlegend=False,
-            plot_bgcolor='white'
+            st.caption(f"Temps écoulé : {job.elapsed:.1f} s")
+
+def render_data_analysis(request):
+    """
+    Affiche les statistiques, la corrélation, le dendrogramme et le tableau de performance
+    
+    Returns:
+    --------
+    dict : {'statistiques', 'performance'} tables affichées, reprises dans le rapport exporté
+    """
+    prices = request['prices']
+    returns = request['returns']
+    returns_key = request['returns_key']
+    risk_measure = request['risk_measure']
+    risk_free_rate = request['rf_period']
+    periods = request['periods']
+    
+    # Étapes mises en cache : chaque clé dépend des étapes amont et des seuls
+    # paramètres utilisés, un changement ne recalcule que les étapes concernées
+    asset_stats, stats_key = cached_stage(
+        'statistiques', lambda: asset_statistics(returns, alpha=0.05), deps=[returns_key]
+    )
+    
+    st.header("📊 Analyse des Données")
+    
+    # Statistiques descriptives
+    st.subheader("📈 Statistiques Descriptives des Actifs")
+    desc_stats, _ = cached_stage(
+        'statistiques_descriptives', lambda: get_descriptive_stats(prices, asset_stats, periods), deps=[stats_key]
+    )
+    
+    # Utiliser des gradients de couleur pour les tableaux
+    st.dataframe(
+        desc_stats.style.background_gradient(cmap='RdYlGn', subset=['Rendement Moyen (%)']),
+        use_container_width=True
+    )
+    
+    # Matrice de corrélation
+    st.subheader("🔗 Matrice de Corrélation")
+    # Classification (méthodes choisies par l'utilisateur) partagée par la matrice de
+    # corrélation (ordre des feuilles) et le dendrogramme
+    linkage, codependence = request['linkage'], request['codependence']
+    clustering, clustering_key = cached_stage(
+        'classification',
+        lambda: hierarchical_clustering(returns, linkage=linkage, codependence=codependence),
+        deps=[returns_key],
+        params={'linkage': linkage, 'codependence': codependence}
+    )
+    show_chart('corrélation', lambda: figures.plot_correlation_matrix(clustering), deps=[clustering_key])
+    
+    # Dendrogramme pour les modèles hiérarchiques
+    if any(model in models.HIERARCHICAL_MODELS for model in request.get('models') or [request['model']]):
+        st.subheader("🌳 Dendrogramme (Clustering Hiérarchique)")
+        show_chart(
+            'dendrogramme',
+            lambda: figures.plot_dendrogram(clustering, linkage=linkage, codependence=codependence),
+            deps=[clustering_key]
+        )
+    
+    # Tableau de performance
+    st.subheader("📊 Tableau de Performance et Indicateurs de Risque")
+    
+    def performance_stage():
+        # Créer un objet portfolio pour calculer les métriques
+        port_temp = rp.Portfolio(returns=returns)
+        with span('assets_stats'):
+            port_temp.assets_stats(method_mu='hist', method_cov='hist')
+        port_temp.rf = risk_free_rate
+        return get_performance_table(prices, returns, port_temp, risk_measure, asset_stats, periods)
+    
+    perf_table, _ = cached_stage(
+        'performance',
+        performance_stage,
+        deps=[returns_key, stats_key],
+        params={'rf': risk_free_rate, 'risk_measure': risk_measure}
+    )
+    
+    if perf_table is not None:
+        # Appliquer des gradients de couleur
+        risk_columns = [col for col in perf_table.columns if col.startswith('Mesure ')]
+        styled_perf = perf_table.style.background_gradient(
+            cmap='RdYlGn', 
+            subset=['Rendement Annuel (%)', 'Ratio de Sharpe']
+        ).background_gradient(
+            cmap='RdYlGn_r', 
+            subset=['Volatilité Annuelle (%)', 'Drawdown Maximum (%)', 'VaR 95% (%)', 'CVaR 95% (%)'] + risk_columns
         )
         
-        return fig
-        
-    except Exception as e:
-        st.warning(f"Impossible d'afficher le dendrogramme: {str(e)}")
-        return None
+        st.dataframe(styled_perf, use_container_width=True)
+    
+    return {'statistiques': desc_stats, 'performance': perf_table}
+
+def _named_index(table):
+    return table.rename_axis(table.index.name or 'Actif') if table is not None else None
+
+def build_report(request, outcome, analysis, metrics, fmt):
+    """
+    Produit le rapport exporté d'une optimisation (analytics.export)
+    
+    Feuilles : poids, métriques (et intervalles bootstrap), statistiques descriptives,
+    tableau de performance, contributions au risque, points et poids de la frontière
+    efficiente.
+    
+    Returns:
+    --------
+    bytes : contenu du fichier au format fmt ('xlsx' ou 'parquet')
+    """
+    weights, port, returns_calc = outcome['result']
+    risk_measure = request['risk_measure']
+    
+    contributions = None
+    try:
+        parts = risk_contributions(returns_calc, weights, risk_measure, alpha=port.alpha)
+        contributions = pd.DataFrame({
+            'Poids': weights.iloc[:, 0],
+            'Contribution Marginale': parts['marginal'].iloc[:, 0],
+            'Contribution': parts['component'].iloc[:, 0],
+            'Contribution (%)': parts['percent'].iloc[:, 0] * 100
+        }).rename_axis('Actif')
+    except Exception:
+        contributions = None
+    
+    frontier = outcome['frontier']
+    intervals = outcome['intervals']
+    sheets = report_sheets(
+        poids=weights.rename(columns={weights.columns[0]: 'Poids'}).rename_axis('Actif'),
+        metriques=pd.Series(metrics, name='Valeur').rename_axis('Indicateur') if metrics else None,
+        intervalles=intervals['metrics'] if intervals is not None else None,
+        statistiques=_named_index(analysis.get('statistiques')),
+        performance=_named_index(analysis.get('performance')),
+        contributions=contributions,
+        frontiere=frontier_table(port, frontier, risk_measure, request['periods']) if frontier is not None else None,
+        frontiere_poids=frontier.rename(columns=lambda point: f"Point {point + 1}").rename_axis('Actif')
+        if frontier is not None else None
+    )
+    return export_report(sheets, fmt)
+
+def render_optimization_results(request, outcome, analysis=None):
+    """
+    Affiche les résultats d'une tâche d'optimisation terminée avec succès
+
+    Parameters:
+    -----------
+    request : dict
+        Demande d'optimisation (voir submit_optimization)
+    outcome : dict
+        Résultat de optimization_job
+    analysis : dict ou None
+        Tables de render_data_analysis, reprises dans le rapport exporté
+    """
+    result = outcome['result']
+    weights, port, returns_calc = result
+    portfolio_key = outcome['portfolio_key']
+    selected_model = request['model']
+    risk_measure = request['risk_measure']
+    risk_free_rate = request['rf']
+    periods = request['periods']
+    rolling_window = request['rolling_window']
+    
+    if result.source == 'store':
+        st.caption("♻️ Résultat identique à une exécution précédente, relu dans l'historique des exécutions.")
+    
+    # Metrics
+    with span('métriques'):
+        metrics = calculate_metrics(weights, port, risk_measure, periods)
+    
+    intervals = outcome['intervals']
+    if outcome['bootstrap_error']:
+        st.error(f"Erreur lors du calcul des intervalles bootstrap: {outcome['bootstrap_error']}")
+    
+    if metrics:
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric(
+                "Rendement Annuel Attendu",
+                f"{metrics['Rendement Annuel Attendu']:.2%}"
+            )
+            if intervals is not None:
+                lo, hi = intervals['metrics'].loc['Rendement Annuel Attendu', ['Borne Inférieure', 'Borne Supérieure']]
+                st.caption(f"IC 95% : [{lo:.2%} ; {hi:.2%}]")
+        
+        with col2:
+            st.metric(
+                "Volatilité Annuelle",
+                f"{metrics['Volatilité Annuelle']:.2%}"
+            )
+            if intervals is not None:
+                lo, hi = intervals['metrics'].loc['Volatilité Annuelle', ['Borne Inférieure', 'Borne Supérieure']]
+                st.caption(f"IC 95% : [{lo:.2%} ; {hi:.2%}]")
+        
+        with col3:
+            st.metric(
+                "Ratio de Sharpe",
+                f"{metrics['Ratio de Sharpe']:.2f}"
+            )
+            if intervals is not None:
+                lo, hi = intervals['metrics'].loc['Ratio de Sharpe', ['Borne Inférieure', 'Borne Supérieure']]
+                st.caption(f"IC 95% : [{lo:.2f} ; {hi:.2f}]")
+        
+        with col4:
+            st.metric(
+                f"Mesure de Risque ({risk_measure})",
+                f"{metrics['Mesure de Risque']:.4f}",
+                help="Valeur par période de la mesure de risque sélectionnée"
+            )
+    
+    if intervals is not None:
+        with st.expander(f"📏 Intervalles de Confiance Bootstrap des Poids ({intervals['n_samples']} rééchantillonnages)"):
+            st.dataframe(
+                (intervals['weights'] * 100).style.format('{:.2f}'),
+                use_container_width=True
+            )
+            if intervals['n_failed'] > 0:
+                st.warning(f"{intervals['n_failed']} rééchantillonnages n'ont pas pu être optimisés.")
+    
+    # Portfolio weights
+    st.subheader("💼 Poids du Portefeuille")
+    weights_display = weights.copy()
+    weights_display.columns = ['Poids']
+    weights_display['Poids (%)'] = weights_display['Poids'] * 100
+    weights_display = weights_display[weights_display['Poids'] > 0.001].sort_values('Poids', ascending=False)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.dataframe(
+            weights_display.style.format({'Poids': '{:.4f}', 'Poids (%)': '{:.2f}'}).background_gradient(cmap='Blues', subset=['Poids (%)']),
+            height=400
+        )
+    
+    with col2:
+        # Pie chart
+        show_chart('répartition', lambda: plot_pie_chart(weights), deps=[portfolio_key])
+    
+    # Bar chart et contributions au risque
+    st.subheader("📊 Composition du Portefeuille")
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        show_chart('poids', lambda: plot_weights(weights), deps=[portfolio_key])
+    
+    with col2:
+        def build_contributions():
+            with span('contributions au risque'):
+                contributions = risk_contributions(returns_calc, weights, risk_measure, alpha=port.alpha)
+            return plot_risk_contributions(weights, contributions['percent'], risk_measure)
+        
+        try:
+            show_chart('contributions au risque', build_contributions, deps=[portfolio_key])
+        except Exception as e:
+            st.error(f"Erreur lors du calcul des contributions au risque: {str(e)}")
+    
+    # Efficient Frontier (seulement pour les modèles classiques)
+    if selected_model not in models.HIERARCHICAL_MODELS:
+        st.subheader("📉 Frontière Efficiente")
+        if outcome['frontier_error']:
+            st.warning(f"Impossible d'afficher la frontière efficiente: {outcome['frontier_error']}")
+        elif outcome['frontier'] is not None:
+            show_chart(
+                'frontière efficiente',
+                lambda: plot_efficient_frontier(port, weights, risk_measure, frontier=outcome['frontier'],
+                                                periods=periods),
+                deps=[portfolio_key],
+                data=[outcome['frontier']],
+                params={'periods': periods}
+            )
+    else:
+        st.info("ℹ️ La frontière efficiente n'est pas disponible pour les modèles hiérarchiques.")
+    
+    # Rolling analytics
+    st.subheader(f"📈 Analyse Glissante ({rolling_window} périodes)")
+    if len(returns_calc) > rolling_window:
+        rolling, rolling_key = cached_stage(
+            'analyse_glissante',
+            lambda: rolling_analytics(returns_calc, weights, window=rolling_window, rf=risk_free_rate, periods=periods),
+            deps=[portfolio_key],
+            params={'window': rolling_window, 'rf': risk_free_rate, 'periods': periods}
+        )
+        # Actifs affichés : les plus gros poids du portefeuille
+        top_assets = weights.iloc[:, 0].sort_values(ascending=False).index.tolist()
+        
+        tabs = st.tabs(["Volatilité", "Sharpe", "Bêta", "Corrélation", "Drawdown"])
+        charts = [
+            ('volatility', "Volatilité Glissante Annualisée", "Volatilité (%)", True),
+            ('sharpe', "Ratio de Sharpe Glissant", "Ratio de Sharpe", False),
+            ('beta', "Bêta Glissant par rapport au Portefeuille", "Bêta", False),
+            ('correlation', "Corrélation Glissante avec le Portefeuille", "Corrélation", False),
+            ('drawdown', "Drawdown", "Drawdown (%)", True)
+        ]
+        for tab, (key, title, yaxis_title, percent) in zip(tabs, charts):
+            with tab:
+                show_chart(
+                    f"glissant {key}",
+                    lambda: plot_rolling_metric(rolling[key][top_assets + [PORTFOLIO_COLUMN]], title, yaxis_title, percent=percent),
+                    deps=[rolling_key]
+                )
+    else:
+        st.info("ℹ️ L'historique est trop court pour la fenêtre glissante sélectionnée.")
+    
+    # Historique des exécutions du modèle
+    with st.expander("🗂️ Historique des Exécutions"), span('historique des exécutions'):
+        try:
+            store = get_run_store()
+            drift = store.weight_drift(selected_model, risk_measure)
+            if len(drift) > 1:
+                top_assets = drift.iloc[-1].sort_values(ascending=False).index.tolist()
+                show_chart(
+                    'dérive des poids',
+                    lambda: plot_rolling_metric(drift[top_assets], "Dérive des Poids au Fil des Exécutions", "Poids (%)", percent=True),
+                    data=[drift]
+                )
+            history = store.history(model=selected_model, risk_measure=risk_measure, limit=20)
+            st.dataframe(history.drop(columns=['fingerprint', 'model']), use_container_width=True)
+        except Exception as e:
+            st.warning(f"Historique des exécutions indisponible: {str(e)}")
+    
+    # Download weights as CSV
+    csv = weights_display.to_csv()
+    st.download_button(
+        label="📥 Télécharger les Poids du Portefeuille",
+        data=csv,
+        file_name=f"poids_portefeuille_{selected_model.replace(' ', '_')}.csv",
+        mime="text/csv"
+    )
+    
+    # Rapport complet : produit à la demande (écriture en flux, mémoire bornée) et
+    # conservé dans la session tant que le portefeuille et le format ne changent pas
+    st.subheader("📦 Rapport Complet")
+    report_format = st.radio(
+        "Format du rapport",
+        options=list(REPORT_FORMATS),
+        format_func=lambda x: {"xlsx": "Excel (XLSX, une feuille par table)", "parquet": "Parquet (archive ZIP)"}[x],
+        horizontal=True
+    )
+    report_key = f"{portfolio_key}:{report_format}"
+    if st.button("Préparer le rapport"):
+        try:
+            with st.spinner("Génération du rapport..."), span('export du rapport', format=report_format):
+                data = build_report(request, outcome, analysis or {}, metrics, report_format)
+            st.session_state['report'] = {'key': report_key, 'data': data}
+        except Exception as e:
+            st.error(f"Erreur lors de la génération du rapport: {str(e)}")
+    report = st.session_state.get('report')
+    if report is not None and report['key'] == report_key:
+        extension, mime = REPORT_FORMATS[report_format]
+        st.download_button(
+            label=f"📥 Télécharger le Rapport ({len(report['data']) / 1024:.0f} Ko)",
+            data=report['data'],
+            file_name=f"rapport_{selected_model.replace(' ', '_')}.{extension}",
+            mime=mime
+        )
 
 
 # ============================================================================
@@ -560,6 +1239,9 @@ def show_home_page():
     **Bibliothèque d'Optimisation:** Riskfolio-Lib  
     **Visualisation:** Plotly  
     """)
+    
+    # Préchargement des modules de la page d'optimisation pendant la lecture de l'accueil
+    start_warm_up()
 
 # ============================================================================
 # PAGE: OPTIMISATION
@@ -611,6 +1293,15 @@ def show_optimization_page():
             help="Le fichier doit contenir les prix avec les dates en index et les actifs en colonnes"
         )
     
+    frequency = st.sidebar.selectbox(
+        "Fréquence des données",
+        options=list(FREQUENCY_LABELS),
+        format_func=lambda x: FREQUENCY_LABELS[x],
+        help="Les prix sont rééchantillonnés (dernier cours de chaque période) avant le calcul des rendements ; "
+             "des données hebdomadaires divisent par cinq le nombre de périodes et accélèrent les modèles CVaR "
+             "et drawdown. L'annualisation suit la fréquence des dates."
+    )
+    
     # Portfolio optimization model selection
     st.sidebar.subheader("Modèle d'Optimisation")
     optimization_models = [
@@ -634,18 +1325,27 @@ def show_optimization_page():
         options=optimization_models
     )
     
+    compare_models = st.sidebar.checkbox(
+        "Comparer plusieurs modèles",
+        value=False,
+        help="Optimise en parallèle les modèles choisis sur les mêmes données et les affiche côte à côte"
+    )
+    compared_models = st.sidebar.multiselect(
+        "Modèles comparés",
+        options=optimization_models,
+        default=["Portefeuille de Risque Minimum", "Portefeuille de Sharpe Maximum", "Hierarchical Risk Parity (HRP)"],
+        disabled=not compare_models,
+        help="La mesure de risque choisie ci-dessous est traduite pour chaque modèle (variance à défaut d'équivalent)"
+    )
+    
     # Risk measure selection - différent pour HRP/HERC
     st.sidebar.subheader("Mesure de Risque")
     
     # Vérifier si le modèle est HRP ou HERC pour afficher les bonnes mesures
-    if selected_model in ["Hierarchical Risk Parity (HRP)", "Hierarchical Equal Risk Contribution (HERC)"]:
-        risk_measures = list(HRP_HERC_RISK_MEASURES.keys())
-        risk_measure_names = [f"{k}: {v}" for k, v in HRP_HERC_RISK_MEASURES.items()]
-        default_index = 0  # "vol" par défaut
-    else:
-        risk_measures = list(RISK_MEASURES_DICT.keys())
-        risk_measure_names = [f"{k}: {v}" for k, v in RISK_MEASURES_DICT.items()]
-        default_index = 0
+    model_risk_measures = models.risk_measures_for(selected_model)
+    risk_measures = list(model_risk_measures.keys())
+    risk_measure_names = [f"{k}: {v}" for k, v in model_risk_measures.items()]
+    default_index = 0  # "MV" ou "vol" par défaut
     
     selected_risk_index = st.sidebar.selectbox(
         "Sélectionnez la mesure de risque",
@@ -684,177 +1384,384 @@ def show_optimization_page():
         help="Utilisé pour les modèles robustes"
     )
     
+    uncertainty_set = st.sidebar.selectbox(
+        "Ensemble d'Incertitude",
+        options=["box", "ellip"],
+        format_func=lambda x: {"box": "Box", "ellip": "Ellipsoïdal"}[x],
+        help="Utilisé pour les modèles robustes"
+    )
+    
+    bootstrap_method = st.sidebar.selectbox(
+        "Estimation de l'Incertitude",
+        options=["stationary", "circular"],
+        format_func=lambda x: {"stationary": "Bootstrap stationnaire", "circular": "Bootstrap circulaire"}[x],
+        help="Méthode de bootstrap utilisée pour estimer les ensembles d'incertitude"
+    )
+    
+    linkage = st.sidebar.selectbox(
+        "Méthode de Linkage",
+        options=list(figures.LINKAGE_LABELS),
+        format_func=lambda x: figures.LINKAGE_LABELS[x],
+        help="Utilisé pour les modèles hiérarchiques, le dendrogramme et l'ordre de la matrice de corrélation"
+    )
+    
+    codependence = st.sidebar.selectbox(
+        "Mesure de Codépendance",
+        options=list(figures.CODEPENDENCE_LABELS),
+        format_func=lambda x: figures.CODEPENDENCE_LABELS[x],
+        help="Corrélation utilisée pour la distance entre actifs (modèles hiérarchiques, dendrogramme) ; Kendall est coûteux au-delà de quelques centaines d'actifs"
+    )
+    
+    # Bootstrap confidence intervals
+    st.sidebar.subheader("Intervalles de Confiance")
+    run_bootstrap = st.sidebar.checkbox(
+        "Calculer les intervalles bootstrap",
+        value=False,
+        help="Ré-optimise le modèle sur des rééchantillonnages par blocs des rendements"
+    )
+    n_bootstrap = st.sidebar.number_input(
+        "Nombre de rééchantillonnages",
+        min_value=100,
+        max_value=5000,
+        value=500,
+        step=100,
+        disabled=not run_bootstrap
+    )
+    
+    # Rolling analytics
+    st.sidebar.subheader("Analyse Glissante")
+    rolling_window = st.sidebar.slider(
+        "Fenêtre glissante (périodes)",
+        min_value=20,
+        max_value=252,
+        value=63,
+        step=1,
+        help="Longueur de la fenêtre des indicateurs glissants, en périodes de la fréquence des données"
+    )
+    
     # Button to run optimization
     run_optimization = st.sidebar.button("🚀 Optimiser le Portefeuille", type="primary")
     
     # Main content
     if run_optimization:
+        if compare_models and len(compared_models) < 2:
+            st.error("Sélectionnez au moins 2 modèles à comparer.")
+            return
+        
         if data_source == "Yahoo Finance":
             if len(tickers) < 2:
                 st.error("Veuillez entrer au moins 2 symboles boursiers.")
                 return
             
-            with st.spinner("Téléchargement des données et optimisation du portefeuille..."):
+            # Pas d'étape en cache : le magasin des cours partage déjà les cours entre les
+            # sessions, et un tableau retenu par le cache y garderait ses symboles référencés
+            with st.spinner("Téléchargement des données..."):
                 prices = download_data(tickers, start_date, end_date)
+                prices_key = stage_key('prix', params={'tickers': tickers, 'start': start_date, 'end': end_date})
         
         else:
             if uploaded_file is None:
                 st.error("Veuillez télécharger un fichier.")
                 return
             
-            with st.spinner("Lecture du fichier et optimisation du portefeuille..."):
-                prices = read_uploaded_file(uploaded_file)
-        
-        if prices is not None and not prices.empty:
-            st.success(f"✅ Données chargées avec succès pour {len(prices.columns)} actifs")
-            
-            # Show data preview
-            with st.expander("📊 Aperçu des Données de Prix"):
-                st.dataframe(prices.tail(10))
-            
-            # Calculer les rendements pour les statistiques
-            returns = prices.pct_change().dropna()
-            
-            # === SECTION 1: STATISTIQUES DESCRIPTIVES (indépendantes de l'optimisation) ===
-            st.header("📊 Analyse des Données")
-            
-            # Statistiques descriptives
-            st.subheader("📈 Statistiques Descriptives des Actifs")
-            desc_stats = get_descriptive_stats(prices)
-            
-            # Utiliser des gradients de couleur pour les tableaux
-            st.dataframe(
-                desc_stats.style.background_gradient(cmap='RdYlGn', subset=['Rendement Moyen (%)']),
-                use_container_width=True
-            )
-            
-            # Matrice de corrélation
-            st.subheader("🔗 Matrice de Corrélation")
-            fig_corr = plot_correlation_matrix(returns)
-            st.plotly_chart(fig_corr, use_container_width=True)
-            
-            # Dendrogramme pour les modèles hiérarchiques
-            if selected_model in ["Hierarchical Risk Parity (HRP)", 
-                                 "Hierarchical Equal Risk Contribution (HERC)", 
-                                 "Nested Clustered Optimization (NCO)"]:
-                st.subheader("🌳 Dendrogramme (Clustering Hiérarchique)")
-                fig_dendro = plot_dendrogram(returns, linkage='ward', codependence='pearson')
-                if fig_dendro:
-                    st.plotly_chart(fig_dendro, use_container_width=True)
-            
-            # Tableau de performance
-            st.subheader("📊 Tableau de Performance et Indicateurs de Risque")
-            
-            # Créer un objet portfolio pour calculer les métriques
-            port_temp = rp.Portfolio(returns=returns)
-            port_temp.assets_stats(method_mu='hist', method_cov='hist')
-            port_temp.rf = risk_free_rate
-            
-            perf_table = get_performance_table(prices, returns, port_temp)
-            
-            if perf_table is not None:
-                # Appliquer des gradients de couleur
-                styled_perf = perf_table.style.background_gradient(
-                    cmap='RdYlGn', 
-                    subset=['Rendement Annuel (%)', 'Ratio de Sharpe']
-                ).background_gradient(
-                    cmap='RdYlGn_r', 
-                    subset=['Volatilité Annuelle (%)', 'Drawdown Maximum (%)', 'VaR 95% (%)', 'CVaR 95% (%)']
-                )
-                
-                st.dataframe(styled_perf, use_container_width=True)
-            
-            st.markdown("---")
-            
-            # === SECTION 2: OPTIMISATION DU PORTEFEUILLE ===
-            st.header("🎯 Résultats de l'Optimisation")
-            
-            with st.spinner("Optimisation du portefeuille en cours..."):
-                weights, port, returns_calc = calculate_portfolio(
-                    prices, 
-                    selected_model, 
-                    risk_measure, 
-                    risk_free_rate, 
-                    risk_aversion,
-                    uncertainty_param
-                )
-            
-            if weights is not None and port is not None:
-                # Display results
-                
-                # Metrics
-                metrics = calculate_metrics(weights, port)
-                
-                if metrics:
-                    col1, col2, col3 = st.columns(3)
-                    
-                    with col1:
-                        st.metric(
-                            "Rendement Annuel Attendu",
-                            f"{metrics['Rendement Annuel Attendu']:.2%}"
-                        )
-                    
-                    with col2:
-                        st.metric(
-                            "Volatilité Annuelle",
-                            f"{metrics['Volatilité Annuelle']:.2%}"
-                        )
-                    
-                    with col3:
-                        st.metric(
-                            "Ratio de Sharpe",
-                            f"{metrics['Ratio de Sharpe']:.2f}"
-                        )
-                
-                # Portfolio weights
-                st.subheader("💼 Poids du Portefeuille")
-                weights_display = weights.copy()
-                weights_display.columns = ['Poids']
-                weights_display['Poids (%)'] = weights_display['Poids'] * 100
-                weights_display = weights_display[weights_display['Poids'] > 0.001].sort_values('Poids', ascending=False)
-                
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.dataframe(
-                        weights_display.style.format({'Poids': '{:.4f}', 'Poids (%)': '{:.2f}'}).background_gradient(cmap='Blues', subset=['Poids (%)']),
-                        height=400
-                    )
-                
-                with col2:
-                    # Pie chart
-                    fig_pie = plot_pie_chart(weights)
-                    st.plotly_chart(fig_pie, use_container_width=True)
-                
-                # Bar chart
-                st.subheader("📊 Composition du Portefeuille")
-                fig_bar = plot_weights(weights)
-                st.plotly_chart(fig_bar, use_container_width=True)
-                
-                # Efficient Frontier (seulement pour les modèles classiques)
-                if selected_model not in ["Hierarchical Risk Parity (HRP)", 
-                                         "Hierarchical Equal Risk Contribution (HERC)", 
-                                         "Nested Clustered Optimization (NCO)"]:
-                    st.subheader("📉 Frontière Efficiente")
-                    fig_frontier = plot_efficient_frontier(port, weights, risk_measure)
-                    if fig_frontier:
-                        st.plotly_chart(fig_frontier, use_container_width=True)
-                else:
-                    st.info("ℹ️ La frontière efficiente n'est pas disponible pour les modèles hiérarchiques.")
-                
-                # Download weights as CSV
-                csv = weights_display.to_csv()
-                st.download_button(
-                    label="📥 Télécharger les Poids du Portefeuille",
-                    data=csv,
-                    file_name=f"poids_portefeuille_{selected_model.replace(' ', '_')}.csv",
-                    mime="text/csv"
+            with st.spinner("Lecture du fichier..."):
+                prices, prices_key = cached_stage(
+                    'prix',
+                    lambda: read_uploaded_file(uploaded_file),
+                    data=[uploaded_file.name, uploaded_file.getvalue()]
                 )
-        else:
+        
+        if prices is None or prices.empty:
             st.error("Échec du chargement des données. Veuillez vérifier vos paramètres et réessayer.")
-    else:
+            return
+        
+        # L'optimisation s'exécute en arrière-plan ; la demande est conservée dans la
+        # session pour que la page continue d'afficher ses résultats aux exécutions suivantes
+        request = {
+            'prices': prices,
+            'prices_key': prices_key,
+            'frequency': frequency,
+            'model': selected_model,
+            'risk_measure': risk_measure,
+            'rf': risk_free_rate,
+            'risk_aversion': risk_aversion,
+            'uncertainty': uncertainty_param,
+            'uncertainty_set': uncertainty_set,
+            'bootstrap_method': bootstrap_method,
+            'linkage': linkage,
+            'codependence': codependence,
+            'run_bootstrap': run_bootstrap,
+            'n_bootstrap': n_bootstrap,
+            'rolling_window': rolling_window
+        }
+        try:
+            if compare_models:
+                submit_comparison(dict(request, models=compared_models))
+            else:
+                submit_optimization(request)
+        except ValueError as e:
+            st.error(f"Impossible de préparer les rendements : {e}")
+            return
+    
+    request = st.session_state.get('optimization_request')
+    if request is None:
         # Display instructions
         st.info("👈 Configurez votre portefeuille dans la barre latérale et cliquez sur 'Optimiser le Portefeuille' pour commencer.")
+        return
+    
+    prices = request['prices']
+    st.success(f"✅ Données chargées avec succès pour {len(prices.columns)} actifs")
+    st.caption(
+        f"Fréquence : {FREQUENCY_LABELS[request.get('frequency', 'daily')]} — {len(request['returns'])} rendements, "
+        f"annualisés sur {request['periods']} périodes par an"
+    )
+    
+    # Show data preview
+    with st.expander("📊 Aperçu des Données de Prix"):
+        st.dataframe(prices.tail(10))
+    
+    # === SECTION 1: STATISTIQUES DESCRIPTIVES (indépendantes de l'optimisation) ===
+    # Affichées immédiatement, pendant que l'optimisation se poursuit en arrière-plan
+    with span('analyse des données'):
+        analysis = render_data_analysis(request)
+    
+    st.markdown("---")
+    
+    # === SECTION 2: OPTIMISATION DU PORTEFEUILLE ===
+    st.header("⚖️ Comparaison des Modèles" if request.get('models') else "🎯 Résultats de l'Optimisation")
+    
+    plan = request.get('plan') or {'action': 'run', 'reasons': []}
+    for reason in plan['reasons']:
+        (st.error if plan['action'] == 'refuse' else st.warning)(f"🧮 {reason}")
+    
+    if plan['action'] == 'refuse':
+        return
+    
+    if request.get('models'):
+        render_comparison(request)
+        return
+    
+    job = get_job_queue().get(st.session_state.get('optimization_job'))
+    if job is None:
+        st.warning("La tâche d'optimisation n'est plus disponible. Relancez l'optimisation.")
+    elif not job.done:
+        show_job_progress(job.id)
+    elif job.status == 'cancelled':
+        st.info("⏹️ Optimisation annulée.")
+    elif job.status == 'failed':
+        st.error(f"Erreur lors de l'optimisation: {job.error}")
+        st.caption(f"Type d'erreur : {job.error_type}")
+    elif not job.result['result'].ok:
+        render_optimization_error(job.result['result'])
+    else:
+        with span('résultats'):
+            render_optimization_results(request, job.result, analysis)
+
+def session_comparison_jobs():
+    """
+    Tâches de la comparaison de la session
+    
+    Returns:
+    --------
+    tuple : ({modèle: Job}, Job de la frontière ou None) ; les tâches oubliées par la
+            file sont omises
+    """
+    queue = get_job_queue('comparaison')
+    jobs = {model: queue.get(job_id) for model, job_id in (st.session_state.get('comparison_jobs') or {}).items()}
+    return ({model: job for model, job in jobs.items() if job is not None},
+            queue.get(st.session_state.get('comparison_frontier_job')))
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def show_comparison_progress():
+    """Affiche l'avancement de la comparaison et les modèles déjà optimisés ; relance la page à la fin"""
+    jobs, frontier_job = session_comparison_jobs()
+    pending = [job for job in [*jobs.values(), frontier_job] if job is not None and not job.done]
+    if not pending:
+        st.rerun()
+    
+    finished = sum(job.done for job in jobs.values())
+    st.progress(finished / len(jobs), text=f"{finished}/{len(jobs)} modèles optimisés")
+    running = [job.name for job in pending if job.status == 'running']
+    col1, col2 = st.columns([1, 4])
+    with col1:
+        if st.button("⏹️ Annuler", disabled=all(job.cancel_requested for job in pending)):
+            for job in pending:
+                job.cancel()
+    with col2:
+        st.caption(f"En cours : {', '.join(running)}" if running else "En attente d'un worker...")
+    
+    render_comparison_results(st.session_state['optimization_request'], jobs, frontier_job)
+
+def render_comparison_results(request, jobs, frontier_job=None):
+    """
+    Affiche les modèles comparés déjà optimisés : poids alignés, métriques et frontière
+    
+    Les métriques de tous les modèles sont évaluées sur les mêmes moments et la même
+    mesure de risque (analytics.comparison_summary).
+    
+    Parameters:
+    -----------
+    request : dict
+        Demande de comparaison (voir submit_comparison)
+    jobs : dict
+        {modèle: Job} des modèles comparés, terminés ou non
+    frontier_job : Job ou None
+        Tâche de la frontière efficiente (tracée une fois terminée)
+    """
+    risk_measure = request['risk_measure']
+    returns = request['solve_returns']
+    rf = request['rf_period']
+    periods = request['periods']
+    
+    solved = {}
+    for model, job in jobs.items():
+        if job.status == 'failed':
+            st.error(f"{model} : {job.error}")
+        elif job.status == 'cancelled':
+            st.info(f"⏹️ {model} : optimisation annulée.")
+        elif job.status == 'done' and not job.result['result'].ok:
+            st.warning(f"{model} : {job.result['result'].error}")
+        elif job.status == 'done':
+            solved[model] = job.result
+    
+    if not solved:
+        return
+    
+    weights = pd.DataFrame(
+        {model: outcome['result'].weights.iloc[:, 0] for model, outcome in solved.items()}
+    ).reindex(returns.columns).fillna(0.0)
+    keys = [outcome['portfolio_key'] for outcome in solved.values()]
+    
+    # Métriques
+    st.subheader("📋 Métriques des Modèles")
+    try:
+        summary, _ = cached_stage(
+            'comparaison',
+            lambda: comparison_summary(weights, models.historical_portfolio(returns, rf), risk_measure, periods),
+            deps=keys,
+            params={'risk_measure': risk_measure, 'periods': periods}
+        )
+        metrics_table = pd.DataFrame({
+            'Mesure Optimisée': [solved[model]['risk_measure'] for model in summary.index],
+            'Rendement Annuel (%)': summary['Rendement Annuel Attendu'] * 100,
+            'Volatilité Annuelle (%)': summary['Volatilité Annuelle'] * 100,
+            'Ratio de Sharpe': summary['Ratio de Sharpe'],
+            f'Mesure {risk_measure}': summary['Mesure de Risque'],
+            'Durée (s)': [solved[model]['result'].timings.get('total') for model in summary.index]
+        }, index=summary.index).rename_axis('Modèle')
+        st.dataframe(
+            metrics_table.style.format({
+                'Rendement Annuel (%)': '{:.2f}',
+                'Volatilité Annuelle (%)': '{:.2f}',
+                'Ratio de Sharpe': '{:.2f}',
+                f'Mesure {risk_measure}': '{:.4f}',
+                'Durée (s)': '{:.2f}'
+            }, na_rep='—').background_gradient(cmap='RdYlGn', subset=['Rendement Annuel (%)', 'Ratio de Sharpe']),
+            use_container_width=True
+        )
+        st.caption(
+            f"Tous les modèles sont évalués sur les mêmes rendements et moments ; « Mesure {risk_measure} » "
+            "est la valeur par période de la mesure choisie, « Mesure Optimisée » celle utilisée par chaque modèle."
+        )
+    except Exception as e:
+        st.error(f"Erreur lors du calcul des métriques: {str(e)}")
+    
+    # Poids alignés sur les actifs
+    st.subheader("💼 Poids par Modèle (%)")
+    weights_display = weights[(weights > 0.001).any(axis=1)] * 100
+    st.dataframe(
+        weights_display.style.format('{:.2f}').background_gradient(cmap='Blues', axis=None),
+        use_container_width=True
+    )
+    st.download_button(
+        label="📥 Télécharger les Poids des Modèles",
+        data=weights.to_csv(),
+        file_name="poids_comparaison.csv",
+        mime="text/csv"
+    )
+    
+    # Frontière efficiente de la mesure choisie (variance pour les mesures propres à HRP/HERC)
+    frontier_measure = request['frontier_measure'] or 'MV'
+    frontier = frontier_job.result if frontier_job is not None and frontier_job.status == 'done' else None
+    st.subheader("📉 Modèles Comparés et Frontière Efficiente")
+    if frontier_job is not None and frontier_job.status == 'failed':
+        st.warning(f"Impossible de calculer la frontière efficiente: {frontier_job.error}")
+    try:
+        show_chart(
+            'frontière comparée',
+            lambda: plot_comparison_frontier(models.historical_portfolio(returns, rf), weights, frontier_measure, frontier,
+                                             periods),
+            deps=keys,
+            data=[frontier],
+            params={'risk_measure': frontier_measure, 'periods': periods}
+        )
+    except Exception as e:
+        st.warning(f"Impossible d'afficher la frontière efficiente: {str(e)}")
+
+def render_comparison(request):
+    """Affiche la comparaison : progression et résultats partiels, puis résultats complets"""
+    jobs, frontier_job = session_comparison_jobs()
+    if not jobs:
+        st.warning("Les tâches de la comparaison ne sont plus disponibles. Relancez la comparaison.")
+    elif any(not job.done for job in [*jobs.values(), frontier_job] if job is not None):
+        show_comparison_progress()
+    else:
+        with span('résultats'):
+            render_comparison_results(request, jobs, frontier_job)
+
+def render_performance_panel(page_timeline):
+    """
+    Affiche les durées de la tâche d'optimisation et de l'affichage de la page
+    
+    Parameters:
+    -----------
+    page_timeline : runtime.timing.Timeline
+        Chronologie de l'exécution courante de la page
+    """
+    job = get_job_queue().get(st.session_state.get('optimization_job'))
+    job_timeline = job.result.get('timeline') if job is not None and job.status == 'done' else None
+    
+    with st.expander("⏱️ Performance"):
+        st.caption(
+            "Temps réel et temps CPU du thread par étape ; un temps réel nettement supérieur au "
+            "temps CPU signale une attente (réseau, verrou, autre calcul)."
+        )
+        if job_timeline is not None:
+            st.markdown(f"**Tâche d'optimisation** : {job_timeline.total:.2f} s")
+            st.dataframe(job_timeline.frame().style.format(precision=3), use_container_width=True, hide_index=True)
+        memory = job.result.get('memory') if job_timeline is not None else None
+        if memory:
+            st.markdown("**Mémoire**")
+            plan = st.session_state['optimization_request'].get('plan') or {}
+            st.dataframe(pd.DataFrame({
+                'Étape': list(memory),
+                'Pic mesuré (Mo)': [None if value is None else value / 2**20 for value in memory.values()]
+            }).style.format(precision=1), use_container_width=True, hide_index=True)
+            if plan:
+                st.caption(
+                    f"Estimation avant lancement : {plan['estimate'] / 2**20:.0f} Mo "
+                    f"(budget {plan['budget'] / 2**20:.0f} Mo, variable d'environnement MEMORY_BUDGET_MB). "
+                    "Le pic est celui du processus : il inclut les calculs simultanés des autres sessions."
+                )
+        result = job.result.get('result') if job_timeline is not None else None
+        if result is not None and result.telemetry:
+            st.markdown("**Solveur**")
+            telemetry = models.describe_telemetry(result.telemetry).astype(str).to_frame('Valeur')
+            st.dataframe(telemetry, use_container_width=True)
+        st.markdown(f"**Affichage de la page** : {page_timeline.total:.2f} s")
+        st.dataframe(page_timeline.frame().style.format(precision=3), use_container_width=True, hide_index=True)
+        figure_cache = figure_cache_info()
+        st.caption(
+            f"Cache des figures : {figure_cache['entries']} figures, {figure_cache['bytes'] / 2**20:.1f} Mo compressés "
+            f"({figure_cache['raw_bytes'] / 2**20:.1f} Mo de JSON), {figure_cache['hits']} réutilisations, "
+            f"{figure_cache['misses']} constructions."
+        )
+        prices = get_price_store().info()
+        st.caption(
+            f"Magasin des cours (partagé par les sessions) : {prices['tickers']} symboles, "
+            f"{prices['bytes'] / 2**20:.1f} Mo, {prices['referenced']} en cours d'utilisation ; "
+            f"{prices['hits']} symboles réutilisés, {prices['misses']} téléchargés."
+        )
 
 # ============================================================================
 # PAGE: À PROPOS
@@ -1485,6 +2392,15 @@ def show_about_page():
 if st.session_state.page == "Accueil":
     show_home_page()
 elif st.session_state.page == "Optimisation":
-    show_optimization_page()
+    # Étapes de la page chronométrées et ajoutées au journal des durées (runtime.timing)
+    page_timeline = Timeline('page', session=session_id())
+    with page_timeline.activate():
+        show_optimization_page()
+    if st.session_state.get('optimization_request') is not None:
+        render_performance_panel(page_timeline)
+    try:
+        write_timeline(page_timeline)
+    except OSError:
+        pass
 elif st.session_state.page == "À propos":
     show_about_page()
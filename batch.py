@@ -0,0 +1,349 @@
+"""
+Exécution en ligne de commande des optimisations de portefeuille, sans Streamlit
+
+Usage :
+    python batch.py job.json
+    python batch.py job.json --jobs 4 --format csv --output resultats/
+    python batch.py --list-models
+
+Fichier de job (JSON) :
+    {
+        "data": {"tickers": ["AAPL", "MSFT", "GOOGL"], "start": "2020-01-01", "end": "2024-12-31"},
+        "models": ["Portefeuille de Risque Minimum",
+                   {"model": "Hierarchical Risk Parity (HRP)", "risk_measures": ["vol", "cvar"]}],
+        "risk_measures": ["MV", "CVaR"],
+        "parameters": {"rf": 0.025, "risk_aversion": 2.0, "uncertainty": 0.5,
+                       "uncertainty_set": "box", "bootstrap_method": "stationary",
+                       "linkage": "ward", "codependence": "pearson"},
+        "output": {"dir": "resultats", "format": "parquet"}
+    }
+
+La source de données peut aussi être un fichier de prix : {"data": {"file": "prix.csv"}}
+(CSV, XLSX/XLS ou Parquet, dates en première colonne). "data.frequency" ("daily",
+"weekly" ou "monthly") rééchantillonne les prix avant le calcul des rendements ; les
+métriques sont annualisées selon la fréquence des dates et "rf" reste un taux annuel.
+
+Les modules lourds (pandas, Riskfolio-Lib, yfinance) ne sont importés qu'une fois les
+arguments validés ; Streamlit n'est jamais importé.
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+
+DEFAULT_PARAMETERS = {
+    'rf': 0.025,
+    'risk_aversion': 2.0,
+    'uncertainty': 0.5,
+    'uncertainty_set': 'box',
+    'bootstrap_method': 'stationary',
+    'linkage': 'ward',
+    'codependence': 'pearson'
+}
+
+OUTPUT_FORMATS = ['parquet', 'csv', 'xlsx']
+
+# Rendements partagés par les workers (initialisés une seule fois par processus)
+_WORKER_RETURNS = None
+
+
+def load_job(path):
+    """
+    Lit et valide un fichier de job
+
+    Parameters:
+    -----------
+    path : str ou Path
+        Chemin du fichier JSON
+
+    Returns:
+    --------
+    dict : job complété des valeurs par défaut
+    """
+    with open(path, encoding='utf-8') as f:
+        job = json.load(f)
+
+    data = job.get('data') or {}
+    if not data.get('tickers') and not data.get('file'):
+        raise ValueError("Le job doit définir data.tickers ou data.file.")
+    if not job.get('models'):
+        raise ValueError("Le job doit définir au moins un modèle.")
+
+    parameters = job.get('parameters') or {}
+    unknown = set(parameters) - set(DEFAULT_PARAMETERS)
+    if unknown:
+        raise ValueError(f"Paramètres non reconnus: {', '.join(sorted(unknown))}")
+    job['parameters'] = dict(DEFAULT_PARAMETERS, **parameters)
+    job['output'] = dict({'dir': 'resultats', 'format': 'parquet'}, **(job.get('output') or {}))
+    return job
+
+
+def expand_tasks(job):
+    """
+    Liste les couples (modèle, mesure de risque) à optimiser
+
+    Un modèle est soit un nom, qui utilise les mesures globales `risk_measures` (ou la
+    mesure par défaut du modèle), soit un objet {"model": ..., "risk_measures": [...]}.
+    """
+    from models import MODEL_FUNCTIONS, risk_measures_for
+
+    tasks = []
+    for entry in job['models']:
+        if isinstance(entry, str):
+            entry = {'model': entry}
+        model = entry['model']
+        if model not in MODEL_FUNCTIONS:
+            raise ValueError(f"Modèle non reconnu: {model}")
+
+        accepted = risk_measures_for(model)
+        measures = entry.get('risk_measures') or job.get('risk_measures') or [next(iter(accepted))]
+        for measure in measures:
+            if measure not in accepted:
+                raise ValueError(f"Mesure de risque '{measure}' non disponible pour le modèle {model}.")
+            tasks.append((model, measure))
+    return tasks
+
+
+def load_prices(data):
+    """
+    Charge les prix depuis Yahoo Finance ou un fichier, avec le même nettoyage que l'application
+
+    Parameters:
+    -----------
+    data : dict
+        {"tickers": [...], "start": ..., "end": ...} ou {"file": ...}, avec "frequency"
+        facultatif ('daily' par défaut, 'weekly' ou 'monthly')
+
+    Returns:
+    --------
+    pd.DataFrame : prix (dates x actifs) à la fréquence demandée
+    """
+    import pandas as pd
+
+    from analytics import resample_prices
+
+    if data.get('file'):
+        path = str(data['file'])
+        if path.endswith('.csv'):
+            prices = pd.read_csv(path, index_col=0, parse_dates=True)
+        elif path.endswith(('.xlsx', '.xls')):
+            prices = pd.read_excel(path, index_col=0, parse_dates=True)
+        elif path.endswith('.parquet'):
+            prices = pd.read_parquet(path)
+        else:
+            raise ValueError("Format de fichier non supporté. Utilisez CSV, XLSX ou Parquet.")
+    else:
+        import yfinance as yf
+
+        raw = yf.download(data['tickers'], start=data.get('start'), end=data.get('end'), progress=False)
+        prices = raw['Close'] if isinstance(raw.columns, pd.MultiIndex) else raw[['Close']]
+
+    prices = prices.dropna(how='all')
+    return resample_prices(prices.ffill().bfill(), data.get('frequency', 'daily'))
+
+
+def _init_worker(returns):
+    """Initialise les rendements d'un worker (évite de les renvoyer à chaque tâche)"""
+    global _WORKER_RETURNS
+    _WORKER_RETURNS = returns
+
+
+def run_task(task, parameters, returns=None):
+    """
+    Optimise un couple (modèle, mesure de risque) et calcule ses métriques
+
+    Le taux sans risque des paramètres est annuel ; il est converti par période selon la
+    fréquence des rendements avant l'optimisation.
+
+    Returns:
+    --------
+    dict : {'model', 'risk_measure', 'weights', 'metrics', 'status', 'error', 'timings', 'telemetry'}
+    """
+    from analytics import periods_per_year, portfolio_summary
+    from models import run_model
+
+    returns = _WORKER_RETURNS if returns is None else returns
+    model, risk_measure = task
+    periods = periods_per_year(returns.index)
+
+    result = run_model(returns, model, risk_measure, **dict(parameters, rf=parameters['rf'] / periods))
+    outcome = {
+        'model': model,
+        'risk_measure': risk_measure,
+        'weights': None,
+        'metrics': None,
+        'status': result.status,
+        'error': result.error,
+        'timings': result.timings,
+        # Télémétrie des solveurs, sans le détail de chaque résolution
+        'telemetry': {name: value for name, value in result.telemetry.items() if name != 'solves'}
+    }
+
+    if result.ok:
+        outcome['weights'] = result.weights.iloc[:, 0]
+        try:
+            outcome['metrics'] = portfolio_summary(result.weights, result.port, risk_measure, periods)
+        except Exception as e:
+            outcome['error'] = f"Erreur lors du calcul des métriques: {str(e)}"
+
+    return outcome
+
+
+def run_job(job, n_jobs=None):
+    """
+    Exécute toutes les tâches d'un job, en parallèle si n_jobs > 1
+
+    Parameters:
+    -----------
+    job : dict
+        Job retourné par load_job
+    n_jobs : int ou None
+        Nombre de processus (None = nombre de CPU, 1 = exécution séquentielle)
+
+    Returns:
+    --------
+    tuple : (weights, metrics, performance) sous forme de DataFrames
+    """
+    import pandas as pd
+
+    from analytics import asset_statistics, performance_table, periods_per_year
+
+    tasks = expand_tasks(job)
+    prices = load_prices(job['data'])
+    returns = prices.pct_change().dropna()
+    parameters = job['parameters']
+
+    n_jobs = min(n_jobs or os.cpu_count() or 1, len(tasks))
+    if n_jobs == 1:
+        results = [run_task(task, parameters, returns) for task in tasks]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=(returns,)) as pool:
+            results = list(pool.map(run_task, tasks, [parameters] * len(tasks)))
+
+    weights_rows = []
+    metrics_rows = []
+    for result in results:
+        row = {'Modèle': result['model'], 'Mesure': result['risk_measure']}
+        if result['weights'] is not None:
+            for asset, weight in result['weights'].items():
+                weights_rows.append(dict(row, Actif=asset, Poids=float(weight)))
+        metrics_rows.append(dict(
+            row,
+            **(result['metrics'] or {}),
+            Statut=result['status'],
+            Erreur=result['error'],
+            **{'Durée Estimation (s)': result['timings'].get('estimation'),
+               'Durée Optimisation (s)': result['timings'].get('optimization'),
+               'Durée (s)': result['timings'].get('total')},
+            **{'Solveur': result['telemetry'].get('solver'),
+               'Variables': result['telemetry'].get('variables'),
+               'Contraintes': result['telemetry'].get('constraints'),
+               'Durée Compilation (s)': result['telemetry'].get('compile_time'),
+               'Durée Solveur (s)': result['telemetry'].get('solve_time'),
+               'Itérations': result['telemetry'].get('iterations')}
+        ))
+
+    weights = pd.DataFrame(weights_rows, columns=['Modèle', 'Mesure', 'Actif', 'Poids'])
+    metrics = pd.DataFrame(metrics_rows)
+    performance = performance_table(returns, parameters['rf'], stats=asset_statistics(returns),
+                                    periods=periods_per_year(returns.index))
+    performance.index.name = 'Actif'
+
+    return weights, metrics, performance
+
+
+def write_outputs(weights, metrics, performance, directory, fmt='parquet'):
+    """
+    Écrit les poids, les métriques et le tableau de performance
+
+    Au format 'xlsx', les trois tables sont les feuilles d'un seul classeur rapport.xlsx
+    écrit en flux (analytics.write_xlsx_report).
+
+    Returns:
+    --------
+    list : chemins des fichiers écrits
+    """
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"Format de sortie non reconnu: {fmt}")
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    if fmt == 'xlsx':
+        from analytics import report_sheets, write_xlsx_report
+
+        path = directory / 'rapport.xlsx'
+        sheets = {'poids': weights.rename(columns=str), 'metriques': metrics.rename(columns=str),
+                  **report_sheets(performance=performance)}
+        write_xlsx_report(sheets, path)
+        return [path]
+
+    paths = []
+    for name, frame, keep_index in [('poids', weights, False), ('metriques', metrics, False),
+                                    ('performance', performance, True)]:
+        path = directory / f"{name}.{fmt}"
+        if fmt == 'parquet':
+            frame.to_parquet(path, index=keep_index)
+        else:
+            frame.to_csv(path, index=keep_index)
+        paths.append(path)
+    return paths
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Optimisation de portefeuilles en ligne de commande (sans interface Streamlit)"
+    )
+    parser.add_argument('job', nargs='?', help="Fichier de job JSON")
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                        help="Nombre de processus parallèles (défaut : nombre de CPU)")
+    parser.add_argument('--output', '-o', default=None, help="Répertoire de sortie (remplace output.dir)")
+    parser.add_argument('--format', '-f', choices=OUTPUT_FORMATS, default=None,
+                        help="Format des fichiers de sortie (remplace output.format)")
+    parser.add_argument('--list-models', action='store_true', help="Affiche les modèles et mesures disponibles")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.list_models:
+        from models import MODEL_FUNCTIONS, risk_measures_for
+
+        for model in MODEL_FUNCTIONS:
+            print(f"{model}\n    mesures : {', '.join(risk_measures_for(model))}")
+        return 0
+
+    if args.job is None:
+        print("Erreur : fichier de job manquant (voir --help).", file=sys.stderr)
+        return 2
+
+    try:
+        job = load_job(args.job)
+        if args.output:
+            job['output']['dir'] = args.output
+        if args.format:
+            job['output']['format'] = args.format
+        weights, metrics, performance = run_job(job, n_jobs=args.jobs)
+        paths = write_outputs(weights, metrics, performance, job['output']['dir'], job['output']['format'])
+    except (OSError, ValueError, KeyError, ImportError) as e:
+        print(f"Erreur : {e}", file=sys.stderr)
+        return 2
+
+    failed = metrics[metrics['Statut'] != 'optimal']
+    print(f"{len(metrics) - len(failed)}/{len(metrics)} optimisations réussies.")
+    for _, row in failed.iterrows():
+        print(f"  {row['Statut']} : {row['Modèle']} ({row['Mesure']}) - {row['Erreur']}", file=sys.stderr)
+    for path in paths:
+        print(f"  {path}")
+
+    return 1 if len(failed) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""
+Benchmark des figures de la classification hiérarchique selon le nombre d'actifs
+
+Pour chaque taille N (rendements synthétiques, analytics.synthetic), mesure la
+classification (analytics.hierarchical_clustering), puis pour la matrice de corrélation
+et le dendrogramme (figures.py) :
+- la durée de construction de la figure
+- la durée de sérialisation JSON (coût payé par st.plotly_chart à chaque affichage)
+- la taille de la figure sérialisée et son nombre de traces
+
+Chaque mesure est la meilleure de --repeat exécutions.
+
+Usage :
+    python benchmarks/figures.py
+    python benchmarks/figures.py --assets 100 1000 --linkage single --codependence spearman
+    python benchmarks/figures.py --max-seconds 0.5     # code de sortie 1 au-delà
+"""
+
+import argparse
+import json
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import pandas as pd
+
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+DEFAULT_ASSETS = [10, 100, 500, 1000, 2000]
+DEFAULT_PERIODS = 1250
+DEFAULT_OUTPUT = ROOT / 'benchmarks' / 'results' / 'figures.json'
+
+RESULT_COLUMNS = ['figure', 'n_assets', 'build', 'serialize', 'payload_kb', 'traces']
+
+
+def _best_of(function, repeat):
+    """Meilleure durée de `repeat` appels et valeur du dernier appel"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = function()
+        best = min(best, time.perf_counter() - start)
+    return best, value
+
+
+def run_benchmark(assets, n_periods=DEFAULT_PERIODS, linkage='ward', codependence='pearson', repeat=3, seed=0):
+    """
+    Mesure la classification et les figures pour chaque nombre d'actifs
+
+    Returns:
+    --------
+    pd.DataFrame : une ligne par (figure, N), colonnes RESULT_COLUMNS (durées en s) ;
+                   la classification est la ligne 'classification'
+    """
+    import figures
+    from analytics import hierarchical_clustering, synthetic_returns
+
+    builders = {
+        'correlation': lambda clustering: figures.plot_correlation_matrix(clustering),
+        'dendrogramme': lambda clustering: figures.plot_dendrogram(clustering, linkage, codependence)
+    }
+    rows = []
+    for n_assets in assets:
+        returns = synthetic_returns(n_assets, n_periods, seed=seed)
+        elapsed, clustering = _best_of(
+            lambda: hierarchical_clustering(returns, linkage=linkage, codependence=codependence), repeat
+        )
+        rows.append({'figure': 'classification', 'n_assets': n_assets, 'build': elapsed})
+        for name, build in builders.items():
+            build_time, fig = _best_of(lambda: build(clustering), repeat)
+            serialize_time, payload = _best_of(fig.to_json, repeat)
+            rows.append({
+                'figure': name,
+                'n_assets': n_assets,
+                'build': build_time,
+                'serialize': serialize_time,
+                'payload_kb': len(payload) / 1024,
+                'traces': len(fig.data)
+            })
+        print(f"N={n_assets} : " + ", ".join(
+            f"{row['figure']} {row['build'] + (row.get('serialize') or 0):.3f} s"
+            for row in rows if row['n_assets'] == n_assets
+        ), flush=True)
+    return pd.DataFrame(rows, columns=RESULT_COLUMNS)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark des figures de classification par nombre d'actifs")
+    parser.add_argument('--assets', nargs='+', type=int, default=DEFAULT_ASSETS, help="Nombres d'actifs N")
+    parser.add_argument('--periods', type=int, default=DEFAULT_PERIODS, help="Nombre de périodes T")
+    parser.add_argument('--linkage', default='ward', help="Méthode de linkage")
+    parser.add_argument('--codependence', default='pearson', help="Mesure de codépendance")
+    parser.add_argument('--repeat', type=int, default=3, help="Répétitions par mesure (meilleure retenue)")
+    parser.add_argument('--seed', type=int, default=0, help="Graine des données synthétiques")
+    parser.add_argument('--output', '-o', default=str(DEFAULT_OUTPUT), help="Fichier de résultats JSON")
+    parser.add_argument('--max-seconds', type=float, default=None,
+                        help="Durée maximale construction + sérialisation d'une figure (code de sortie 1 au-delà)")
+    args = parser.parse_args(argv)
+
+    warnings.filterwarnings('ignore')
+    results = run_benchmark(args.assets, args.periods, args.linkage, args.codependence, args.repeat, args.seed)
+    print()
+    print(results.to_string(index=False, float_format=lambda x: f"{x:.3f}"))
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    metadata = {
+        'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'python': sys.version.split()[0],
+        'periods': args.periods,
+        'linkage': args.linkage,
+        'codependence': args.codependence,
+        'repeat': args.repeat,
+        'seed': args.seed
+    }
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({'metadata': metadata, 'results': json.loads(results.to_json(orient='records'))}, f,
+                  ensure_ascii=False, indent=1)
+    print(f"\nRésultats : {output}")
+
+    if args.max_seconds is not None:
+        figures_only = results[results['figure'] != 'classification']
+        slow = figures_only[figures_only['build'] + figures_only['serialize'] > args.max_seconds]
+        if len(slow):
+            print(f"\n{len(slow)} figure(s) au-delà de {args.max_seconds} s :")
+            print(slow.to_string(index=False))
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,169 @@
+"""
+Test de charge du service HTTP d'optimisation (service.py)
+
+Envoie des requêtes /optimize concurrentes sur des rendements synthétiques et mesure
+le débit, les latences, la part de requêtes fusionnées et la taille moyenne des lots.
+
+Usage :
+    python benchmarks/load_test.py                       # démarre son propre service
+    python benchmarks/load_test.py --url http://127.0.0.1:8765
+    python benchmarks/load_test.py --requests 200 --concurrency 16 --datasets 2
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_MODELS = [
+    "Portefeuille de Risque Minimum",
+    "Portefeuille de Sharpe Maximum",
+    "Portefeuille d'Utilité Maximum",
+    "Portefeuille de Parité de Risque",
+    "Hierarchical Risk Parity (HRP)"
+]
+
+
+def make_returns(n_periods, n_assets, seed):
+    """Rendements synthétiques à un facteur, au format attendu par le service"""
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0.0004, 0.01, (n_periods, 1))
+    data = 0.6 * market + rng.normal(0.0002, 0.012, (n_periods, n_assets))
+    return {
+        'columns': [f"A{i:03d}" for i in range(n_assets)],
+        'data': np.round(data, 8).tolist()
+    }
+
+
+def make_payloads(n_requests, datasets, models, risk_aversions, seed=0):
+    """
+    Construit les requêtes : chaque requête tire un jeu de rendements, un modèle (avec sa
+    mesure de risque par défaut) et une aversion au risque ; les combinaisons identiques
+    sont fusionnées par le service
+    """
+    rng = np.random.default_rng(seed)
+    payloads = []
+    for _ in range(n_requests):
+        payloads.append({
+            'returns': datasets[rng.integers(len(datasets))],
+            'model': models[rng.integers(len(models))],
+            'parameters': {'rf': 0.0, 'risk_aversion': float(risk_aversions[rng.integers(len(risk_aversions))])}
+        })
+    return payloads
+
+
+def post(url, payload, timeout=600):
+    """Envoie une requête et retourne (latence en secondes, code HTTP, réponse)"""
+    data = json.dumps(payload).encode('utf-8')
+    request = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            body = json.loads(response.read())
+            code = response.status
+    except urllib.error.HTTPError as e:
+        body = json.loads(e.read() or b'{}')
+        code = e.code
+    return time.perf_counter() - start, code, body
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_service(workers):
+    """Démarre service.py dans un sous-processus et attend qu'il soit prêt"""
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, str(ROOT / 'service.py'), '--port', str(port), '--workers', str(workers)],
+        cwd=ROOT, stdout=subprocess.PIPE, text=True
+    )
+    line = process.stdout.readline()
+    if 'prêt' not in line:
+        process.kill()
+        raise RuntimeError("Le service n'a pas démarré.")
+    return process, f"http://127.0.0.1:{port}"
+
+
+def run_load(url, payloads, concurrency):
+    """
+    Exécute toutes les requêtes avec `concurrency` clients simultanés
+
+    Returns:
+    --------
+    dict : débit, latences et compteurs
+    """
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda payload: post(url + '/optimize', payload), payloads))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for latency, _, _ in results)
+    bodies = [body for _, code, body in results if code == 200]
+    return {
+        'requêtes': len(results),
+        'durée (s)': elapsed,
+        'débit (req/s)': len(results) / elapsed,
+        'latence p50 (s)': statistics.median(latencies),
+        'latence p95 (s)': latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))],
+        'latence max (s)': latencies[-1],
+        'erreurs HTTP': len(results) - len(bodies),
+        'optimales': sum(body.get('status') == 'optimal' for body in bodies),
+        'fusionnées': sum(bool(body.get('coalesced')) for body in bodies),
+        'taille moyenne des lots': statistics.mean(body.get('batch_size', 1) for body in bodies) if bodies else 0
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Test de charge du service d'optimisation")
+    parser.add_argument('--url', default=None, help="URL d'un service déjà démarré (sinon un service est lancé)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="Workers du service lancé par le test")
+    parser.add_argument('--requests', '-n', type=int, default=100, help="Nombre de requêtes")
+    parser.add_argument('--concurrency', '-c', type=int, default=8, help="Clients simultanés")
+    parser.add_argument('--datasets', type=int, default=2, help="Nombre de jeux de rendements distincts")
+    parser.add_argument('--assets', type=int, default=20, help="Nombre d'actifs")
+    parser.add_argument('--periods', type=int, default=500, help="Nombre de périodes")
+    parser.add_argument('--models', nargs='+', default=DEFAULT_MODELS)
+    parser.add_argument('--risk-aversions', nargs='+', type=float, default=[1.0, 2.0, 5.0])
+    args = parser.parse_args(argv)
+
+    process = None
+    url = args.url
+    if url is None:
+        print(f"Démarrage du service ({args.workers} workers)...")
+        process, url = start_service(args.workers)
+
+    try:
+        datasets = [make_returns(args.periods, args.assets, seed) for seed in range(args.datasets)]
+        payloads = make_payloads(args.requests, datasets, args.models, args.risk_aversions)
+        # Une requête de préchauffage par jeu de données (empreintes, caches des workers)
+        for dataset in datasets:
+            post(url + '/optimize', dict(payloads[0], returns=dataset))
+
+        report = run_load(url, payloads, args.concurrency)
+        for name, value in report.items():
+            print(f"{name:<26}{value:>12.3f}" if isinstance(value, float) else f"{name:<26}{value:>12}")
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
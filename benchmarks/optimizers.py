@@ -0,0 +1,296 @@
+"""
+Benchmark des modèles d'optimisation selon la taille du problème
+
+Chaque couple (modèle, mesure de risque) est optimisé sur des univers synthétiques de
+N actifs et T périodes (analytics.synthetic). Chaque cas s'exécute dans un processus
+fils (fork du processus principal, qui a déjà importé les modules) : le temps, le pic
+mémoire et un délai maximal sont mesurés cas par cas. Lorsqu'un cas dépasse le délai, les tailles
+supérieures du même couple sont ignorées.
+
+Mesures :
+- durée totale, durée d'estimation et durée d'optimisation (construction du problème
+  et solveur) issues d'OptimizationResult.timings
+- pic de mémoire résidente du processus fils au-delà de sa mémoire initiale (Linux/macOS)
+- pic des allocations Python/NumPy suivies par tracemalloc (mémoire interne des
+  solveurs non comprise)
+- télémétrie des solveurs : taille du problème conique, cônes, durées de compilation et
+  de résolution, itérations, solveur et tentatives (models.telemetry)
+
+Usage :
+    python benchmarks/optimizers.py                               # grille complète
+    python benchmarks/optimizers.py --assets 10 100 --periods 250 --models "Hierarchical Risk Parity (HRP)"
+    python benchmarks/optimizers.py --output resultats.json --save-baseline benchmarks/baseline.json
+    python benchmarks/optimizers.py --baseline benchmarks/baseline.json --time-threshold 1.3
+"""
+
+import argparse
+import json
+import multiprocessing
+import sys
+import time
+import tracemalloc
+import warnings
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+DEFAULT_ASSETS = [10, 100, 500, 2000]
+DEFAULT_PERIODS = [250, 1250, 5000]
+DEFAULT_TIMEOUT = 300
+DEFAULT_OUTPUT = ROOT / 'benchmarks' / 'results' / 'optimizers.json'
+
+RESULT_COLUMNS = ['model', 'risk_measure', 'n_assets', 'n_periods', 'status', 'wall', 'estimation',
+                  'optimization', 'peak_rss_mb', 'peak_traced_mb', 'error']
+# Télémétrie des solveurs (OptimizationResult.telemetry)
+TELEMETRY_COLUMNS = ['solver', 'attempts', 'variables', 'constraints', 'canonical_variables', 'cones',
+                     'compile_time', 'solve_time', 'iterations']
+
+
+def _rss_mb():
+    """Mémoire résidente courante (Mo), None si indisponible"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * resource.getpagesize() / 2**20
+    except (OSError, AttributeError):
+        return None
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss est en kilo-octets sous Linux, en octets sous macOS
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10
+
+
+def _run_case(case, parameters, connection):
+    """Exécute un cas dans le processus fils et renvoie ses mesures"""
+    warnings.filterwarnings('ignore')
+    from analytics.synthetic import synthetic_returns
+    from models import run_model
+
+    model, risk_measure, n_assets, n_periods = case
+    parameters = dict(parameters)
+    returns = synthetic_returns(n_assets, n_periods, seed=parameters.pop('seed', 0))
+
+    rss_before = _rss_mb()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = run_model(returns, model, risk_measure, **parameters)
+    wall = time.perf_counter() - start
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    peak_rss = _peak_rss_mb()
+    connection.send({
+        'status': result.status,
+        'wall': wall,
+        'estimation': result.timings.get('estimation'),
+        'optimization': result.timings.get('optimization'),
+        'peak_rss_mb': None if peak_rss is None or rss_before is None else max(peak_rss - rss_before, 0.0),
+        'peak_traced_mb': traced_peak / 2**20,
+        'error': result.error,
+        **{name: result.telemetry.get(name) for name in TELEMETRY_COLUMNS}
+    })
+    connection.close()
+
+
+def run_case(case, parameters, timeout=DEFAULT_TIMEOUT):
+    """
+    Exécute un cas dans un processus fils
+
+    Returns:
+    --------
+    dict : mesures du cas (status 'timeout' si le délai est dépassé)
+    """
+    context = multiprocessing.get_context('fork' if 'fork' in multiprocessing.get_all_start_methods() else None)
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_run_case, args=(case, parameters, sender), daemon=True)
+    process.start()
+    sender.close()
+
+    measures = None
+    timed_out = not receiver.poll(timeout)
+    if not timed_out:
+        try:
+            measures = receiver.recv()
+        except EOFError:
+            measures = None
+    process.join(0 if timed_out else 5)
+    if process.is_alive():
+        process.terminate()
+        process.join()
+
+    model, risk_measure, n_assets, n_periods = case
+    row = {'model': model, 'risk_measure': risk_measure, 'n_assets': n_assets, 'n_periods': n_periods}
+    if timed_out:
+        return dict(row, status='timeout', error=f"délai de {timeout:.0f} s dépassé")
+    if measures is None:
+        return dict(row, status='crash', error=f"exitcode={process.exitcode}")
+    return dict(row, **measures)
+
+
+def build_cases(models, risk_measures, assets, periods):
+    """Liste les cas (modèle, mesure, N, T), du plus petit au plus grand problème"""
+    from models import MODEL_FUNCTIONS, risk_measures_for
+
+    cases = []
+    for model in models:
+        if model not in MODEL_FUNCTIONS:
+            raise ValueError(f"Modèle non reconnu: {model}")
+        accepted = list(risk_measures_for(model))
+        if risk_measures == ['all']:
+            measures = accepted
+        elif risk_measures:
+            measures = [rm for rm in risk_measures if rm in accepted]
+        else:
+            measures = accepted[:1]
+        for risk_measure in measures:
+            for n_assets in sorted(assets):
+                for n_periods in sorted(periods):
+                    cases.append((model, risk_measure, n_assets, n_periods))
+    return cases
+
+
+def run_benchmark(cases, parameters, timeout=DEFAULT_TIMEOUT, verbose=True):
+    """
+    Exécute les cas ; après un dépassement de délai, les cas plus grands (N et T
+    supérieurs ou égaux) du même couple sont marqués 'skipped'
+
+    Returns:
+    --------
+    pd.DataFrame : une ligne par cas (colonnes RESULT_COLUMNS et TELEMETRY_COLUMNS)
+    """
+    rows = []
+    too_large = {}
+    for case in cases:
+        model, risk_measure, n_assets, n_periods = case
+        limit = too_large.get((model, risk_measure))
+        if limit is not None and n_assets >= limit[0] and n_periods >= limit[1]:
+            row = {'model': model, 'risk_measure': risk_measure, 'n_assets': n_assets,
+                   'n_periods': n_periods, 'status': 'skipped'}
+        else:
+            row = run_case(case, parameters, timeout)
+            if row['status'] == 'timeout':
+                too_large[(model, risk_measure)] = (n_assets, n_periods)
+        rows.append(row)
+
+        if verbose:
+            wall = row.get('wall')
+            memory = row.get('peak_rss_mb')
+            print(f"{model[:45]:<46}{risk_measure:<10}N={n_assets:<6}T={n_periods:<6}"
+                  f"{row['status']:<11}"
+                  f"{'' if wall is None else f'{wall:9.3f} s'}"
+                  f"{'' if memory is None else f'{memory:10.1f} Mo'}", flush=True)
+
+    return pd.DataFrame(rows, columns=RESULT_COLUMNS + TELEMETRY_COLUMNS)
+
+
+def compare_to_baseline(results, baseline, time_threshold=1.25, memory_threshold=1.25, min_seconds=0.05,
+                        min_mb=5.0):
+    """
+    Compare des résultats à une référence
+
+    Un cas régresse si sa durée (ou son pic mémoire) dépasse la référence multipliée par
+    le seuil et d'au moins min_seconds (ou min_mb), ou si son statut n'est plus optimal.
+
+    Returns:
+    --------
+    pd.DataFrame : cas en régression avec les valeurs de référence et les ratios
+    """
+    keys = ['model', 'risk_measure', 'n_assets', 'n_periods']
+    merged = results.merge(baseline, on=keys, suffixes=('', '_ref'))
+
+    time_ratio = merged['wall'] / merged['wall_ref']
+    memory_ratio = merged['peak_rss_mb'] / merged['peak_rss_mb_ref']
+    slower = (time_ratio > time_threshold) & (merged['wall'] - merged['wall_ref'] > min_seconds)
+    heavier = (memory_ratio > memory_threshold) & (merged['peak_rss_mb'] - merged['peak_rss_mb_ref'] > min_mb)
+    broken = (merged['status_ref'] == 'optimal') & (merged['status'] != 'optimal')
+
+    regressions = merged.assign(time_ratio=time_ratio, memory_ratio=memory_ratio)[slower | heavier | broken]
+    return regressions[keys + ['status', 'status_ref', 'wall', 'wall_ref', 'time_ratio',
+                               'peak_rss_mb', 'peak_rss_mb_ref', 'memory_ratio']]
+
+
+def load_results(path):
+    """Lit un fichier de résultats (JSON écrit par ce script)"""
+    with open(path, encoding='utf-8') as f:
+        return pd.DataFrame(json.load(f)['results'], columns=RESULT_COLUMNS + TELEMETRY_COLUMNS)
+
+
+def save_results(results, path, metadata):
+    """Écrit les résultats et les paramètres du benchmark en JSON"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {'metadata': metadata, 'results': json.loads(results.to_json(orient='records'))}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False, indent=1)
+
+
+def main(argv=None):
+    from models import MODEL_FUNCTIONS
+
+    parser = argparse.ArgumentParser(description="Benchmark des modèles d'optimisation par taille de problème")
+    parser.add_argument('--models', nargs='+', default=list(MODEL_FUNCTIONS), help="Modèles (noms du registre)")
+    parser.add_argument('--risk-measures', nargs='+', default=None,
+                        help="Mesures de risque ('all' = toutes ; défaut : mesure par défaut de chaque modèle)")
+    parser.add_argument('--assets', nargs='+', type=int, default=DEFAULT_ASSETS, help="Nombres d'actifs N")
+    parser.add_argument('--periods', nargs='+', type=int, default=DEFAULT_PERIODS, help="Nombres de périodes T")
+    parser.add_argument('--rf', type=float, default=0.0, help="Taux sans risque par période")
+    parser.add_argument('--seed', type=int, default=0, help="Graine des données synthétiques")
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help="Délai maximal par cas (s)")
+    parser.add_argument('--output', '-o', default=str(DEFAULT_OUTPUT), help="Fichier de résultats JSON")
+    parser.add_argument('--baseline', default=None, help="Résultats de référence à comparer")
+    parser.add_argument('--save-baseline', default=None, help="Enregistre aussi les résultats comme référence")
+    parser.add_argument('--time-threshold', type=float, default=1.25, help="Ratio de durée toléré")
+    parser.add_argument('--memory-threshold', type=float, default=1.25, help="Ratio de mémoire toléré")
+    args = parser.parse_args(argv)
+
+    cases = build_cases(args.models, args.risk_measures, args.assets, args.periods)
+    print(f"{len(cases)} cas, délai {args.timeout:.0f} s par cas\n")
+    results = run_benchmark(cases, {'rf': args.rf, 'seed': args.seed}, timeout=args.timeout)
+
+    metadata = {
+        'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'python': sys.version.split()[0],
+        'timeout': args.timeout,
+        'rf': args.rf,
+        'seed': args.seed
+    }
+    from models.telemetry import telemetry_table
+
+    telemetry = telemetry_table(results[results['solver'].notna()].to_dict('records'))
+    if len(telemetry):
+        columns = ['Variables (max)', 'Contraintes (max)', 'Compilation moyenne (s)', 'Résolution moyenne (s)',
+                   'Itérations moyennes', 'Tentatives moyennes']
+        print("\nTélémétrie des solveurs :")
+        print(telemetry[columns].to_string(float_format=lambda x: f"{x:.3f}"))
+
+    save_results(results, args.output, metadata)
+    print(f"\nRésultats : {args.output}")
+    if args.save_baseline:
+        save_results(results, args.save_baseline, metadata)
+        print(f"Référence : {args.save_baseline}")
+
+    if args.baseline:
+        regressions = compare_to_baseline(results, load_results(args.baseline), args.time_threshold,
+                                          args.memory_threshold)
+        if len(regressions):
+            print(f"\n{len(regressions)} régression(s) par rapport à {args.baseline} :")
+            print(regressions.to_string(index=False))
+            return 1
+        print(f"\nAucune régression par rapport à {args.baseline}.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""
+Benchmark du démarrage à froid de l'application Streamlit
+
+Chaque scénario est mesuré dans un processus Python neuf (imports non mis en cache) :
+
+- accueil : premier rendu de la page d'accueil
+- optimisation_froide : page d'optimisation ouverte juste après l'accueil, avant la
+  fin du préchargement en arrière-plan
+- optimisation_préchargée : page d'optimisation ouverte après la fin du préchargement
+- imports_lourds : import direct des modules lourds (coût payé par chaque page lorsque
+  tout était importé au chargement de app.py)
+
+Usage :
+    python benchmarks/startup.py
+    python benchmarks/startup.py --repeat 5
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+_SCENARIO_CODE = r'''
+import json, sys, time, warnings
+warnings.filterwarnings('ignore')
+sys.path.insert(0, {root!r})
+scenario = {scenario!r}
+result = {{}}
+
+if scenario == 'imports_lourds':
+    from runtime.lazy import HEAVY_MODULES
+    start = time.perf_counter()
+    for name in HEAVY_MODULES:
+        __import__(name)
+    result['secondes'] = time.perf_counter() - start
+else:
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file({app!r}, default_timeout=300)
+    at.run()
+    result['accueil'] = time.perf_counter() - start
+
+    if scenario != 'accueil':
+        from runtime.lazy import start_warm_up
+        if scenario == 'optimisation_préchargée':
+            start_warm_up().join()
+        start = time.perf_counter()
+        at.sidebar.radio[0].set_value('Optimisation').run()
+        result['optimisation'] = time.perf_counter() - start
+    result['secondes'] = result.get('optimisation', result['accueil'])
+    result['exceptions'] = len(at.exception)
+
+print('RESULT' + json.dumps(result))
+'''
+
+SCENARIOS = ['accueil', 'optimisation_froide', 'optimisation_préchargée', 'imports_lourds']
+
+
+def run_scenario(scenario):
+    """Exécute un scénario dans un nouveau processus et retourne ses mesures"""
+    code = _SCENARIO_CODE.format(root=str(ROOT), app=str(ROOT / 'app.py'), scenario=scenario)
+    completed = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, cwd=ROOT)
+    for line in completed.stdout.splitlines():
+        if line.startswith('RESULT'):
+            return json.loads(line[len('RESULT'):])
+    raise RuntimeError(f"Scénario {scenario} en échec :\n{completed.stderr[-2000:]}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark du démarrage à froid de l'application")
+    parser.add_argument('--repeat', type=int, default=3, help="Nombre de processus par scénario")
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=SCENARIOS)
+    args = parser.parse_args(argv)
+
+    print(f"{'Scénario':<26}{'Médiane (s)':>12}{'Min (s)':>10}  Détails")
+    for scenario in args.scenarios:
+        runs = [run_scenario(scenario) for _ in range(args.repeat)]
+        seconds = [run['secondes'] for run in runs]
+        details = {k: v for k, v in runs[-1].items() if k not in ('secondes',)}
+        print(f"{scenario:<26}{statistics.median(seconds):>12.2f}{min(seconds):>10.2f}  {details}")
+
+
+if __name__ == '__main__':
+    main()
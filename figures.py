@@ -0,0 +1,149 @@
+"""
+Figures Plotly de la classification hiérarchique (matrice de corrélation, dendrogramme),
+de taille bornée quel que soit le nombre d'actifs
+
+Sans dépendance à Streamlit : les figures sont construites par l'application et par
+benchmarks/figures.py.
+"""
+
+import numpy as np
+import plotly.graph_objects as go
+
+from analytics import block_average, dendrogram_coordinates
+
+
+# Rendu de la matrice de corrélation : valeurs affichées dans les cellules jusqu'à
+# HEATMAP_TEXT_MAX_ASSETS actifs, moyennes par blocs au-delà de HEATMAP_MAX_SIDE actifs
+HEATMAP_TEXT_MAX_ASSETS = 30
+HEATMAP_MAX_SIDE = 120
+
+
+def plot_correlation_matrix(clustering):
+    """
+    Affiche la matrice de corrélation, triée selon la classification hiérarchique
+
+    La taille de la figure est bornée quel que soit le nombre d'actifs : les valeurs ne
+    sont écrites dans les cellules que pour les petits univers et, au-delà de
+    HEATMAP_MAX_SIDE actifs, la matrice est moyennée par blocs d'actifs voisins dans
+    l'arbre. Les valeurs sont transmises en float32.
+
+    Parameters:
+    -----------
+    clustering : dict
+        Résultat de analytics.hierarchical_clustering (corrélation, ordre des feuilles)
+
+    Returns:
+    --------
+    go.Figure
+    """
+    order = clustering['order']
+    corr = clustering['corr'].loc[order, order]
+    n_assets = len(order)
+
+    if n_assets > HEATMAP_MAX_SIDE:
+        values, blocks = block_average(corr, HEATMAP_MAX_SIDE)
+        labels = [f"{first} … {last} ({size})" if size > 1 else first for first, last, size in blocks]
+        sizes = sorted({size for _, _, size in blocks})
+        block_size = f"{sizes[0]} à {sizes[-1]}" if len(sizes) > 1 else f"{sizes[0]}"
+        title = f"Matrice de Corrélation ({n_assets} actifs, moyennes par blocs de {block_size} actifs)"
+    else:
+        values, labels = corr.values, order
+        title = "Matrice de Corrélation"
+
+    heatmap = dict(
+        z=values.astype(np.float32),
+        x=labels,
+        y=labels,
+        colorscale='RdBu',
+        zmid=0,
+        colorbar=dict(title="Corrélation"),
+        hovertemplate='%{y} / %{x}<br>Corrélation : %{z:.2f}<extra></extra>'
+    )
+    if n_assets <= HEATMAP_TEXT_MAX_ASSETS:
+        heatmap.update(texttemplate='%{z:.2f}', textfont={"size": 10})
+    fig = go.Figure(data=go.Heatmap(**heatmap))
+
+    fig.update_layout(
+        title=title,
+        height=500 if n_assets <= HEATMAP_TEXT_MAX_ASSETS else 700,
+        xaxis_showgrid=False,
+        yaxis_showgrid=False,
+        xaxis_showticklabels=len(labels) <= 2 * HEATMAP_TEXT_MAX_ASSETS,
+        yaxis_showticklabels=len(labels) <= 2 * HEATMAP_TEXT_MAX_ASSETS,
+        yaxis_autorange='reversed'
+    )
+
+    return fig
+
+
+# Dendrogramme : noms des actifs sur l'axe jusqu'à DENDROGRAM_LABEL_MAX_ASSETS actifs,
+# tracé WebGL à partir de DENDROGRAM_WEBGL_MIN_ASSETS actifs
+DENDROGRAM_LABEL_MAX_ASSETS = 100
+DENDROGRAM_WEBGL_MIN_ASSETS = 500
+
+LINKAGE_LABELS = {
+    'ward': "Ward",
+    'single': "Simple (plus proche voisin)",
+    'complete': "Complète (plus lointain voisin)",
+    'average': "Moyenne (UPGMA)"
+}
+
+CODEPENDENCE_LABELS = {
+    'pearson': "Pearson",
+    'spearman': "Spearman (rangs)",
+    'kendall': "Kendall (tau)"
+}
+
+
+def plot_dendrogram(clustering, linkage='ward', codependence='pearson'):
+    """
+    Affiche le dendrogramme de la classification hiérarchique
+
+    Tous les liens forment une seule trace (segments séparés par des NaN), tracée en
+    WebGL pour les grands univers : la taille de la figure croît linéairement avec N
+    et le navigateur ne gère qu'un objet.
+
+    Parameters:
+    -----------
+    clustering : dict
+        Résultat de analytics.hierarchical_clustering (liaison, ordre des feuilles)
+    linkage, codependence : str
+        Méthodes utilisées pour la classification (titre de la figure)
+
+    Returns:
+    --------
+    go.Figure
+    """
+    x, y, leaf_positions = dendrogram_coordinates(clustering['linkage'])
+    labels = clustering['order']
+    n_assets = len(labels)
+
+    trace = go.Scattergl if n_assets >= DENDROGRAM_WEBGL_MIN_ASSETS else go.Scatter
+    fig = go.Figure(trace(
+        x=x.astype(np.float32),
+        y=y.astype(np.float32),
+        mode='lines',
+        line=dict(color='rgb(100,100,100)', width=1),
+        connectgaps=False,
+        showlegend=False,
+        hoverinfo='skip'
+    ))
+
+    show_labels = n_assets <= DENDROGRAM_LABEL_MAX_ASSETS
+    title = f"Dendrogramme (Clustering Hiérarchique - {LINKAGE_LABELS.get(linkage, linkage)}, {CODEPENDENCE_LABELS.get(codependence, codependence)})"
+    fig.update_layout(
+        title=title if show_labels else f"{title} - {n_assets} actifs",
+        xaxis=dict(
+            tickmode='array',
+            tickvals=leaf_positions if show_labels else [],
+            ticktext=labels if show_labels else [],
+            tickangle=-45,
+            showticklabels=show_labels
+        ),
+        yaxis_title="Distance",
+        height=500,
+        showlegend=False,
+        plot_bgcolor='white'
+    )
+
+    return fig
@@ -24,6 +24,48 @@ from .hierarchical_models import (
     optimize_nco
 )
 
+from .moments import (
+    historical_portfolio,
+    clear_moments_cache
+)
+
+from .uncertainty import (
+    get_uncertainty_sets,
+    recenter_uncertainty_sets,
+    clear_uncertainty_cache
+)
+
+from .result import (
+    OptimizationResult,
+    run_optimization
+)
+
+from .telemetry import (
+    collect_solver_telemetry,
+    summarize_solves,
+    describe_telemetry,
+    telemetry_table
+)
+
+from .sizing import (
+    DEFAULT_MEMORY_BUDGET,
+    estimate_memory,
+    plan_run
+)
+
+from .registry import (
+    RISK_MEASURES_DICT,
+    HRP_HERC_RISK_MEASURES,
+    MODEL_FUNCTIONS,
+    HIERARCHICAL_MODELS,
+    ROBUST_MODELS,
+    get_model_function,
+    risk_measures_for,
+    comparable_risk_measure,
+    model_parameters,
+    run_model
+)
+
 __all__ = [
     # Classic models
     'optimize_max_return',
@@ -40,5 +82,35 @@ __all__ = [
     # Hierarchical models
     'optimize_hrp',
     'optimize_herc',
-    'optimize_nco'
+    'optimize_nco',
+    # Moments
+    'historical_portfolio',
+    'clear_moments_cache',
+    # Uncertainty sets
+    'get_uncertainty_sets',
+    'recenter_uncertainty_sets',
+    'clear_uncertainty_cache',
+    # Results
+    'OptimizationResult',
+    'run_optimization',
+    # Solver telemetry
+    'collect_solver_telemetry',
+    'summarize_solves',
+    'describe_telemetry',
+    'telemetry_table',
+    # Memory budget
+    'DEFAULT_MEMORY_BUDGET',
+    'estimate_memory',
+    'plan_run',
+    # Registry
+    'RISK_MEASURES_DICT',
+    'HRP_HERC_RISK_MEASURES',
+    'MODEL_FUNCTIONS',
+    'HIERARCHICAL_MODELS',
+    'ROBUST_MODELS',
+    'get_model_function',
+    'risk_measures_for',
+    'comparable_risk_measure',
+    'model_parameters',
+    'run_model'
 ]
@@ -2,8 +2,13 @@
 Modèles d'optimisation classiques de portefeuille
 """
 
-import riskfolio as rp
-import streamlit as st
+from .moments import historical_portfolio
+from .result import run_optimization
+
+
+def _classic_portfolio(returns, rf):
+    """Construit le portefeuille et lui affecte ses moments historiques (mis en cache)"""
+    return historical_portfolio(returns, rf)
 
 
 def optimize_max_return(returns, risk_measure, rf, **kwargs):
@@ -21,19 +26,14 @@ def optimize_max_return(returns, risk_measure, rf, **kwargs):
     
     Returns:
     --------
-    tuple : (weights, portfolio_object, returns)
+    OptimizationResult : poids, portefeuille, statut, durées et erreur éventuelle
     """
-    try:
-        port = rp.Portfolio(returns=returns)
-        port.assets_stats(method_mu='hist', method_cov='hist')
-        port.rf = rf
-        
-        w = port.optimization(model='Classic', rm=risk_measure, obj='MaxRet', rf=rf, l=0, hist=True)
-        
-        return w, port, returns
-    except Exception as e:
-        st.error(f"Erreur dans optimize_max_return: {str(e)}")
-        return None, None, None
+    return run_optimization(
+        'optimize_max_return',
+        returns,
+        estimate=lambda: _classic_portfolio(returns, rf),
+        solve=lambda port: port.optimization(model='Classic', rm=risk_measure, obj='MaxRet', rf=rf, l=0, hist=True)
+    )
 
 
 def optimize_min_risk(returns, risk_measure, rf, **kwargs):
@@ -51,19 +51,14 @@ def optimize_min_risk(returns, risk_measure, rf, **kwargs):
     
     Returns:
     --------
-    tuple : (weights, portfolio_object, returns)
+    OptimizationResult : poids, portefeuille, statut, durées et erreur éventuelle
     """
-    try:
-        port = rp.Portfolio(returns=returns)
-        port.assets_stats(method_mu='hist', method_cov='hist')
-        port.rf = rf
-        
-        w = port.optimization(model='Classic', rm=risk_measure, obj='MinRisk', rf=rf, l=0, hist=True)
-        
-        return w, port, returns
-    except Exception as e:
-        st.error(f"Erreur dans optimize_min_risk: {str(e)}")
-        return None, None, None
+    return run_optimization(
+        'optimize_min_risk',
+        returns,
+        estimate=lambda: _classic_portfolio(returns, rf),
+        solve=lambda port: port.optimization(model='Classic', rm=risk_measure, obj='MinRisk', rf=rf, l=0, hist=True)
+    )
 
 
 def optimize_max_sharpe(returns, risk_measure, rf, **kwargs):
@@ -81,19 +76,14 @@ def optimize_max_sharpe(returns, risk_measure, rf, **kwargs):
     
     Returns:
     --------
-    tuple : (weights, portfolio_object, returns)
+    OptimizationResult : poids, portefeuille, statut, durées et erreur éventuelle
     """
-    try:
-        port = rp.Portfolio(returns=returns)
-        port.assets_stats(method_mu='hist', method_cov='hist')
-        port.rf = rf
-        
-        w = port.optimization(model='Classic', rm=risk_measure, obj='Sharpe', rf=rf, l=0, hist=True)
-        
-        return w, port, returns
-    except Exception as e:
-        st.error(f"Erreur dans optimize_max_sharpe: {str(e)}")
-        return None, None, None
+    return run_optimization(
+        'optimize_max_sharpe',
+        returns,
+        estimate=lambda: _classic_portfolio(returns, rf),
+        solve=lambda port: port.optimization(model='Classic', rm=risk_measure, obj='Sharpe', rf=rf, l=0, hist=True)
+    )
 
 
 def optimize_max_utility(returns, risk_measure, rf, risk_aversion=2.0, **kwargs):
@@ -113,19 +103,14 @@ def optimize_max_utility(returns, risk_measure, rf, risk_aversion=2.0, **kwargs)
     
     Returns:
     --------
-    tuple : (weights, portfolio_object, returns)
+    OptimizationResult : poids, portefeuille, statut, durées et erreur éventuelle
     """
-    try:
-        port = rp.Portfolio(returns=returns)
-        port.assets_stats(method_mu='hist', method_cov='hist')
-        port.rf = rf
-        
-        w = port.optimization(model='Classic', rm=risk_measure, obj='Utility', rf=rf, l=risk_aversion, hist=True)
-        
-        return w, port, returns
-    except Exception as e:
-        st.error(f"Erreur dans optimize_max_utility: {str(e)}")
-        return None, None, None
+    return run_optimization(
+        'optimize_max_utility',
+        returns,
+        estimate=lambda: _classic_portfolio(returns, rf),
+        solve=lambda port: port.optimization(model='Classic', rm=risk_measure, obj='Utility', rf=rf, l=risk_aversion, hist=True)
+    )
 
 
 def optimize_risk_parity(returns, risk_measure, rf, **kwargs):
@@ -143,46 +128,39 @@ def optimize_risk_parity(returns, risk_measure, rf, **kwargs):
     
     Returns:
     --------
-    tuple : (weights, portfolio_object, returns)
+    OptimizationResult : poids, portefeuille, statut, durées et erreur éventuelle
     """
-    try:
-        port = rp.Portfolio(returns=returns)
-        port.assets_stats(method_mu='hist', method_cov='hist')
-        port.rf = rf
-        
-        w = port.rp_optimization(model='Classic', rm=risk_measure, rf=rf, b=None, hist=True)
-        
-        return w, port, returns
-    except Exception as e:
-        st.error(f"Erreur dans optimize_risk_parity: {str(e)}")
-        return None, None, None
+    return run_optimization(
+        'optimize_risk_parity',
+        returns,
+        estimate=lambda: _classic_portfolio(returns, rf),
+        solve=lambda port: port.rp_optimization(model='Classic', rm=risk_measure, rf=rf, b=None, hist=True)
+    )
 
 
 def optimize_relaxed_risk_parity(returns, risk_measure, rf, **kwargs):
     """
     Optimise le portefeuille selon le principe de parité de risque relaxée
     
+    La parité de risque relaxée de Riskfolio-Lib est définie sur la variance
+    uniquement : la mesure de risque est ignorée.
+    
     Parameters:
     -----------
     returns : pd.DataFrame
         Matrice des rendements historiques
     risk_measure : str
-        Mesure de risque à utiliser
+        Mesure de risque (non utilisée, voir ci-dessus)
     rf : float
         Taux sans risque
     
     Returns:
     --------
-    tuple : (weights, portfolio_object, returns)
+    OptimizationResult : poids, portefeuille, statut, durées et erreur éventuelle
     """
-    try:
-        port = rp.Portfolio(returns=returns)
-        port.assets_stats(method_mu='hist', method_cov='hist')
-        port.rf = rf
-        
-        w = port.rrp_optimization(model='Classic', rm=risk_measure, rf=rf, b=None, hist=True)
-        
-        return w, port, returns
-    except Exception as e:
-        st.error(f"Erreur dans optimize_relaxed_risk_parity: {str(e)}")
-        return None, None, None
+    return run_optimization(
+        'optimize_relaxed_risk_parity',
+        returns,
+        estimate=lambda: _classic_portfolio(returns, rf),
+        solve=lambda port: port.rrp_optimization(model='Classic', version='A', l=1, b=None, hist=True)
+    )
@@ -3,7 +3,26 @@ Modèles d'optimisation hiérarchiques (Machine Learning)
 """
 
 import riskfolio as rp
-import streamlit as st
+
+from analytics.risk_measures import RISK_MEASURE_ALIASES
+from .result import run_optimization
+
+
+# Codes HCPortfolio des mesures de l'application : contrairement à Portfolio,
+# 'vol' y désigne l'écart-type et 'MV' la variance
+HC_RISK_MEASURE_CODES = dict(RISK_MEASURE_ALIASES, vol='vol', variance='MV')
+
+
+def hc_risk_measure(code):
+    """Retourne le code HCPortfolio d'une mesure (codes HRP/HERC de l'application acceptés)"""
+    return HC_RISK_MEASURE_CODES.get(code, code)
+
+
+def _hc_portfolio(returns, rf):
+    """Construit le portefeuille hiérarchique (les moments sont estimés à l'optimisation)"""
+    port = rp.HCPortfolio(returns=returns)
+    port.rf = rf
+    return port
 
 
 def optimize_hrp(returns, risk_measure, rf, linkage='ward', codependence='pearson', **kwargs):
@@ -29,27 +48,22 @@ def optimize_hrp(returns, risk_measure, rf, linkage='ward', codependence='pearso
     
     Returns:
     --------
-    tuple : (weights, portfolio_object, returns)
+    OptimizationResult : poids, portefeuille, statut, durées et erreur éventuelle
     """
-    try:
-        port = rp.HCPortfolio(returns=returns)
-        port.assets_stats(method_mu='hist', method_cov='hist')
-        port.rf = rf
-        
-        w = port.optimization(
+    return run_optimization(
+        'optimize_hrp',
+        returns,
+        estimate=lambda: _hc_portfolio(returns, rf),
+        solve=lambda port: port.optimization(
             model='HRP',
             codependence=codependence,
-            rm=risk_measure,
+            rm=hc_risk_measure(risk_measure),
             rf=rf,
             linkage=linkage,
             max_k=10,
             leaf_order=True
         )
-        
-        return w, port, returns
-    except Exception as e:
-        st.error(f"Erreur dans optimize_hrp: {str(e)}")
-        return None, None, None
+    )
 
 
 def optimize_herc(returns, risk_measure, rf, linkage='ward', codependence='pearson', **kwargs):
@@ -74,27 +88,22 @@ def optimize_herc(returns, risk_measure, rf, linkage='ward', codependence='pears
     
     Returns:
     --------
-    tuple : (weights, portfolio_object, returns)
+    OptimizationResult : poids, portefeuille, statut, durées et erreur éventuelle
     """
-    try:
-        port = rp.HCPortfolio(returns=returns)
-        port.assets_stats(method_mu='hist', method_cov='hist')
-        port.rf = rf
-        
-        w = port.optimization(
+    return run_optimization(
+        'optimize_herc',
+        returns,
+        estimate=lambda: _hc_portfolio(returns, rf),
+        solve=lambda port: port.optimization(
             model='HERC',
             codependence=codependence,
-            rm=risk_measure,
+            rm=hc_risk_measure(risk_measure),
             rf=rf,
             linkage=linkage,
             max_k=10,
             leaf_order=True
         )
-        
-        return w, port, returns
-    except Exception as e:
-        st.error(f"Erreur dans optimize_herc: {str(e)}")
-        return None, None, None
+    )
 
 
 def optimize_nco(returns, risk_measure, rf, obj='Sharpe', linkage='ward', codependence='pearson', **kwargs):
@@ -125,25 +134,20 @@ def optimize_nco(returns, risk_measure, rf, obj='Sharpe', linkage='ward', codepe
     
     Returns:
     --------
-    tuple : (weights, portfolio_object, returns)
+    OptimizationResult : poids, portefeuille, statut, durées et erreur éventuelle
     """
-    try:
-        port = rp.HCPortfolio(returns=returns)
-        port.assets_stats(method_mu='hist', method_cov='hist')
-        port.rf = rf
-        
-        w = port.optimization(
+    return run_optimization(
+        'optimize_nco',
+        returns,
+        estimate=lambda: _hc_portfolio(returns, rf),
+        solve=lambda port: port.optimization(
             model='NCO',
             codependence=codependence,
-            rm=risk_measure,
+            rm=hc_risk_measure(risk_measure),
             obj=obj,
             rf=rf,
             linkage=linkage,
             max_k=10,
             leaf_order=True
         )
-        
-        return w, port, returns
-    except Exception as e:
-        st.error(f"Erreur dans optimize_nco: {str(e)}")
-        return None, None, None
+    )
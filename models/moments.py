@@ -0,0 +1,80 @@
+"""
+Moments historiques des portefeuilles classiques et robustes, mis en cache
+"""
+
+import threading
+from collections import OrderedDict
+
+import riskfolio as rp
+
+from runtime.fingerprint import fingerprint
+
+
+# Cache LRU des moments estimés, indexé par empreinte des rendements
+MAX_CACHED_MOMENTS = 16
+_CACHE = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+# Verrou par empreinte des moments en cours d'estimation
+_PENDING = {}
+
+# Attributs renseignés par Portfolio.assets_stats(method_mu='hist', method_cov='hist')
+_MOMENT_ATTRIBUTES = ['mu', 'cov', 'skew', 'kurt', 'skurt', 'L_2', 'D_2', 'S_2']
+
+
+def historical_portfolio(returns, rf):
+    """
+    Construit un rp.Portfolio dont les moments historiques sont estimés une seule fois
+
+    Les moments (moyenne, covariance corrigée si besoin) sont mis en cache par empreinte
+    des rendements : les modèles classiques et robustes optimisés successivement sur les
+    mêmes rendements (lots du service HTTP, balayages de paramètres) ne les recalculent
+    pas. Les modèles optimisés simultanément sur les mêmes rendements (comparaison de
+    modèles) attendent l'estimation en cours au lieu de la dupliquer. Chaque portefeuille
+    reçoit sa propre copie des moments.
+
+    Parameters:
+    -----------
+    returns : pd.DataFrame
+        Matrice des rendements historiques
+    rf : float
+        Taux sans risque
+
+    Returns:
+    --------
+    rp.Portfolio : portefeuille prêt à être optimisé
+    """
+    port = rp.Portfolio(returns=returns)
+    key = fingerprint(returns)
+
+    with _CACHE_LOCK:
+        moments = _CACHE.get(key)
+        if moments is not None:
+            _CACHE.move_to_end(key)
+
+    if moments is None:
+        with _CACHE_LOCK:
+            pending = _PENDING.setdefault(key, threading.Lock())
+        with pending:
+            with _CACHE_LOCK:
+                moments = _CACHE.get(key)
+            if moments is None:
+                port.assets_stats(method_mu='hist', method_cov='hist')
+                moments = {name: getattr(port, name, None) for name in _MOMENT_ATTRIBUTES}
+                with _CACHE_LOCK:
+                    _CACHE[key] = moments
+                    _CACHE.move_to_end(key)
+                    while len(_CACHE) > MAX_CACHED_MOMENTS:
+                        _CACHE.popitem(last=False)
+                    _PENDING.pop(key, None)
+
+    for name, value in moments.items():
+        setattr(port, name, value.copy() if hasattr(value, 'copy') else value)
+    port.rf = rf
+    return port
+
+
+def clear_moments_cache():
+    """Vide le cache des moments historiques"""
+    with _CACHE_LOCK:
+        _CACHE.clear()
@@ -0,0 +1,292 @@
+"""
+Registre des modèles d'optimisation et des mesures de risque disponibles
+
+Point d'entrée commun à l'application Streamlit et aux exécutions en ligne de commande.
+"""
+
+import inspect
+import time
+
+from analytics.frequency import periods_per_year
+from analytics.reports import portfolio_summary
+from analytics.risk_measures import resolve_risk_measure
+from runtime.fingerprint import fingerprint
+from runtime.timing import span
+
+from .classic_models import (
+    optimize_max_return,
+    optimize_min_risk,
+    optimize_max_sharpe,
+    optimize_max_utility,
+    optimize_risk_parity,
+    optimize_relaxed_risk_parity
+)
+from .robust_models import (
+    optimize_robust_max_return,
+    optimize_robust_min_risk,
+    optimize_robust_max_sharpe,
+    optimize_robust_max_utility
+)
+from .hierarchical_models import (
+    optimize_hrp,
+    optimize_herc,
+    optimize_nco,
+    _hc_portfolio
+)
+from .moments import historical_portfolio
+from .result import OptimizationResult
+
+
+# Dictionnaire de traduction des mesures de risque (modèles classiques)
+RISK_MEASURES_DICT = {
+    "MV": "Variance (Écart-type)",
+    "MAD": "Écart Absolu Moyen (MAD)",
+    "MSV": "Semi-Variance",
+    "FLPM": "Moment Partiel Inférieur du Premier Ordre",
+    "SLPM": "Moment Partiel Inférieur du Second Ordre",
+    "CVaR": "Valeur à Risque Conditionnelle (CVaR)",
+    "EVaR": "Valeur à Risque Entropic (EVaR)",
+    "WR": "Pire Réalisation (Worst Realization)",
+    "MDD": "Drawdown Maximum",
+    "ADD": "Drawdown Moyen",
+    "CDaR": "Drawdown Conditionnel à Risque (CDaR)",
+    "UCI": "Indice Ulcer",
+    "EDaR": "Drawdown Entropic à Risque (EDaR)"
+}
+
+# Dictionnaire des 32 mesures de risque pour HRP et HERC
+HRP_HERC_RISK_MEASURES = {
+    # Mesures de Dispersion
+    "vol": "Écart-type (Standard Deviation)",
+    "variance": "Variance",
+    "kurt": "Racine Carrée de la Kurtosis",
+    "mad": "Écart Absolu Moyen (MAD)",
+    "gmd": "Différence Moyenne de Gini (GMD)",
+    "cvrg": "Plage CVaR (CVaR Range)",
+    "tgrg": "Plage Tail Gini (Tail Gini Range)",
+    "rg": "Plage (Range)",
+    
+    # Mesures de Risque à la Baisse
+    "semi": "Écart-type Semi (Semi Standard Deviation)",
+    "skurt": "Racine Carrée Semi-Kurtosis",
+    "flpm": "Premier Moment Partiel Inférieur (Omega Ratio)",
+    "slpm": "Second Moment Partiel Inférieur (Sortino Ratio)",
+    "var": "Valeur à Risque (VaR)",
+    "cvar": "Valeur à Risque Conditionnelle (CVaR)",
+    "evar": "Valeur à Risque Entropic (EVaR)",
+    "rlvar": "Valeur à Risque Relativiste (RLVaR)",
+    "tg": "Tail Gini",
+    "wr": "Pire Réalisation (Minimax)",
+    
+    # Mesures de Drawdown (rendements composés)
+    "mdd": "Drawdown Maximum (Calmar Ratio)",
+    "add": "Drawdown Moyen",
+    "uci": "Indice Ulcer",
+    "dar": "Drawdown à Risque (DaR)",
+    "cdar": "Drawdown Conditionnel à Risque (CDaR)",
+    "edar": "Drawdown Entropic à Risque (EDaR)",
+    "rdar": "Drawdown Relativiste à Risque (RDaR)",
+    
+    # Mesures de Drawdown (rendements non composés)
+    "mdd_rel": "Drawdown Maximum - Non Composé",
+    "add_rel": "Drawdown Moyen - Non Composé",
+    "uci_rel": "Indice Ulcer - Non Composé",
+    "dar_rel": "DaR - Non Composé",
+    "cdar_rel": "CDaR - Non Composé",
+    "edar_rel": "EDaR - Non Composé",
+    "rdar_rel": "RDaR - Non Composé"
+}
+
+# Dictionnaire de mapping des modèles vers les fonctions
+MODEL_FUNCTIONS = {
+    "Portefeuille de Rendement Maximum": optimize_max_return,
+    "Portefeuille de Risque Minimum": optimize_min_risk,
+    "Portefeuille de Sharpe Maximum": optimize_max_sharpe,
+    "Portefeuille d'Utilité Maximum": optimize_max_utility,
+    "Portefeuille de Parité de Risque": optimize_risk_parity,
+    "Portefeuille de Parité de Risque Relaxée": optimize_relaxed_risk_parity,
+    "Portefeuille Robuste - Rendement Maximum": optimize_robust_max_return,
+    "Portefeuille Robuste - Risque Minimum": optimize_robust_min_risk,
+    "Portefeuille Robuste - Sharpe Maximum": optimize_robust_max_sharpe,
+    "Portefeuille Robuste - Utilité Maximum": optimize_robust_max_utility,
+    "Hierarchical Risk Parity (HRP)": optimize_hrp,
+    "Hierarchical Equal Risk Contribution (HERC)": optimize_herc,
+    "Nested Clustered Optimization (NCO)": optimize_nco
+}
+
+# Modèles hiérarchiques (pas de frontière efficiente)
+HIERARCHICAL_MODELS = [
+    "Hierarchical Risk Parity (HRP)",
+    "Hierarchical Equal Risk Contribution (HERC)",
+    "Nested Clustered Optimization (NCO)"
+]
+
+# Modèles utilisant les ensembles d'incertitude bootstrap (models.uncertainty)
+ROBUST_MODELS = [
+    "Portefeuille Robuste - Rendement Maximum",
+    "Portefeuille Robuste - Risque Minimum",
+    "Portefeuille Robuste - Sharpe Maximum",
+    "Portefeuille Robuste - Utilité Maximum"
+]
+
+
+# Paramètres optionnels de run_model transmis aux fonctions d'optimisation
+_OPTIONAL_PARAMETERS = ['risk_aversion', 'uncertainty', 'uncertainty_set', 'bootstrap_method', 'linkage',
+                        'codependence']
+
+
+def get_model_function(model):
+    """Retourne la fonction d'optimisation d'un modèle (nom affiché dans l'application)"""
+    if model not in MODEL_FUNCTIONS:
+        raise ValueError(f"Modèle non reconnu: {model}")
+    return MODEL_FUNCTIONS[model]
+
+
+def risk_measures_for(model):
+    """Retourne le dictionnaire des mesures de risque acceptées par un modèle"""
+    if model in ["Hierarchical Risk Parity (HRP)", "Hierarchical Equal Risk Contribution (HERC)"]:
+        return HRP_HERC_RISK_MEASURES
+    return RISK_MEASURES_DICT
+
+
+def comparable_risk_measure(model, risk_measure):
+    """
+    Mesure de risque d'un modèle correspondant à une mesure choisie pour un autre modèle
+
+    Les modèles HRP et HERC ont leurs propres codes ('vol', 'cvar', ...) : la mesure est
+    rapprochée par son code Riskfolio-Lib (resolve_risk_measure) ; sans équivalent, la
+    mesure par défaut du modèle est retenue.
+
+    Returns:
+    --------
+    str : code accepté par le modèle (clé de risk_measures_for(model))
+    """
+    accepted = risk_measures_for(model)
+    if risk_measure in accepted:
+        return risk_measure
+    target = resolve_risk_measure(risk_measure)
+    for code in accepted:
+        if resolve_risk_measure(code) == target:
+            return code
+    return next(iter(accepted))
+
+
+def model_parameters(model):
+    """
+    Liste les paramètres optionnels de run_model réellement utilisés par un modèle
+
+    Déduite de la signature de la fonction d'optimisation : par exemple risk_aversion
+    pour les modèles d'utilité, uncertainty, uncertainty_set et bootstrap_method pour les
+    modèles robustes, linkage et codependence pour les modèles hiérarchiques. Sert à
+    construire des clés de cache qui ne changent pas lorsqu'un paramètre sans effet sur
+    le modèle est modifié.
+
+    Returns:
+    --------
+    list : noms des paramètres, dans l'ordre de run_model
+    """
+    accepted = inspect.signature(get_model_function(model)).parameters
+    return [name for name in _OPTIONAL_PARAMETERS if name in accepted]
+
+
+def _stored_result(stored, returns, model, rf):
+    """Reconstruit un OptimizationResult à partir d'une exécution enregistrée"""
+    start = time.perf_counter()
+    if model in HIERARCHICAL_MODELS:
+        port = _hc_portfolio(returns, rf)
+    else:
+        port = historical_portfolio(returns, rf)
+    weights = stored['weights'].reindex(returns.columns).fillna(0.0).to_frame('weights')
+    elapsed = time.perf_counter() - start
+    return OptimizationResult(
+        model=get_model_function(model).__name__,
+        weights=weights,
+        port=port,
+        returns=returns,
+        timings={'estimation': elapsed, 'optimization': 0.0, 'total': elapsed},
+        source='store'
+    )
+
+
+def run_model(returns, model, risk_measure, rf, risk_aversion=2.0, uncertainty=0.5,
+              uncertainty_set='box', bootstrap_method='stationary', linkage='ward', codependence='pearson',
+              store=None):
+    """
+    Optimise le portefeuille selon le modèle sélectionné
+
+    Parameters:
+    -----------
+    returns : pd.DataFrame
+        Matrice des rendements historiques
+    model : str
+        Nom du modèle (clé de MODEL_FUNCTIONS)
+    risk_measure : str
+        Mesure de risque à utiliser
+    rf : float
+        Taux sans risque par période des rendements (taux annuel / periods_per_year)
+    risk_aversion : float
+        Coefficient d'aversion au risque (modèles d'utilité)
+    uncertainty : float
+        Paramètre d'incertitude (modèles robustes)
+    uncertainty_set : str
+        Type d'ensemble d'incertitude ('box' ou 'ellip')
+    bootstrap_method : str
+        Méthode d'estimation des ensembles d'incertitude ('stationary' ou 'circular')
+    linkage : str
+        Méthode de linkage du clustering (modèles hiérarchiques)
+    codependence : str
+        Mesure de codépendance du clustering (modèles hiérarchiques)
+    store : runtime.store.RunStore ou None
+        Historique des exécutions : une demande identique (mêmes rendements, modèle,
+        mesure et paramètres utilisés) à une exécution réussie est servie sans
+        ré-optimiser ; chaque nouvelle exécution y est enregistrée
+
+    Returns:
+    --------
+    OptimizationResult : poids, portefeuille, statut, durées et erreur éventuelle
+    """
+    optimize_func = get_model_function(model)
+    values = {
+        'risk_aversion': risk_aversion,
+        'uncertainty': uncertainty,
+        'uncertainty_set': uncertainty_set,
+        'bootstrap_method': bootstrap_method,
+        'linkage': linkage,
+        'codependence': codependence
+    }
+
+    if store is not None:
+        returns_key = fingerprint(returns)
+        params = dict({name: values[name] for name in model_parameters(model)}, rf=rf)
+        with span('historique (lecture)') as record:
+            stored = store.lookup(returns_key, model, risk_measure, params)
+            if record is not None:
+                record.attrs['trouvé'] = stored is not None
+        if stored is not None:
+            return _stored_result(stored, returns, model, rf)
+
+    result = optimize_func(
+        returns=returns,
+        risk_measure=risk_measure,
+        rf=rf,
+        risk_aversion=risk_aversion,
+        uncertainty=uncertainty,
+        uncertainty_set=uncertainty_set,
+        bootstrap_method=bootstrap_method,
+        linkage=linkage,
+        codependence=codependence
+    )
+
+    if store is not None:
+        with span('historique (écriture)'):
+            metrics = None
+            if result.ok:
+                try:
+                    metrics = portfolio_summary(result.weights, result.port, risk_measure,
+                                                periods_per_year(returns.index))
+                except Exception:
+                    metrics = None
+            store.record(returns_key, model, risk_measure, params, result.status, weights=result.weights,
+                         metrics=metrics, timings=result.timings, error=result.error, n_obs=len(returns))
+
+    return result
@@ -0,0 +1,133 @@
+"""
+Résultat structuré d'une optimisation, indépendant de l'interface
+"""
+
+import time
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+from runtime.timing import span
+
+from .telemetry import collect_solver_telemetry, summarize_solves
+
+
+@dataclass
+class OptimizationResult:
+    """
+    Résultat d'un modèle d'optimisation
+
+    Reste compatible avec l'ancien retour (weights, portfolio_object, returns) :
+    `w, port, returns = optimize_...(...)` fonctionne toujours, avec w = None en cas
+    d'échec.
+
+    Attributes:
+    -----------
+    model : str
+        Nom de la fonction d'optimisation
+    weights : pd.DataFrame ou None
+        Poids optimaux (une colonne), None en cas d'échec
+    port : rp.Portfolio ou rp.HCPortfolio ou None
+        Objet portefeuille (moments estimés, paramètres du solveur)
+    returns : pd.DataFrame
+        Rendements utilisés
+    status : str
+        'optimal', 'infeasible' (le solveur n'a pas trouvé de solution) ou 'error'
+    error : str ou None
+        Message d'erreur
+    error_type : str ou None
+        Type de l'exception levée
+    timings : dict
+        Durées en secondes : 'estimation', 'optimization', 'total'
+    source : str
+        'solver' (optimisation effectuée) ou 'store' (poids relus dans l'historique)
+    telemetry : dict
+        Télémétrie des solveurs (voir telemetry.summarize_solves) : taille du problème,
+        cônes, durées de compilation et de résolution, itérations ; vide sans solveur
+    """
+    model: str
+    weights: pd.DataFrame = None
+    port: object = None
+    returns: pd.DataFrame = None
+    status: str = 'optimal'
+    error: str = None
+    error_type: str = None
+    timings: dict = field(default_factory=dict)
+    source: str = 'solver'
+    telemetry: dict = field(default_factory=dict)
+
+    @property
+    def ok(self):
+        """Vrai si l'optimisation a produit des poids"""
+        return self.status == 'optimal'
+
+    @property
+    def mu(self):
+        """Rendements espérés estimés (None si indisponibles)"""
+        return getattr(self.port, 'mu', None)
+
+    @property
+    def cov(self):
+        """Matrice de covariance estimée (None si indisponible)"""
+        return getattr(self.port, 'cov', None)
+
+    def __iter__(self):
+        return iter((self.weights, self.port, self.returns))
+
+
+def run_optimization(model, returns, estimate, solve):
+    """
+    Exécute les étapes d'estimation et d'optimisation d'un modèle et chronomètre chacune
+
+    Les deux étapes sont aussi enregistrées dans la chronologie active (runtime.timing),
+    et les problèmes cvxpy résolus pendant l'optimisation sont décrits dans `telemetry`.
+
+    Les exceptions ne sont pas propagées : elles sont décrites dans le résultat, à
+    charge de l'appelant (application, batch, worker) de les présenter.
+
+    Parameters:
+    -----------
+    model : str
+        Nom de la fonction d'optimisation
+    returns : pd.DataFrame
+        Matrice des rendements historiques
+    estimate : callable
+        estimate() -> objet portefeuille dont les moments sont estimés
+    solve : callable
+        solve(port) -> poids optimaux (None si le problème n'a pas de solution)
+
+    Returns:
+    --------
+    OptimizationResult
+    """
+    result = OptimizationResult(model=model, returns=returns)
+    start = step_start = time.perf_counter()
+    step = 'estimation'
+
+    try:
+        with span('estimation', model=model):
+            result.port = estimate()
+        result.timings['estimation'] = time.perf_counter() - step_start
+
+        step = 'optimization'
+        step_start = time.perf_counter()
+        with span('résolution', model=model), collect_solver_telemetry() as solves:
+            try:
+                w = solve(result.port)
+            finally:
+                result.telemetry = summarize_solves(solves)
+        result.timings['optimization'] = time.perf_counter() - step_start
+
+        if w is None or w.sum().sum() == 0:
+            result.status = 'infeasible'
+            result.error = f"{model} : le solveur n'a pas trouvé de solution avec ces paramètres."
+        else:
+            result.weights = w
+    except Exception as e:
+        result.timings[step] = time.perf_counter() - step_start
+        result.status = 'error'
+        result.error = f"Erreur dans {model}: {str(e)}"
+        result.error_type = type(e).__name__
+
+    result.timings['total'] = time.perf_counter() - start
+    return result
@@ -2,11 +2,43 @@
 Modèles d'optimisation robustes (Worst Case)
 """
 
-import riskfolio as rp
-import streamlit as st
+from .moments import historical_portfolio
+from .result import run_optimization
+from .uncertainty import (
+    UNCERTAINTY_JOBS,
+    apply_uncertainty_sets,
+    get_uncertainty_sets,
+    recenter_uncertainty_sets
+)
 
 
-def optimize_robust_max_return(returns, risk_measure, rf, uncertainty=0.5, **kwargs):
+def _robust_portfolio(returns, rf, uncertainty, uncertainty_set, bootstrap_method, uncertainty_sets=None):
+    """
+    Construit le portefeuille et lui affecte les ensembles d'incertitude mis en cache
+
+    Les ensembles sont estimés une seule fois par jeu de rendements et partagés par les
+    quatre modèles robustes ; seul epsilon (uncertainty) est appliqué à chaque appel.
+    Des ensembles déjà estimés sur un autre échantillon (uncertainty_sets) sont recentrés
+    sur les moments de returns au lieu d'être réestimés.
+    """
+    port = historical_portfolio(returns, rf)
+    
+    if uncertainty_sets is not None:
+        sets = recenter_uncertainty_sets(uncertainty_sets, returns)
+    else:
+        sets = get_uncertainty_sets(
+            returns,
+            method=bootstrap_method,
+            ellip_cov=(uncertainty_set == 'ellip'),
+            n_jobs=UNCERTAINTY_JOBS
+        )
+    apply_uncertainty_sets(port, sets, uncertainty)
+    
+    return port
+
+
+def optimize_robust_max_return(returns, risk_measure, rf, uncertainty=0.5,
+                               uncertainty_set='box', bootstrap_method='stationary', uncertainty_sets=None, **kwargs):
     """
     Optimise le portefeuille robuste pour maximiser le rendement (Worst Case)
     
@@ -15,39 +47,40 @@ def optimize_robust_max_return(returns, risk_measure, rf, uncertainty=0.5, **kwa
     returns : pd.DataFrame
         Matrice des rendements historiques
     risk_measure : str
-        Mesure de risque à utiliser
+        Mesure de risque à utiliser (le modèle Worst Case est de type moyenne-variance)
     rf : float
         Taux sans risque
     uncertainty : float
-        Paramètre d'incertitude epsilon
+        Paramètre d'incertitude epsilon (taille relative des ensembles, 0 à 1)
+    uncertainty_set : str
+        Type d'ensemble d'incertitude ('box' ou 'ellip')
+    bootstrap_method : str
+        Méthode d'estimation des ensembles ('stationary' ou 'circular')
+    uncertainty_sets : dict ou None
+        Ensembles déjà estimés (get_uncertainty_sets) sur un autre échantillon, recentrés
+        sur returns (intervalles bootstrap)
     
     Returns:
     --------
-    tuple : (weights, portfolio_object, returns)
+    OptimizationResult : poids, portefeuille, statut, durées et erreur éventuelle
     """
-    try:
-        port = rp.Portfolio(returns=returns)
-        port.assets_stats(method_mu='hist', method_cov='hist')
-        port.rf = rf
-        
-        w = port.wc_optimization(
-            model='Classic', 
-            rm=risk_measure, 
-            obj='MaxRet', 
-            rf=rf, 
-            l=0, 
-            Umu='box', 
-            Ucov='box', 
-            epsilon=uncertainty
+    return run_optimization(
+        'optimize_robust_max_return',
+        returns,
+        estimate=lambda: _robust_portfolio(returns, rf, uncertainty, uncertainty_set, bootstrap_method,
+                                           uncertainty_sets),
+        solve=lambda port: port.wc_optimization(
+            obj='MaxRet',
+            rf=rf,
+            l=0,
+            Umu=uncertainty_set,
+            Ucov=uncertainty_set
         )
-        
-        return w, port, returns
-    except Exception as e:
-        st.error(f"Erreur dans optimize_robust_max_return: {str(e)}")
-        return None, None, None
+    )
 
 
-def optimize_robust_min_risk(returns, risk_measure, rf, uncertainty=0.5, **kwargs):
+def optimize_robust_min_risk(returns, risk_measure, rf, uncertainty=0.5,
+                             uncertainty_set='box', bootstrap_method='stationary', uncertainty_sets=None, **kwargs):
     """
     Optimise le portefeuille robuste pour minimiser le risque (Worst Case)
     
@@ -56,39 +89,40 @@ def optimize_robust_min_risk(returns, risk_measure, rf, uncertainty=0.5, **kwarg
     returns : pd.DataFrame
         Matrice des rendements historiques
     risk_measure : str
-        Mesure de risque à utiliser
+        Mesure de risque à utiliser (le modèle Worst Case est de type moyenne-variance)
     rf : float
         Taux sans risque
     uncertainty : float
-        Paramètre d'incertitude epsilon
+        Paramètre d'incertitude epsilon (taille relative des ensembles, 0 à 1)
+    uncertainty_set : str
+        Type d'ensemble d'incertitude ('box' ou 'ellip')
+    bootstrap_method : str
+        Méthode d'estimation des ensembles ('stationary' ou 'circular')
+    uncertainty_sets : dict ou None
+        Ensembles déjà estimés (get_uncertainty_sets) sur un autre échantillon, recentrés
+        sur returns (intervalles bootstrap)
     
     Returns:
     --------
-    tuple : (weights, portfolio_object, returns)
+    OptimizationResult : poids, portefeuille, statut, durées et erreur éventuelle
     """
-    try:
-        port = rp.Portfolio(returns=returns)
-        port.assets_stats(method_mu='hist', method_cov='hist')
-        port.rf = rf
-        
-        w = port.wc_optimization(
-            model='Classic', 
-            rm=risk_measure, 
-            obj='MinRisk', 
-            rf=rf, 
-            l=0, 
-            Umu='box', 
-            Ucov='box', 
-            epsilon=uncertainty
+    return run_optimization(
+        'optimize_robust_min_risk',
+        returns,
+        estimate=lambda: _robust_portfolio(returns, rf, uncertainty, uncertainty_set, bootstrap_method,
+                                           uncertainty_sets),
+        solve=lambda port: port.wc_optimization(
+            obj='MinRisk',
+            rf=rf,
+            l=0,
+            Umu=uncertainty_set,
+            Ucov=uncertainty_set
         )
-        
-        return w, port, returns
-    except Exception as e:
-        st.error(f"Erreur dans optimize_robust_min_risk: {str(e)}")
-        return None, None, None
+    )
 
 
-def optimize_robust_max_sharpe(returns, risk_measure, rf, uncertainty=0.5, **kwargs):
+def optimize_robust_max_sharpe(returns, risk_measure, rf, uncertainty=0.5,
+                               uncertainty_set='box', bootstrap_method='stationary', uncertainty_sets=None, **kwargs):
     """
     Optimise le portefeuille robuste pour maximiser le ratio de Sharpe (Worst Case)
     
@@ -97,39 +131,40 @@ def optimize_robust_max_sharpe(returns, risk_measure, rf, uncertainty=0.5, **kwa
     returns : pd.DataFrame
         Matrice des rendements historiques
     risk_measure : str
-        Mesure de risque à utiliser
+        Mesure de risque à utiliser (le modèle Worst Case est de type moyenne-variance)
     rf : float
         Taux sans risque
     uncertainty : float
-        Paramètre d'incertitude epsilon
+        Paramètre d'incertitude epsilon (taille relative des ensembles, 0 à 1)
+    uncertainty_set : str
+        Type d'ensemble d'incertitude ('box' ou 'ellip')
+    bootstrap_method : str
+        Méthode d'estimation des ensembles ('stationary' ou 'circular')
+    uncertainty_sets : dict ou None
+        Ensembles déjà estimés (get_uncertainty_sets) sur un autre échantillon, recentrés
+        sur returns (intervalles bootstrap)
     
     Returns:
     --------
-    tuple : (weights, portfolio_object, returns)
+    OptimizationResult : poids, portefeuille, statut, durées et erreur éventuelle
     """
-    try:
-        port = rp.Portfolio(returns=returns)
-        port.assets_stats(method_mu='hist', method_cov='hist')
-        port.rf = rf
-        
-        w = port.wc_optimization(
-            model='Classic', 
-            rm=risk_measure, 
-            obj='Sharpe', 
-            rf=rf, 
-            l=0, 
-            Umu='box', 
-            Ucov='box', 
-            epsilon=uncertainty
+    return run_optimization(
+        'optimize_robust_max_sharpe',
+        returns,
+        estimate=lambda: _robust_portfolio(returns, rf, uncertainty, uncertainty_set, bootstrap_method,
+                                           uncertainty_sets),
+        solve=lambda port: port.wc_optimization(
+            obj='Sharpe',
+            rf=rf,
+            l=0,
+            Umu=uncertainty_set,
+            Ucov=uncertainty_set
         )
-        
-        return w, port, returns
-    except Exception as e:
-        st.error(f"Erreur dans optimize_robust_max_sharpe: {str(e)}")
-        return None, None, None
+    )
 
 
-def optimize_robust_max_utility(returns, risk_measure, rf, risk_aversion=2.0, uncertainty=0.5, **kwargs):
+def optimize_robust_max_utility(returns, risk_measure, rf, risk_aversion=2.0, uncertainty=0.5,
+                                uncertainty_set='box', bootstrap_method='stationary', uncertainty_sets=None, **kwargs):
     """
     Optimise le portefeuille robuste pour maximiser l'utilité (Worst Case)
     
@@ -138,35 +173,35 @@ def optimize_robust_max_utility(returns, risk_measure, rf, risk_aversion=2.0, un
     returns : pd.DataFrame
         Matrice des rendements historiques
     risk_measure : str
-        Mesure de risque à utiliser
+        Mesure de risque à utiliser (le modèle Worst Case est de type moyenne-variance)
     rf : float
         Taux sans risque
     risk_aversion : float
         Coefficient d'aversion au risque (lambda)
     uncertainty : float
-        Paramètre d'incertitude epsilon
+        Paramètre d'incertitude epsilon (taille relative des ensembles, 0 à 1)
+    uncertainty_set : str
+        Type d'ensemble d'incertitude ('box' ou 'ellip')
+    bootstrap_method : str
+        Méthode d'estimation des ensembles ('stationary' ou 'circular')
+    uncertainty_sets : dict ou None
+        Ensembles déjà estimés (get_uncertainty_sets) sur un autre échantillon, recentrés
+        sur returns (intervalles bootstrap)
     
     Returns:
     --------
-    tuple : (weights, portfolio_object, returns)
+    OptimizationResult : poids, portefeuille, statut, durées et erreur éventuelle
     """
-    try:
-        port = rp.Portfolio(returns=returns)
-        port.assets_stats(method_mu='hist', method_cov='hist')
-        port.rf = rf
-        
-        w = port.wc_optimization(
-            model='Classic', 
-            rm=risk_measure, 
-            obj='Utility', 
-            rf=rf, 
-            l=risk_aversion, 
-            Umu='box', 
-            Ucov='box', 
-            epsilon=uncertainty
+    return run_optimization(
+        'optimize_robust_max_utility',
+        returns,
+        estimate=lambda: _robust_portfolio(returns, rf, uncertainty, uncertainty_set, bootstrap_method,
+                                           uncertainty_sets),
+        solve=lambda port: port.wc_optimization(
+            obj='Utility',
+            rf=rf,
+            l=risk_aversion,
+            Umu=uncertainty_set,
+            Ucov=uncertainty_set
         )
-        
-        return w, port, returns
-    except Exception as e:
-        st.error(f"Erreur dans optimize_robust_max_utility: {str(e)}")
-        return None, None, None
+    )
@@ -0,0 +1,187 @@
+"""
+Estimation de la mémoire d'une optimisation avant son lancement et budget mémoire
+"""
+
+import math
+import os
+
+from .registry import HIERARCHICAL_MODELS
+
+
+# Budget mémoire d'une optimisation (modifiable par la variable d'environnement MEMORY_BUDGET_MB)
+DEFAULT_MEMORY_BUDGET = int(float(os.environ.get('MEMORY_BUDGET_MB', 2048)) * 2**20)
+
+# Fenêtre minimale conservée lorsqu'une demande est réduite (périodes, environ 6 mois de jours ouvrés)
+MIN_PERIODS = 126
+
+# Nombre minimal de points de la frontière efficiente après réduction
+MIN_FRONTIER_POINTS = 10
+
+# Part du budget au-delà de laquelle le nombre de points de la frontière est réduit :
+# la frontière résout un problème de même taille par point, sa durée croît avec la taille
+FRONTIER_SHARE = 0.25
+
+# Mémoire de l'interpréteur sollicitée par toute optimisation (octets) et marge de sécurité
+BASE_BYTES = 16 * 2**20
+SAFETY_FACTOR = 1.25
+
+# Pic de la frontière efficiente relatif à une optimisation seule (mesuré)
+FRONTIER_OVERHEAD = 1.15
+
+# Octets par cellule, calibrés sur le pic de mémoire résidente mesuré (benchmarks/optimizers.py) :
+# (par rendement T x N, par paire d'actifs N x N)
+_MEASURE_COSTS = {
+    # Covariance : problème SOC dont la taille ne dépend que de N
+    'MV': (48, 330),
+    # Un scénario par période : variables et contraintes linéaires T x N
+    'MAD': (280, 330),
+    'MSV': (280, 330),
+    'FLPM': (280, 330),
+    'SLPM': (280, 330),
+    'CVaR': (280, 330),
+    'WR': (280, 330),
+    # Cônes exponentiels et drawdowns : une variable auxiliaire de plus par période
+    'EVaR': (300, 330),
+    'MDD': (300, 330),
+    'ADD': (300, 330),
+    'CDaR': (300, 330),
+    'UCI': (300, 330),
+    'EDaR': (330, 330)
+}
+
+# Modèles dont l'empreinte ne dépend pas de la mesure de risque
+_RELAXED_RISK_PARITY = "Portefeuille de Parité de Risque Relaxée"
+_ROBUST_PREFIX = "Portefeuille Robuste"
+_NCO = "Nested Clustered Optimization (NCO)"
+
+# Rééchantillonnages bootstrap des ensembles d'incertitude (models.uncertainty)
+_UNCERTAINTY_SIMULATIONS = 3000
+
+
+def estimate_memory(n_assets, n_periods, model, risk_measure, uncertainty_set='box'):
+    """
+    Estime le pic de mémoire d'une optimisation à partir de sa taille
+
+    Les coefficients sont calibrés sur les mesures du benchmark des modèles : les mesures
+    à scénarios (CVaR, MAD, drawdowns, ...) croissent avec T x N, la variance avec N², les
+    modèles robustes avec les rééchantillonnages bootstrap des moments, et N⁴ pour
+    l'ellipse de la covariance (environ 3,4 Go pour 50 actifs).
+
+    Parameters:
+    -----------
+    n_assets : int
+        Nombre d'actifs (N)
+    n_periods : int
+        Nombre de périodes de rendements (T)
+    model : str
+        Nom du modèle (clé de MODEL_FUNCTIONS)
+    risk_measure : str
+        Mesure de risque
+    uncertainty_set : str
+        Type d'ensemble d'incertitude des modèles robustes ('box' ou 'ellip')
+
+    Returns:
+    --------
+    int : estimation du pic de mémoire au-delà de la mémoire initiale (octets), marge comprise
+    """
+    cells = n_assets * n_periods
+    pairs = n_assets ** 2
+    if model.startswith(_ROBUST_PREFIX):
+        size = 64 * 2**20 + 48 * cells + 6 * _UNCERTAINTY_SIMULATIONS * pairs
+        if uncertainty_set == 'ellip':
+            # Covariance N² x N² des erreurs, dense dans le problème conique
+            size += 8 * _UNCERTAINTY_SIMULATIONS * pairs + 540 * pairs ** 2
+    elif model == _RELAXED_RISK_PARITY:
+        size = 48 * cells + 1100 * pairs
+    elif model == _NCO:
+        # Un problème par cluster : une fraction du problème classique équivalent
+        per_cell, per_pair = _MEASURE_COSTS.get(risk_measure, _MEASURE_COSTS['CVaR'])
+        size = (per_cell // 4) * cells + per_pair * pairs
+    elif model in HIERARCHICAL_MODELS:
+        size = 16 * cells + 64 * pairs
+    else:
+        per_cell, per_pair = _MEASURE_COSTS.get(risk_measure, _MEASURE_COSTS['EDaR'])
+        size = per_cell * cells + per_pair * pairs
+    return int((BASE_BYTES + size) * SAFETY_FACTOR)
+
+
+def _max_periods(n_assets, n_periods, model, risk_measure, uncertainty_set, budget):
+    """Plus grande fenêtre (périodes) dont l'estimation tient dans le budget, 0 si aucune"""
+    fixed = estimate_memory(n_assets, 0, model, risk_measure, uncertainty_set)
+    per_period = (estimate_memory(n_assets, n_periods, model, risk_measure, uncertainty_set) - fixed) / n_periods
+    if fixed > budget:
+        return 0
+    if per_period <= 0:
+        return n_periods
+    return min(n_periods, int((budget - fixed) / per_period))
+
+
+def plan_run(n_assets, n_periods, model, risk_measure, budget=None, frontier_points=50,
+             uncertainty_set='box', min_periods=MIN_PERIODS):
+    """
+    Confronte une demande d'optimisation au budget mémoire avant son lancement
+
+    Si l'estimation (frontière comprise) dépasse le budget, la fenêtre est réduite aux
+    périodes les plus récentes, sans descendre sous min_periods ; si cela ne suffit pas,
+    la demande est refusée. Pour les problèmes volumineux (plus de FRONTIER_SHARE du
+    budget), le nombre de points de la frontière est réduit en proportion.
+
+    Parameters:
+    -----------
+    n_assets, n_periods : int
+        Taille des rendements (N actifs, T périodes)
+    model, risk_measure, uncertainty_set : str
+        Demande d'optimisation
+    budget : int ou None
+        Budget mémoire (octets), DEFAULT_MEMORY_BUDGET par défaut
+    frontier_points : int
+        Nombre de points demandé pour la frontière efficiente
+    min_periods : int
+        Fenêtre minimale acceptée lors d'une réduction
+
+    Returns:
+    --------
+    dict : {'action': 'run' | 'downgrade' | 'refuse', 'n_periods', 'frontier_points',
+            'estimate', 'budget', 'reasons'} ; estimate est l'estimation du plan retenu
+            (octets) et reasons la liste des explications à afficher
+    """
+    budget = budget or DEFAULT_MEMORY_BUDGET
+    with_frontier = model not in HIERARCHICAL_MODELS
+    overhead = FRONTIER_OVERHEAD if with_frontier else 1.0
+    requested = estimate_memory(n_assets, n_periods, model, risk_measure, uncertainty_set)
+    plan = {
+        'action': 'run',
+        'n_periods': n_periods,
+        'frontier_points': frontier_points if with_frontier else 0,
+        'estimate': int(requested * overhead),
+        'budget': budget,
+        'reasons': []
+    }
+
+    if plan['estimate'] > budget:
+        window = _max_periods(n_assets, n_periods, model, risk_measure, uncertainty_set, budget / overhead)
+        if window < min(min_periods, n_periods):
+            plan['action'] = 'refuse'
+            plan['reasons'].append(
+                f"Mémoire estimée {plan['estimate'] / 2**20:.0f} Mo pour un budget de {budget / 2**20:.0f} Mo "
+                f"({n_assets} actifs, {n_periods} périodes) : réduisez le nombre d'actifs ou la période, "
+                f"ou choisissez une mesure de risque moins coûteuse."
+            )
+            return plan
+        plan['action'] = 'downgrade'
+        plan['n_periods'] = window
+        plan['estimate'] = int(estimate_memory(n_assets, window, model, risk_measure, uncertainty_set) * overhead)
+        plan['reasons'].append(
+            f"Mémoire estimée {requested * overhead / 2**20:.0f} Mo pour un budget de {budget / 2**20:.0f} Mo : "
+            f"optimisation sur les {window} périodes les plus récentes (sur {n_periods})."
+        )
+
+    if with_frontier and plan['estimate'] > FRONTIER_SHARE * budget:
+        points = max(MIN_FRONTIER_POINTS, math.floor(frontier_points * FRONTIER_SHARE * budget / plan['estimate']))
+        if points < frontier_points:
+            plan['action'] = 'downgrade'
+            plan['frontier_points'] = points
+            plan['reasons'].append(
+                f"Problème volumineux : frontière efficiente calculée sur {points} points (au lieu de {frontier_points})."
+            )
+    return plan
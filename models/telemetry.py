@@ -0,0 +1,246 @@
+"""
+Télémétrie des solveurs : taille des problèmes coniques, compilation, résolution, itérations
+"""
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+import cvxpy as cp
+import numpy as np
+import pandas as pd
+
+
+_COLLECTOR = contextvars.ContextVar('solver_telemetry', default=None)
+_INSTALL_LOCK = threading.Lock()
+_ORIGINAL_SOLVE = None
+
+# Cônes du problème canonique (cvxpy ConeDims) : nom de l'attribut -> libellé
+_CONES = {
+    'zero': 'égalités',
+    'nonneg': 'inégalités',
+    'soc': 'SOC',
+    'exp': 'exponentiels',
+    'psd': 'PSD',
+    'p3d': 'puissance'
+}
+
+
+def _cone_counts(cone_dims):
+    counts = {}
+    for name in _CONES:
+        value = getattr(cone_dims, name, 0)
+        counts[name] = len(value) if isinstance(value, (list, tuple)) else int(value)
+    return counts
+
+
+def _describe(problem, solver, wall, error):
+    """Décrit une résolution cvxpy (taille, cônes, durées, itérations, statut)"""
+    record = {
+        'solver': solver,
+        'status': problem.status if error is None else 'error',
+        'error': error,
+        'wall': wall,
+        'compile_time': getattr(problem, 'compilation_time', None),
+        'solve_time': None,
+        'setup_time': None,
+        'iterations': None,
+        'variables': int(sum(v.size for v in problem.variables())),
+        'constraints': int(sum(c.size for c in problem.constraints)),
+        'canonical_variables': None,
+        'cones': None
+    }
+    stats = problem.solver_stats if error is None else None
+    if stats is not None:
+        record['solver'] = stats.solver_name or solver
+        record['solve_time'] = stats.solve_time
+        record['setup_time'] = stats.setup_time
+        record['iterations'] = stats.num_iters
+
+    # Problème canonique mis en cache par cvxpy lors de la compilation
+    program = getattr(getattr(problem, '_cache', None), 'param_prog', None)
+    if program is not None and hasattr(program, 'cone_dims'):
+        record['canonical_variables'] = int(program.x.size)
+        record['cones'] = _cone_counts(program.cone_dims)
+    return record
+
+
+def _instrumented_solve(self, *args, **kwargs):
+    records = _COLLECTOR.get()
+    if records is None:
+        return _ORIGINAL_SOLVE(self, *args, **kwargs)
+
+    solver = kwargs.get('solver')
+    start = time.perf_counter()
+    error = None
+    try:
+        return _ORIGINAL_SOLVE(self, *args, **kwargs)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        records.append(_describe(self, solver, time.perf_counter() - start, error))
+
+
+def install():
+    """
+    Instrumente cp.Problem.solve (une seule fois par processus)
+
+    Riskfolio construit et résout ses problèmes cvxpy en interne : l'instrumentation est
+    le seul point d'accès à leur taille et à leurs statistiques. Hors d'un bloc
+    collect_solver_telemetry(), l'appel est transmis tel quel.
+    """
+    global _ORIGINAL_SOLVE
+    with _INSTALL_LOCK:
+        if _ORIGINAL_SOLVE is None:
+            _ORIGINAL_SOLVE = cp.Problem.solve
+            cp.Problem.solve = _instrumented_solve
+
+
+@contextmanager
+def collect_solver_telemetry():
+    """
+    Collecte les résolutions cvxpy effectuées dans le bloc (thread et contexte courants)
+
+    Returns:
+    --------
+    list : une description par appel à Problem.solve (valeur du `with ... as`)
+    """
+    install()
+    records = []
+    token = _COLLECTOR.set(records)
+    try:
+        yield records
+    finally:
+        _COLLECTOR.reset(token)
+
+
+def summarize_solves(records):
+    """
+    Résume les résolutions d'une optimisation
+
+    Riskfolio essaie ses solveurs dans l'ordre jusqu'au premier succès ; NCO résout un
+    problème par cluster puis un problème entre clusters. Les durées et itérations sont
+    cumulées, la taille et les cônes sont ceux du plus grand problème.
+
+    Parameters:
+    -----------
+    records : list
+        Descriptions produites par collect_solver_telemetry()
+
+    Returns:
+    --------
+    dict : problems, attempts, failed_solvers, solver, status, variables, constraints,
+           canonical_variables, cones, compile_time, solve_time, iterations, solves
+           (vide si aucun problème cvxpy n'a été résolu, comme pour HRP et HERC)
+    """
+    if not records:
+        return {}
+
+    solved = [r for r in records if r['error'] is None]
+    largest = max(records, key=lambda r: (r['canonical_variables'] or 0, r['variables']))
+
+    def total(name):
+        values = [r[name] for r in records if r[name] is not None]
+        return float(np.sum(values)) if values else None
+
+    return {
+        'problems': len(solved),
+        'attempts': len(records),
+        'failed_solvers': [r['solver'] for r in records if r['error'] is not None],
+        'solver': ', '.join(dict.fromkeys(r['solver'] for r in solved if r['solver'])) or None,
+        'status': solved[-1]['status'] if solved else 'error',
+        'variables': largest['variables'],
+        'constraints': largest['constraints'],
+        'canonical_variables': largest['canonical_variables'],
+        'cones': largest['cones'],
+        'compile_time': total('compile_time'),
+        'solve_time': total('solve_time'),
+        'iterations': total('iterations'),
+        'solves': records
+    }
+
+
+def describe_telemetry(telemetry):
+    """
+    Présente la télémétrie d'une optimisation pour l'affichage
+
+    Returns:
+    --------
+    pd.Series : valeurs indexées par des libellés (vide si aucun solveur n'a été utilisé)
+    """
+    if not telemetry:
+        return pd.Series(dtype=object)
+    cones = telemetry.get('cones') or {}
+    return pd.Series({
+        'Solveur': telemetry.get('solver'),
+        'Statut': telemetry.get('status'),
+        'Problèmes résolus': telemetry.get('problems'),
+        'Tentatives': telemetry.get('attempts'),
+        'Solveurs en échec': ', '.join(telemetry.get('failed_solvers') or []) or '-',
+        'Variables': telemetry.get('variables'),
+        'Contraintes (scalaires)': telemetry.get('constraints'),
+        'Variables canoniques': telemetry.get('canonical_variables'),
+        'Cônes': ', '.join(f"{_CONES[name]} {count}" for name, count in cones.items() if count) or '-',
+        'Compilation (s)': telemetry.get('compile_time'),
+        'Résolution (s)': telemetry.get('solve_time'),
+        'Itérations': telemetry.get('iterations')
+    }, dtype=object)
+
+
+def telemetry_table(rows):
+    """
+    Agrège la télémétrie par modèle et mesure de risque
+
+    Parameters:
+    -----------
+    rows : iterable de dict
+        Chaque élément contient 'model', 'risk_measure' et la télémétrie d'une
+        optimisation (OptimizationResult.telemetry), éventuellement 'n_assets' et
+        'n_periods'
+
+    Returns:
+    --------
+    pd.DataFrame : indexé par (modèle, mesure) : nombre d'optimisations, tailles médianes
+                   et maximales, durées moyennes de compilation et de résolution, part de
+                   la compilation, itérations moyennes, solveurs et statuts rencontrés
+    """
+    flat = []
+    for row in rows:
+        cones = row.get('cones') or {}
+        flat.append(dict(
+            {key: row.get(key) for key in ['model', 'risk_measure', 'variables', 'constraints',
+                                           'canonical_variables', 'compile_time', 'solve_time',
+                                           'iterations', 'solver', 'status', 'attempts']},
+            **{f"cônes {label}": cones.get(name) for name, label in _CONES.items()}
+        ))
+    if not flat:
+        return pd.DataFrame()
+
+    frame = pd.DataFrame(flat)
+    numeric = ['variables', 'constraints', 'canonical_variables', 'compile_time', 'solve_time',
+               'iterations', 'attempts'] + [f"cônes {label}" for label in _CONES.values()]
+    frame[numeric] = frame[numeric].apply(pd.to_numeric, errors='coerce')
+
+    grouped = frame.groupby(['model', 'risk_measure'], sort=True)
+    table = pd.DataFrame({
+        'Optimisations': grouped.size(),
+        'Variables (médiane)': grouped['variables'].median(),
+        'Variables (max)': grouped['variables'].max(),
+        'Variables canoniques (max)': grouped['canonical_variables'].max(),
+        'Contraintes (max)': grouped['constraints'].max(),
+        'Compilation moyenne (s)': grouped['compile_time'].mean(),
+        'Résolution moyenne (s)': grouped['solve_time'].mean(),
+        'Itérations moyennes': grouped['iterations'].mean(),
+        'Tentatives moyennes': grouped['attempts'].mean()
+    })
+    table['Part de la compilation'] = table['Compilation moyenne (s)'] / (
+        table['Compilation moyenne (s)'] + table['Résolution moyenne (s)']
+    )
+    for label in _CONES.values():
+        table[f"Cônes {label} (max)"] = grouped[f"cônes {label}"].max()
+    table['Solveurs'] = grouped['solver'].agg(lambda s: ', '.join(sorted(set(s.dropna()))))
+    table['Statuts'] = grouped['status'].agg(lambda s: ', '.join(f"{k} ({v})" for k, v in s.value_counts().items()))
+    table.index.names = ['Modèle', 'Mesure de Risque']
+    return table
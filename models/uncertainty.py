@@ -0,0 +1,287 @@
+"""
+Ensembles d'incertitude (box et ellipsoïdaux) pour les modèles robustes (Worst Case)
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import riskfolio as rp
+
+from analytics.bootstrap import iter_bootstrap_moments
+from runtime.fingerprint import fingerprint
+
+
+# Cache LRU des ensembles d'incertitude, indexé par empreinte des rendements
+MAX_CACHED_SETS = 8
+_CACHE = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+# Processus de bootstrap démarrés par une estimation lancée depuis un modèle robuste
+# (tâche de l'application, worker du service) : jamais un par cœur
+UNCERTAINTY_JOBS = 2
+
+
+def estimate_uncertainty_sets(returns, method='stationary', q=0.05, n_sim=3000, window=3,
+                              ellip_cov=False, n_jobs=None, seed=0, threshold=1e-15):
+    """
+    Estime les ensembles d'incertitude de la moyenne et de la covariance par bootstrap
+
+    Mêmes définitions que `Portfolio.wc_stats` de Riskfolio-Lib : les bornes box sont les
+    percentiles q/2 et 1-q/2 des moments bootstrap, les ensembles ellipsoïdaux utilisent
+    la covariance des erreurs d'estimation et le percentile 1-q de la distance de
+    Mahalanobis. Les rééchantillonnages sont calculés en parallèle et réduits lot par
+    lot : seuls les moyennes (n_sim x N) et, pour les bornes box, les statistiques
+    d'ordre des queues de distribution sont conservées, jamais l'ensemble des
+    covariances bootstrap (n_sim x N(N+1)/2). L'ellipse de la covariance accumule la
+    covariance des erreurs au fil des lots, puis rejoue les mêmes rééchantillonnages
+    (même graine) pour le percentile des distances de Mahalanobis.
+
+    Parameters:
+    -----------
+    returns : pd.DataFrame
+        Matrice des rendements historiques
+    method : str
+        Méthode de bootstrap ('stationary' ou 'circular')
+    q : float
+        Niveau de signification des ensembles
+    n_sim : int
+        Nombre de rééchantillonnages
+    window : int
+        Longueur des blocs du bootstrap
+    ellip_cov : bool
+        Calculer l'ensemble ellipsoïdal de la covariance (matrice N² x N², coûteux)
+    n_jobs : int ou None
+        Nombre de workers (None = nombre de CPU)
+    seed : int
+        Graine du générateur aléatoire
+    threshold : float
+        Seuil de correction des matrices non semi-définies positives
+
+    Returns:
+    --------
+    dict : ensembles d'incertitude non mis à l'échelle (mu, cov, d_mu, cov_l, cov_u,
+           cov_mu, k_mu et, si ellip_cov, cov_sigma, k_sigma)
+    """
+    cols = returns.columns.tolist()
+    n_assets = len(cols)
+    mu = returns.mean().to_numpy()
+    cov = returns.cov().to_numpy()
+
+    def blocks():
+        return iter_bootstrap_moments(returns, n_sim=n_sim, window=window, kind=method,
+                                      n_jobs=n_jobs, seed=seed)
+
+    # Box : percentiles des moments bootstrap, les covariances étant réduites par lots
+    probs = (q / 2, 1 - q / 2)
+    means_parts = []
+    tails = None
+    for means_block, covs_block in blocks():
+        means_parts.append(means_block)
+        tails = _update_tails(tails, covs_block, n_sim, probs)
+    means = np.vstack(means_parts)
+    mu_l, mu_u = np.percentile(means, [probs[0] * 100, probs[1] * 100], axis=0)
+    cov_l_triu, cov_u_triu = _tail_percentiles(tails, n_sim, probs)
+    cov_l = pd.DataFrame(_from_triu(cov_l_triu, n_assets), index=cols, columns=cols)
+    cov_u = pd.DataFrame(_from_triu(cov_u_triu, n_assets), index=cols, columns=cols)
+    if rp.is_pos_def(cov_l) is False:
+        cov_l = rp.cov_fix(cov_l, method='clipped', threshold=threshold)
+    if rp.is_pos_def(cov_u) is False:
+        cov_u = rp.cov_fix(cov_u, method='clipped', threshold=threshold)
+
+    # Ellipse de la moyenne
+    errors_mu = means - mu
+    cov_mu = np.cov(errors_mu, rowvar=False).reshape(n_assets, n_assets)
+    k_mu = np.sqrt(np.percentile(_mahalanobis_sq(errors_mu, cov_mu), (1 - q) * 100))
+
+    sets = {
+        'mu': mu,
+        'cov': cov,
+        'd_mu': pd.DataFrame(((mu_u - mu_l) / 2).reshape(1, -1), index=[0], columns=cols),
+        'cov_l': cov_l,
+        'cov_u': cov_u,
+        'cov_mu': pd.DataFrame(cov_mu, index=cols, columns=cols),
+        'k_mu': k_mu,
+        'cov_sigma': None,
+        'k_sigma': None
+    }
+
+    # Ellipse de la covariance (vec(Sigma) en ordre Fortran, comme Riskfolio-Lib)
+    if ellip_cov:
+        vec_cov = cov.reshape(1, -1, order='F')
+        total = np.zeros(n_assets**2)
+        cross = np.zeros((n_assets**2, n_assets**2))
+        for _, covs_block in blocks():
+            errors = _vec_errors(covs_block, n_assets, vec_cov)
+            total += errors.sum(axis=0)
+            cross += errors.T @ errors
+        mean_error = total / n_sim
+        cov_sigma = (cross - n_sim * np.outer(mean_error, mean_error)) / (n_sim - 1)
+        cov_sigma = np.asarray(rp.cov_fix(cov_sigma, method='clipped', threshold=threshold))
+
+        # Seconde passe sur les mêmes rééchantillonnages : distances de Mahalanobis
+        precision = np.linalg.pinv(cov_sigma)
+        distances = np.concatenate([
+            np.einsum('ij,jk,ik->i', errors, precision, errors)
+            for errors in (_vec_errors(covs_block, n_assets, vec_cov) for _, covs_block in blocks())
+        ])
+        cols_2 = [i + '-' + j for i in cols for j in cols]
+        sets['cov_sigma'] = pd.DataFrame(cov_sigma, index=cols_2, columns=cols_2)
+        sets['k_sigma'] = np.sqrt(np.percentile(distances, (1 - q) * 100))
+
+    return sets
+
+
+def get_uncertainty_sets(returns, method='stationary', q=0.05, n_sim=3000, window=3,
+                         ellip_cov=False, n_jobs=None, seed=0):
+    """
+    Retourne les ensembles d'incertitude des rendements, depuis le cache si possible
+
+    Le cache est indexé par l'empreinte de contenu des rendements et les paramètres
+    d'estimation, mais pas par epsilon : balayer le paramètre d'incertitude ou changer
+    d'objectif robuste réutilise les mêmes ensembles.
+    """
+    key = (fingerprint(returns), method, q, n_sim, window, seed)
+
+    with _CACHE_LOCK:
+        sets = _CACHE.get(key)
+        if sets is not None and (sets['cov_sigma'] is not None or not ellip_cov):
+            _CACHE.move_to_end(key)
+            return sets
+
+    sets = estimate_uncertainty_sets(returns, method=method, q=q, n_sim=n_sim, window=window,
+                                     ellip_cov=ellip_cov, n_jobs=n_jobs, seed=seed)
+
+    with _CACHE_LOCK:
+        _CACHE[key] = sets
+        _CACHE.move_to_end(key)
+        while len(_CACHE) > MAX_CACHED_SETS:
+            _CACHE.popitem(last=False)
+
+    return sets
+
+
+def recenter_uncertainty_sets(sets, returns, threshold=1e-15):
+    """
+    Recentre des ensembles d'incertitude sur les moments d'un autre échantillon
+
+    Les largeurs (d_mu, écarts des bornes de covariance, cov_mu, cov_sigma, k_mu,
+    k_sigma) sont conservées, seuls les centres mu et cov sont ceux de returns : les
+    rééchantillonnages des intervalles bootstrap réutilisent ainsi les ensembles de
+    l'échantillon de base au lieu de relancer chacun un bootstrap de n_sim tirages.
+
+    Returns:
+    --------
+    dict : ensembles de même forme que ceux de get_uncertainty_sets
+    """
+    cols = sets['cov_l'].columns
+    mu = returns.mean().to_numpy()
+    cov = returns.cov().to_numpy()
+    shift = pd.DataFrame(cov - sets['cov'], index=cols, columns=cols)
+    cov_l = sets['cov_l'] + shift
+    cov_u = sets['cov_u'] + shift
+    if rp.is_pos_def(cov_l) is False:
+        cov_l = rp.cov_fix(cov_l, method='clipped', threshold=threshold)
+    if rp.is_pos_def(cov_u) is False:
+        cov_u = rp.cov_fix(cov_u, method='clipped', threshold=threshold)
+    return dict(sets, mu=mu, cov=cov, cov_l=cov_l, cov_u=cov_u)
+
+
+def clear_uncertainty_cache():
+    """Vide le cache des ensembles d'incertitude"""
+    with _CACHE_LOCK:
+        _CACHE.clear()
+
+
+def apply_uncertainty_sets(port, sets, epsilon=1.0):
+    """
+    Affecte au portefeuille les ensembles d'incertitude mis à l'échelle par epsilon
+
+    epsilon = 0 correspond aux moments estimés (aucune incertitude), epsilon = 1 aux
+    ensembles bootstrap complets au niveau q. Les bornes de covariance restent
+    semi-définies positives car combinaisons convexes de matrices qui le sont.
+
+    Parameters:
+    -----------
+    port : rp.Portfolio
+        Portefeuille dont les moments ont été estimés (assets_stats)
+    sets : dict
+        Ensembles retournés par get_uncertainty_sets
+    epsilon : float
+        Paramètre d'incertitude
+    """
+    cov = pd.DataFrame(sets['cov'], index=sets['cov_l'].index, columns=sets['cov_l'].columns)
+
+    port.d_mu = sets['d_mu'] * epsilon
+    port.cov_l = cov - epsilon * (cov - sets['cov_l'])
+    port.cov_u = cov + epsilon * (sets['cov_u'] - cov)
+    port.cov_mu = sets['cov_mu']
+    port.k_mu = epsilon * sets['k_mu']
+
+    if sets['cov_sigma'] is not None:
+        port.cov_sigma = sets['cov_sigma']
+        port.k_sigma = epsilon * sets['k_sigma']
+    else:
+        # Non utilisés par wc_optimization avec Ucov='box'
+        port.cov_sigma = pd.DataFrame()
+        port.k_sigma = 0.0
+
+
+def _from_triu(values, n_assets):
+    """Reconstruit une matrice symétrique à partir de son triangle supérieur"""
+    matrix = np.zeros((n_assets, n_assets))
+    matrix[np.triu_indices(n_assets)] = values
+    return matrix + np.triu(matrix, 1).T
+
+
+def _tail_ranks(n, probs):
+    """Statistiques d'ordre encadrant chaque percentile (interpolation linéaire de np.percentile)"""
+    positions = [p * (n - 1) for p in probs]
+    return [(int(np.floor(pos)), pos - np.floor(pos)) for pos in positions]
+
+
+def _update_tails(tails, block, n, probs):
+    """
+    Ajoute un lot aux plus petites et plus grandes valeurs de chaque colonne
+
+    Seules les statistiques d'ordre nécessaires aux percentiles probs (inférieur, puis
+    supérieur) sont conservées : environ q/2 x n lignes de chaque côté.
+    """
+    (low_rank, _), (high_rank, _) = _tail_ranks(n, probs)
+    n_low = min(low_rank + 2, n)
+    n_high = min(n - high_rank, n)
+    low = block if tails is None else np.vstack([tails[0], block])
+    high = block if tails is None else np.vstack([tails[1], block])
+    if len(low) > n_low:
+        low = np.partition(low, n_low - 1, axis=0)[:n_low]
+    if len(high) > n_high:
+        high = np.partition(high, len(high) - n_high, axis=0)[-n_high:]
+    return low, high
+
+
+def _tail_percentiles(tails, n, probs):
+    """Percentiles inférieur et supérieur (identiques à np.percentile) à partir des queues"""
+    (low_rank, low_frac), (high_rank, high_frac) = _tail_ranks(n, probs)
+    low = np.sort(tails[0], axis=0)
+    high = np.sort(tails[1], axis=0)
+    # Rang r parmi les n valeurs -> ligne r - (n - len(high)) des plus grandes valeurs
+    offset = n - len(high)
+    lower = low[low_rank] + low_frac * (low[min(low_rank + 1, n - 1)] - low[low_rank])
+    upper = high[high_rank - offset] + high_frac * (high[min(high_rank + 1, n - 1) - offset] - high[high_rank - offset])
+    return lower, upper
+
+
+def _vec_errors(covs_triu, n_assets, vec_cov):
+    """Erreurs vec(Sigma_b) - vec(Sigma) d'un lot de covariances (ordre Fortran)"""
+    full = np.zeros((len(covs_triu), n_assets, n_assets))
+    rows, cols = np.triu_indices(n_assets)
+    full[:, rows, cols] = covs_triu
+    full[:, cols, rows] = covs_triu
+    return full.reshape(len(covs_triu), -1, order='F') - vec_cov
+
+
+def _mahalanobis_sq(errors, cov):
+    """Distances de Mahalanobis au carré de chaque ligne de `errors`"""
+    solved = np.linalg.lstsq(cov, errors.T, rcond=None)[0]
+    return np.einsum('ij,ji->i', errors, solved)
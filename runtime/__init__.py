@@ -0,0 +1,99 @@
+"""
+Package d'infrastructure d'exécution (empreintes, caches des étapes et des figures, magasin
+des cours, tâches, historique, chronométrage, mémoire, imports différés)
+"""
+
+from .cache import (
+    MAX_CACHE_BYTES,
+    cached_stage,
+    clear_stage_cache,
+    estimate_size,
+    set_cache_limit,
+    stage_cache_info,
+    stage_key
+)
+from .figure_cache import (
+    MAX_FIGURE_CACHE_BYTES,
+    cached_figure,
+    clear_figure_cache,
+    figure_cache_info,
+    set_figure_cache_limit
+)
+from .fingerprint import fingerprint
+from .jobs import (
+    FINAL_STATUSES,
+    JOB_QUEUES,
+    JOB_STATUSES,
+    MAX_TASK_PROCESSES,
+    Job,
+    JobCancelled,
+    JobQueue,
+    get_job_queue
+)
+from .memory import MemoryTracker, rss_bytes
+from .price_store import MAX_PRICE_STORE_BYTES, PriceStore, get_price_store
+from .lazy import HEAVY_MODULES, LazyModule, lazy_import, start_warm_up, warm_up_status
+from .store import DEFAULT_STORE_PATH, RunStore, get_run_store
+from .timing import (
+    DEFAULT_TIMINGS_PATH,
+    MAX_TIMINGS_BYTES,
+    Span,
+    Timeline,
+    current_timeline,
+    read_timings,
+    span,
+    write_timeline
+)
+
+__all__ = [
+    'fingerprint',
+    # Stage cache
+    'MAX_CACHE_BYTES',
+    'cached_stage',
+    'clear_stage_cache',
+    'estimate_size',
+    'set_cache_limit',
+    'stage_cache_info',
+    'stage_key',
+    # Figure cache
+    'MAX_FIGURE_CACHE_BYTES',
+    'cached_figure',
+    'clear_figure_cache',
+    'figure_cache_info',
+    'set_figure_cache_limit',
+    # Background jobs
+    'FINAL_STATUSES',
+    'JOB_QUEUES',
+    'JOB_STATUSES',
+    'MAX_TASK_PROCESSES',
+    'Job',
+    'JobCancelled',
+    'JobQueue',
+    'get_job_queue',
+    # Price store
+    'MAX_PRICE_STORE_BYTES',
+    'PriceStore',
+    'get_price_store',
+    # Run store
+    'DEFAULT_STORE_PATH',
+    'RunStore',
+    'get_run_store',
+    # Timing
+    'DEFAULT_TIMINGS_PATH',
+    'MAX_TIMINGS_BYTES',
+    'Span',
+    'Timeline',
+    'current_timeline',
+    'read_timings',
+    'span',
+    'write_timeline',
+    # Memory
+    'MemoryTracker',
+    'rss_bytes',
+    # Lazy imports
+    'HEAVY_MODULES',
+    'LazyModule',
+    'lazy_import',
+    'start_warm_up',
+    'warm_up_status'
+]
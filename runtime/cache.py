@@ -0,0 +1,180 @@
+"""
+Cache des étapes de calcul de l'application, organisé en graphe de dépendances
+
+Chaque étape (rendements, statistiques, corrélation, optimisation, ...) est identifiée
+par une clé qui combine son nom, les clés des étapes dont elle dépend, l'empreinte de
+ses données d'entrée brutes et ses paramètres. Modifier un paramètre ne change donc que
+la clé des étapes qui l'utilisent et de leurs descendantes : les autres restent en cache.
+
+Le cache est partagé par les sessions d'un même processus et borné en mémoire (octets
+estimés), les entrées les moins récemment utilisées étant évincées en premier.
+"""
+
+import pickle
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .fingerprint import fingerprint
+from .timing import span
+
+
+# Taille maximale du cache des étapes (octets estimés)
+MAX_CACHE_BYTES = 512 * 1024 ** 2
+
+_CACHE = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+_STATE = {'bytes': 0, 'max_bytes': MAX_CACHE_BYTES, 'hits': 0, 'misses': 0, 'evictions': 0}
+
+
+def estimate_size(obj):
+    """
+    Estime l'occupation mémoire d'un résultat d'étape, en octets
+
+    Les DataFrames, Series et tableaux NumPy sont mesurés exactement ; les conteneurs
+    sont parcourus ; les autres objets (figures, portefeuilles) sont mesurés par leur
+    taille sérialisée.
+    """
+    if obj is None:
+        return 0
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return int(np.sum(obj.memory_usage(deep=True)))
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(estimate_size(k) + estimate_size(v) for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return sys.getsizeof(obj) + sum(estimate_size(item) for item in obj)
+    if isinstance(obj, (str, bytes, int, float, bool)):
+        return sys.getsizeof(obj)
+    if hasattr(obj, '__dataclass_fields__'):
+        return sys.getsizeof(obj) + estimate_size(
+            {name: getattr(obj, name) for name in obj.__dataclass_fields__}
+        )
+    try:
+        return len(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(obj)
+
+
+def stage_key(name, deps=(), data=(), params=None):
+    """
+    Calcule la clé d'une étape
+
+    Parameters:
+    -----------
+    name : str
+        Nom de l'étape
+    deps : sequence de str
+        Clés des étapes amont (leur contenu n'est pas ré-haché)
+    data : sequence
+        Données brutes dont l'étape dépend directement (DataFrames, octets, ...)
+    params : dict ou None
+        Paramètres utilisés par l'étape (et seulement ceux-là)
+
+    Returns:
+    --------
+    str : clé hexadécimale
+    """
+    return f"{name}:{fingerprint(name, list(deps), list(data), params or {})}"
+
+
+def _evict():
+    while _CACHE and _STATE['bytes'] > _STATE['max_bytes']:
+        _, (_, size) = _CACHE.popitem(last=False)
+        _STATE['bytes'] -= size
+        _STATE['evictions'] += 1
+
+
+def cached_stage(name, compute, deps=(), data=(), params=None, cache_none=False):
+    """
+    Retourne le résultat d'une étape depuis le cache, ou le calcule et le met en cache
+
+    L'étape est chronométrée dans la chronologie active (runtime.timing), avec
+    l'attribut cache='hit' ou 'miss'.
+
+    Parameters:
+    -----------
+    name : str
+        Nom de l'étape
+    compute : callable
+        compute() -> résultat de l'étape
+    deps : sequence de str
+        Clés des étapes amont
+    data : sequence
+        Données brutes de l'étape
+    params : dict ou None
+        Paramètres de l'étape
+    cache_none : bool
+        Mettre en cache un résultat None (par défaut non : un échec est recalculé, ce qui
+        permet à l'application d'afficher à nouveau l'erreur)
+
+    Returns:
+    --------
+    tuple : (résultat, clé de l'étape) ; la clé sert de dépendance aux étapes aval
+    """
+    with span(name) as record:
+        key = stage_key(name, deps, data, params)
+
+        with _CACHE_LOCK:
+            entry = _CACHE.get(key)
+            if entry is not None:
+                _CACHE.move_to_end(key)
+                _STATE['hits'] += 1
+            else:
+                _STATE['misses'] += 1
+        if entry is not None:
+            if record is not None:
+                record.attrs['cache'] = 'hit'
+            return entry[0], key
+        if record is not None:
+            record.attrs['cache'] = 'miss'
+
+        value = compute()
+    if value is None and not cache_none:
+        return value, key
+
+    size = estimate_size(value)
+    with _CACHE_LOCK:
+        if size <= _STATE['max_bytes']:
+            if key in _CACHE:
+                _STATE['bytes'] -= _CACHE[key][1]
+            _CACHE[key] = (value, size)
+            _CACHE.move_to_end(key)
+            _STATE['bytes'] += size
+            _evict()
+    return value, key
+
+
+def set_cache_limit(max_bytes):
+    """Modifie la taille maximale du cache (octets) et évince si nécessaire"""
+    with _CACHE_LOCK:
+        _STATE['max_bytes'] = int(max_bytes)
+        _evict()
+
+
+def clear_stage_cache():
+    """Vide le cache des étapes"""
+    with _CACHE_LOCK:
+        _CACHE.clear()
+        _STATE['bytes'] = 0
+
+
+def stage_cache_info():
+    """
+    Retourne l'état du cache
+
+    Returns:
+    --------
+    dict : {'entries', 'bytes', 'max_bytes', 'hits', 'misses', 'evictions', 'stages'}
+        'stages' compte les entrées par nom d'étape
+    """
+    with _CACHE_LOCK:
+        stages = {}
+        for key in _CACHE:
+            stage = key.split(':', 1)[0]
+            stages[stage] = stages.get(stage, 0) + 1
+        return dict(_STATE, entries=len(_CACHE), stages=stages)
@@ -0,0 +1,154 @@
+"""
+Cache des figures Plotly sérialisées, partagé par les réexécutions et les sessions
+
+Chaque figure est identifiée comme une étape (runtime.cache.stage_key) : son nom, les
+clés des étapes qui l'alimentent, l'empreinte de ses données et ses paramètres. Le JSON
+de la figure est conservé compressé (zlib) dans un cache LRU borné en octets
+compressés ; une figure inchangée n'est ni reconstruite ni revalidée par Plotly.
+"""
+
+import json
+import threading
+import zlib
+from collections import OrderedDict
+
+from .cache import stage_key
+from .timing import span
+
+
+# Taille maximale du cache des figures (octets compressés)
+MAX_FIGURE_CACHE_BYTES = 64 * 1024 ** 2
+
+# Niveau de compression zlib : le niveau 1 divise la taille par deux en quatre fois
+# moins de temps que le niveau par défaut
+COMPRESSION_LEVEL = 1
+
+_FIGURES = OrderedDict()
+_FIGURE_LOCK = threading.Lock()
+_FIGURE_STATE = {'bytes': 0, 'raw_bytes': 0, 'max_bytes': MAX_FIGURE_CACHE_BYTES, 'hits': 0, 'misses': 0,
+                 'evictions': 0}
+_SERIALIZED_FIGURE = []
+
+
+def _serialized_figure(spec):
+    """
+    Enveloppe un dictionnaire de figure déjà sérialisée dans une go.Figure
+
+    st.plotly_chart revalide les dictionnaires (reconstruction complète de la figure,
+    plus coûteuse que sa construction initiale) mais se contente de to_dict() pour une
+    go.Figure : la sous-classe renvoie directement le dictionnaire relu du cache.
+    """
+    if not _SERIALIZED_FIGURE:
+        import plotly.graph_objects as go
+
+        class SerializedFigure(go.Figure):
+            """Figure relue du cache, transmise telle quelle à Streamlit"""
+
+            def __init__(self, spec):
+                super().__init__()
+                self._spec = spec
+
+            def to_dict(self):
+                return self._spec
+
+            def to_plotly_json(self):
+                return self._spec
+
+        _SERIALIZED_FIGURE.append(SerializedFigure)
+    return _SERIALIZED_FIGURE[0](spec)
+
+
+def _evict():
+    while _FIGURES and _FIGURE_STATE['bytes'] > _FIGURE_STATE['max_bytes']:
+        _, (payload, raw_size) = _FIGURES.popitem(last=False)
+        _FIGURE_STATE['bytes'] -= len(payload)
+        _FIGURE_STATE['raw_bytes'] -= raw_size
+        _FIGURE_STATE['evictions'] += 1
+
+
+def cached_figure(name, build, deps=(), data=(), params=None):
+    """
+    Retourne une figure depuis le cache des figures, ou la construit et l'y ajoute
+
+    La construction est chronométrée dans l'étape « graphique : name » de la chronologie
+    active, avec l'attribut cache='hit' ou 'miss'.
+
+    Parameters:
+    -----------
+    name : str
+        Nom de la figure
+    build : callable
+        build() -> go.Figure ou None (une figure None n'est pas mise en cache)
+    deps : sequence de str
+        Clés des étapes dont la figure dépend
+    data : sequence
+        Données brutes dont la figure dépend directement
+    params : dict ou None
+        Paramètres de la figure
+
+    Returns:
+    --------
+    tuple : (figure, clé) ; en cas de succès du cache, la figure est une go.Figure dont
+            to_dict() renvoie le dictionnaire sérialisé
+    """
+    import plotly.io as pio
+
+    with span(f"graphique : {name}") as record:
+        key = stage_key(name, deps, data, params)
+        with _FIGURE_LOCK:
+            entry = _FIGURES.get(key)
+            if entry is not None:
+                _FIGURES.move_to_end(key)
+                _FIGURE_STATE['hits'] += 1
+            else:
+                _FIGURE_STATE['misses'] += 1
+        if record is not None:
+            record.attrs['cache'] = 'hit' if entry is not None else 'miss'
+        if entry is not None:
+            return _serialized_figure(json.loads(zlib.decompress(entry[0]))), key
+
+        fig = build()
+        if fig is None:
+            return None, key
+        raw = pio.to_json(fig, validate=False).encode('utf-8')
+        payload = zlib.compress(raw, COMPRESSION_LEVEL)
+
+    with _FIGURE_LOCK:
+        if len(payload) <= _FIGURE_STATE['max_bytes']:
+            if key in _FIGURES:
+                _FIGURE_STATE['bytes'] -= len(_FIGURES[key][0])
+                _FIGURE_STATE['raw_bytes'] -= _FIGURES[key][1]
+            _FIGURES[key] = (payload, len(raw))
+            _FIGURES.move_to_end(key)
+            _FIGURE_STATE['bytes'] += len(payload)
+            _FIGURE_STATE['raw_bytes'] += len(raw)
+            _evict()
+    return fig, key
+
+
+def set_figure_cache_limit(max_bytes):
+    """Modifie la taille maximale du cache des figures (octets compressés) et évince si nécessaire"""
+    with _FIGURE_LOCK:
+        _FIGURE_STATE['max_bytes'] = int(max_bytes)
+        _evict()
+
+
+def clear_figure_cache():
+    """Vide le cache des figures"""
+    with _FIGURE_LOCK:
+        _FIGURES.clear()
+        _FIGURE_STATE['bytes'] = 0
+        _FIGURE_STATE['raw_bytes'] = 0
+
+
+def figure_cache_info():
+    """
+    Retourne l'état du cache des figures
+
+    Returns:
+    --------
+    dict : {'entries', 'bytes', 'raw_bytes', 'max_bytes', 'hits', 'misses', 'evictions'}
+        bytes est la taille compressée, raw_bytes celle du JSON des figures en cache
+    """
+    with _FIGURE_LOCK:
+        return dict(_FIGURE_STATE, entries=len(_FIGURES))
@@ -0,0 +1,61 @@
+"""
+Empreintes de contenu des données d'entrée
+"""
+
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+
+def _update(digest, obj):
+    """Ajoute le contenu d'un objet à l'empreinte en cours"""
+    if isinstance(obj, pd.DataFrame):
+        digest.update(b'DataFrame')
+        digest.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+        _update(digest, list(map(str, obj.columns)))
+    elif isinstance(obj, pd.Series):
+        digest.update(b'Series')
+        digest.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+        _update(digest, str(obj.name))
+    elif isinstance(obj, np.ndarray):
+        digest.update(b'ndarray')
+        digest.update(str((obj.dtype, obj.shape)).encode())
+        digest.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, (bytes, bytearray, memoryview)):
+        digest.update(b'bytes')
+        digest.update(obj)
+    elif isinstance(obj, dict):
+        digest.update(b'dict')
+        for key in sorted(obj, key=str):
+            _update(digest, key)
+            _update(digest, obj[key])
+    elif isinstance(obj, (list, tuple)):
+        digest.update(type(obj).__name__.encode())
+        for item in obj:
+            _update(digest, item)
+    else:
+        digest.update(repr(obj).encode())
+    digest.update(b'|')
+
+
+def fingerprint(*objects):
+    """
+    Calcule une empreinte de contenu (hexadécimale) d'un ensemble d'objets
+
+    Deux DataFrames de même contenu (valeurs, index et colonnes) ont la même empreinte,
+    quel que soit leur identité en mémoire.
+
+    Parameters:
+    -----------
+    *objects :
+        DataFrames, Series, tableaux NumPy, octets, dictionnaires, listes ou scalaires
+
+    Returns:
+    --------
+    str : empreinte hexadécimale de 32 caractères
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for obj in objects:
+        _update(digest, obj)
+    return digest.hexdigest()
@@ -0,0 +1,239 @@
+"""
+File de tâches d'arrière-plan avec progression et annulation coopérative
+"""
+
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+
+# Nombre de tâches exécutées simultanément par le pool partagé
+MAX_JOB_WORKERS = 2
+
+# Pool séparé des comparaisons (une tâche par modèle comparé) : elles s'y succèdent sans
+# occuper les workers des optimisations interactives des autres sessions
+MAX_COMPARISON_WORKERS = 1
+
+# Nombre maximal de processus de calcul qu'une tâche peut démarrer (intervalles bootstrap,
+# ensembles d'incertitude) : un pool par cœur et par tâche saturerait le serveur
+MAX_TASK_PROCESSES = 2
+
+# Nombre de tâches terminées conservées (les plus anciennes sont oubliées)
+MAX_FINISHED_JOBS = 50
+
+JOB_STATUSES = ['pending', 'running', 'done', 'failed', 'cancelled']
+FINAL_STATUSES = ['done', 'failed', 'cancelled']
+
+# Files de tâches du processus et nombre de workers de chacune
+JOB_QUEUES = {
+    'optimisation': MAX_JOB_WORKERS,
+    'comparaison': MAX_COMPARISON_WORKERS
+}
+
+_QUEUE_LOCK = threading.Lock()
+_QUEUES = {}
+
+
+class JobCancelled(Exception):
+    """Levée dans une tâche dont l'annulation a été demandée"""
+
+
+@dataclass
+class Job:
+    """
+    Tâche soumise à une JobQueue
+
+    La fonction de la tâche reçoit l'objet Job en premier argument : elle publie sa
+    progression avec `job.report(...)`, qui lève JobCancelled si l'annulation a été
+    demandée (annulation coopérative, vérifiée entre deux étapes de calcul).
+
+    Attributes:
+    -----------
+    id : int
+        Identifiant unique dans le processus
+    name : str
+        Libellé de la tâche
+    status : str
+        'pending', 'running', 'done', 'failed' ou 'cancelled'
+    progress : float
+        Avancement entre 0 et 1
+    message : str
+        Étape en cours
+    result :
+        Valeur retournée par la fonction (status == 'done')
+    error : str ou None
+        Message de l'exception (status == 'failed')
+    error_type : str ou None
+        Type de l'exception
+    timings : dict
+        Instants 'submitted', 'started', 'finished' (time.time())
+    """
+    id: int
+    name: str
+    status: str = 'pending'
+    progress: float = 0.0
+    message: str = ''
+    result: object = None
+    error: str = None
+    error_type: str = None
+    timings: dict = field(default_factory=dict)
+    _cancel: threading.Event = field(default_factory=threading.Event, repr=False)
+    _future: object = field(default=None, repr=False)
+
+    @property
+    def done(self):
+        """Vrai si la tâche est terminée (succès, échec ou annulation)"""
+        return self.status in FINAL_STATUSES
+
+    @property
+    def cancel_requested(self):
+        """Vrai si l'annulation a été demandée"""
+        return self._cancel.is_set()
+
+    @property
+    def elapsed(self):
+        """Durée d'exécution en secondes (en cours ou totale)"""
+        started = self.timings.get('started')
+        if started is None:
+            return 0.0
+        return self.timings.get('finished', time.time()) - started
+
+    def check_cancelled(self):
+        """Lève JobCancelled si l'annulation a été demandée"""
+        if self._cancel.is_set():
+            raise JobCancelled(self.name)
+
+    def report(self, progress=None, message=None):
+        """
+        Publie l'avancement de la tâche et vérifie l'annulation
+
+        Parameters:
+        -----------
+        progress : float ou None
+            Avancement entre 0 et 1 (None = inchangé)
+        message : str ou None
+            Étape en cours (None = inchangée)
+        """
+        if progress is not None:
+            self.progress = min(max(float(progress), 0.0), 1.0)
+        if message is not None:
+            self.message = message
+        self.check_cancelled()
+
+    def cancel(self):
+        """Demande l'annulation ; une tâche en attente est annulée immédiatement"""
+        self._cancel.set()
+        if self._future is not None and self._future.cancel():
+            self._finish('cancelled')
+
+    def _finish(self, status):
+        self.status = status
+        self.timings['finished'] = time.time()
+
+
+class JobQueue:
+    """
+    File de tâches exécutées par un pool de threads
+
+    Les threads permettent aux tâches de partager sans copie les données de l'application
+    (rendements, cache des étapes) ; les solveurs et NumPy libèrent le GIL pendant les
+    calculs lourds.
+
+    Parameters:
+    -----------
+    max_workers : int
+        Nombre de tâches exécutées simultanément
+    max_finished : int
+        Nombre de tâches terminées conservées
+    """
+
+    def __init__(self, max_workers=MAX_JOB_WORKERS, max_finished=MAX_FINISHED_JOBS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self._jobs = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.max_finished = max_finished
+
+    def submit(self, func, *args, name=None, **kwargs):
+        """
+        Soumet une tâche func(job, *args, **kwargs)
+
+        Returns:
+        --------
+        Job : tâche en attente d'exécution
+        """
+        with self._lock:
+            job = Job(id=next(self._ids), name=name or getattr(func, '__name__', 'tâche'))
+            job.timings['submitted'] = time.time()
+            self._jobs[job.id] = job
+            self._prune()
+        job._future = self._executor.submit(self._run, job, func, args, kwargs)
+        return job
+
+    def _run(self, job, func, args, kwargs):
+        if job.cancel_requested:
+            job._finish('cancelled')
+            return
+        job.status = 'running'
+        job.timings['started'] = time.time()
+        try:
+            job.result = func(job, *args, **kwargs)
+            job.progress = 1.0
+            job._finish('done')
+        except JobCancelled:
+            job._finish('cancelled')
+        except Exception as e:
+            job.error = str(e)
+            job.error_type = type(e).__name__
+            job._finish('failed')
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[:max(len(finished) - self.max_finished, 0)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id):
+        """Retourne une tâche par son identifiant (None si inconnue ou oubliée)"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """Demande l'annulation d'une tâche ; retourne False si elle est inconnue"""
+        job = self.get(job_id)
+        if job is None:
+            return False
+        job.cancel()
+        return True
+
+    def jobs(self):
+        """Liste les tâches connues, des plus anciennes aux plus récentes"""
+        with self._lock:
+            return list(self._jobs.values())
+
+    def shutdown(self, cancel=True):
+        """Arrête le pool, en annulant les tâches non terminées si cancel est vrai"""
+        if cancel:
+            for job in self.jobs():
+                if not job.done:
+                    job.cancel()
+        self._executor.shutdown(wait=True)
+
+
+def get_job_queue(name='optimisation'):
+    """
+    Retourne une file de tâches partagée par les sessions du processus
+
+    Parameters:
+    -----------
+    name : str
+        File dans JOB_QUEUES : 'optimisation' (optimisations interactives) ou
+        'comparaison' (tâches des comparaisons de modèles, pool borné séparé)
+    """
+    if name not in JOB_QUEUES:
+        raise ValueError(f"File de tâches non reconnue: {name}")
+    with _QUEUE_LOCK:
+        if name not in _QUEUES:
+            _QUEUES[name] = JobQueue(max_workers=JOB_QUEUES[name])
+        return _QUEUES[name]
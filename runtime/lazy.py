@@ -0,0 +1,105 @@
+"""
+Imports différés des modules lourds et préchargement en arrière-plan
+"""
+
+import importlib
+import sys
+import threading
+import time
+
+
+# Modules lourds de l'application (Riskfolio-Lib charge aussi cvxpy et scipy)
+HEAVY_MODULES = ['riskfolio', 'models', 'yfinance', 'plotly.graph_objects']
+
+_WARM_UP_LOCK = threading.Lock()
+_WARM_UP = {'thread': None, 'timings': {}, 'errors': {}}
+
+
+class LazyModule:
+    """
+    Mandataire d'un module importé au premier accès à l'un de ses attributs
+
+    `yf = lazy_import('yfinance')` ne coûte rien ; `yf.download(...)` importe yfinance
+    (une seule fois, le système d'import de Python étant protégé par des verrous) puis
+    délègue l'appel. Les remplacements d'attributs faits sur le vrai module (tests)
+    restent visibles à travers le mandataire.
+    """
+
+    def __init__(self, name):
+        self.__dict__['_name'] = name
+
+    def _load(self):
+        return importlib.import_module(self._name)
+
+    @property
+    def loaded(self):
+        """Vrai si le module est déjà importé dans ce processus"""
+        return self._name in sys.modules
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = 'chargé' if self.loaded else 'non chargé'
+        return f"<LazyModule '{self._name}' ({state})>"
+
+
+def lazy_import(name):
+    """Retourne un mandataire du module `name`, importé à la première utilisation"""
+    return LazyModule(name)
+
+
+def _warm_up(names):
+    for name in names:
+        start = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            _WARM_UP['errors'][name] = str(e)
+        _WARM_UP['timings'][name] = time.perf_counter() - start
+
+
+def start_warm_up(names=None):
+    """
+    Précharge les modules lourds dans un thread d'arrière-plan, une seule fois par processus
+
+    À appeler après le rendu d'une page légère : les imports s'exécutent pendant que
+    l'utilisateur lit la page, et la page d'optimisation les trouve déjà chargés. Un
+    import demandé pendant le préchargement attend simplement sa fin.
+
+    Parameters:
+    -----------
+    names : list ou None
+        Modules à précharger (None = HEAVY_MODULES)
+
+    Returns:
+    --------
+    threading.Thread : thread de préchargement (déjà démarré, éventuellement terminé)
+    """
+    with _WARM_UP_LOCK:
+        if _WARM_UP['thread'] is None:
+            _WARM_UP['thread'] = threading.Thread(
+                target=_warm_up,
+                args=(list(names or HEAVY_MODULES),),
+                name='warm-up-imports',
+                daemon=True
+            )
+            _WARM_UP['thread'].start()
+        return _WARM_UP['thread']
+
+
+def warm_up_status():
+    """Retourne l'état du préchargement : {'started', 'done', 'timings', 'errors'}"""
+    thread = _WARM_UP['thread']
+    return {
+        'started': thread is not None,
+        'done': thread is not None and not thread.is_alive(),
+        'timings': dict(_WARM_UP['timings']),
+        'errors': dict(_WARM_UP['errors'])
+    }
@@ -0,0 +1,91 @@
+"""
+Mesure de la mémoire résidente du processus pendant un calcul (échantillonnage RSS)
+"""
+
+import os
+import threading
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# Intervalle d'échantillonnage de la mémoire résidente (secondes)
+SAMPLE_INTERVAL = 0.05
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def rss_bytes():
+    """
+    Mémoire résidente courante du processus (octets)
+
+    Lue dans /proc/self/statm (Linux) ; à défaut, le pic depuis le démarrage du processus
+    (getrusage), et None si aucune mesure n'est disponible.
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        pass
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if os.uname().sysname == 'Darwin' else peak * 1024
+    return None
+
+
+class MemoryTracker:
+    """
+    Échantillonne la mémoire résidente pendant un bloc et retient son pic
+
+    La mesure porte sur tout le processus : avec plusieurs calculs simultanés (sessions
+    Streamlit, workers), l'écart au pic inclut leurs allocations.
+
+    Attributes:
+    -----------
+    start, peak, end : int ou None
+        Mémoire résidente au début, maximale et à la fin du bloc (octets)
+
+    Usage :
+        with MemoryTracker() as memory:
+            calcul()
+        memory.peak_delta  # octets alloués au pic, au-delà de la mémoire initiale
+    """
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.start = self.peak = self.end = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        value = rss_bytes()
+        if value is not None and (self.peak is None or value > self.peak):
+            self.peak = value
+        return value
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self):
+        self.start = self._sample()
+        if self.start is not None:
+            self._thread = threading.Thread(target=self._run, name='memory-tracker', daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.end = self._sample()
+        return False
+
+    @property
+    def peak_delta(self):
+        """Pic de mémoire au-delà de la mémoire initiale (octets), None si non mesuré"""
+        if self.start is None or self.peak is None:
+            return None
+        return max(self.peak - self.start, 0)
@@ -0,0 +1,230 @@
+"""
+Magasin des cours partagé par les sessions : une série par symbole, vues sans copie
+
+Chaque symbole n'est téléchargé et conservé qu'une fois par processus, quel que soit le
+nombre de sessions et d'univers qui le contiennent. Le tableau de prix d'une session est
+assemblé à partir de vues en lecture seule sur ces séries ; il compte comme une
+référence sur ses symboles jusqu'à sa destruction, et seuls les symboles sans référence
+peuvent être évincés.
+"""
+
+import threading
+import weakref
+from collections import OrderedDict
+
+import pandas as pd
+
+from .timing import span
+
+
+# Taille maximale des séries sans référence conservées par le magasin (octets)
+MAX_PRICE_STORE_BYTES = 256 * 1024 ** 2
+
+_STORE_LOCK = threading.Lock()
+_STORE = {'instance': None}
+
+
+def _column_values(raw, ticker):
+    """Cours d'un symbole sans valeurs manquantes : (dates sans fuseau, valeurs en lecture seule)"""
+    column = raw[ticker].dropna() if ticker in raw.columns else pd.Series(dtype=float)
+    dates = pd.DatetimeIndex(column.index)
+    if dates.tz is not None:
+        dates = dates.tz_localize(None)
+    values = column.to_numpy(dtype=float, copy=True)
+    values.flags.writeable = False
+    return dates, values
+
+
+def _assemble(tickers, entries, start, end):
+    """
+    Assemble le tableau de prix d'une période à partir des séries du magasin
+
+    Un symbole coté aux mêmes dates que l'ensemble du tableau est une vue sur sa série ;
+    les autres sont réindexés sur l'union des dates puis complétés (ffill puis bfill),
+    comme le nettoyage appliqué à un téléchargement groupé.
+
+    Returns:
+    --------
+    tuple : (pd.DataFrame dates x symboles, nombre de colonnes copiées)
+    """
+    slices = []
+    for entry in entries:
+        first, last = entry['dates'].searchsorted([start, end])
+        slices.append((entry['dates'][first:last], entry['values'][first:last]))
+
+    index = slices[0][0]
+    for dates, _ in slices[1:]:
+        if not dates.equals(index):
+            index = index.union(dates)
+
+    columns = {}
+    copies = 0
+    for ticker, (dates, values) in zip(tickers, slices):
+        if dates.equals(index):
+            columns[ticker] = values
+        else:
+            columns[ticker] = pd.Series(values, index=dates).reindex(index).ffill().bfill().to_numpy()
+            copies += 1
+    return pd.DataFrame(columns, index=index.rename('Date'), copy=False), copies
+
+
+class PriceStore:
+    """
+    Cours de clôture par symbole, partagés par les sessions du processus
+
+    Chaque symbole est conservé avec la période téléchargée ; une demande couverte par
+    cette période est servie sans téléchargement, une demande plus large retélécharge le
+    symbole sur l'union des deux périodes. Les téléchargements sont sérialisés : deux
+    sessions demandant le même symbole ne le téléchargent qu'une fois.
+
+    Parameters:
+    -----------
+    max_bytes : int
+        Taille au-delà de laquelle les symboles sans référence les moins récemment
+        utilisés sont évincés (les symboles référencés ne le sont jamais)
+    """
+
+    def __init__(self, max_bytes=MAX_PRICE_STORE_BYTES):
+        self.max_bytes = int(max_bytes)
+        self._series = OrderedDict()
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+        self._stats = {'bytes': 0, 'hits': 0, 'misses': 0, 'evictions': 0, 'panels': 0, 'copies': 0}
+
+    def _pin(self, tickers, start, end):
+        """Référence les symboles couverts par la période et retourne les autres"""
+        missing = []
+        with self._lock:
+            for ticker in tickers:
+                entry = self._series.get(ticker)
+                if entry is None or entry['start'] > start or entry['end'] < end:
+                    missing.append(ticker)
+                else:
+                    entry['refs'] += 1
+                    self._series.move_to_end(ticker)
+            self._stats['hits'] += len(tickers) - len(missing)
+        return missing
+
+    def _fetch(self, tickers, start, end, fetch):
+        """Télécharge des symboles et les ajoute au magasin, déjà référencés"""
+        with self._lock:
+            known = [self._series[ticker] for ticker in tickers if ticker in self._series]
+        start = min([start] + [entry['start'] for entry in known])
+        end = max([end] + [entry['end'] for entry in known])
+        raw = fetch(tickers, start, end)
+
+        entries = {}
+        for ticker in tickers:
+            dates, values = _column_values(raw, ticker)
+            entries[ticker] = {'dates': dates, 'values': values, 'start': start, 'end': end, 'refs': 1,
+                               'bytes': values.nbytes + dates.nbytes}
+        with self._lock:
+            for ticker, entry in entries.items():
+                previous = self._series.pop(ticker, None)
+                if previous is not None:
+                    # Les tableaux existants gardent leurs vues sur l'ancienne série
+                    entry['refs'] += previous['refs']
+                    self._stats['bytes'] -= previous['bytes']
+                self._series[ticker] = entry
+                self._stats['bytes'] += entry['bytes']
+            self._stats['misses'] += len(entries)
+            self._evict()
+
+    def _evict(self):
+        while self._stats['bytes'] > self.max_bytes:
+            ticker = next((name for name, entry in self._series.items() if entry['refs'] == 0), None)
+            if ticker is None:
+                return
+            self._stats['bytes'] -= self._series.pop(ticker)['bytes']
+            self._stats['evictions'] += 1
+
+    def _release(self, tickers):
+        with self._lock:
+            for ticker in tickers:
+                entry = self._series.get(ticker)
+                if entry is not None:
+                    entry['refs'] = max(entry['refs'] - 1, 0)
+            self._evict()
+
+    def panel(self, tickers, start, end, fetch):
+        """
+        Tableau des cours de clôture de plusieurs symboles sur une période
+
+        Parameters:
+        -----------
+        tickers : list de str
+            Symboles (colonnes du tableau, dans cet ordre)
+        start, end : date
+            Période [start, end[ (fin exclue, comme yfinance)
+        fetch : callable
+            fetch(tickers, start, end) -> pd.DataFrame des cours bruts (dates x symboles),
+            appelé pour les seuls symboles absents ou insuffisamment couverts
+
+        Returns:
+        --------
+        pd.DataFrame : dates x symboles, en lecture seule ; les dates sans aucun cours
+                       sont retirées, les cours manquants complétés (ffill puis bfill)
+        """
+        tickers = list(dict.fromkeys(tickers))
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        with span('magasin de prix') as record:
+            # Les symboles sont référencés dès qu'ils sont trouvés ou ajoutés : ils ne
+            # peuvent plus être évincés avant d'être assemblés
+            missing = self._pin(tickers, start, end)
+            pinned = [ticker for ticker in tickers if ticker not in missing]
+            fetched = []
+            try:
+                if missing:
+                    with self._fetch_lock:
+                        # Une autre session a pu télécharger ces symboles entre-temps
+                        fetched = self._pin(missing, start, end)
+                        pinned += [ticker for ticker in missing if ticker not in fetched]
+                        if fetched:
+                            self._fetch(fetched, start, end, fetch)
+                            pinned += fetched
+                with self._lock:
+                    entries = [self._series[ticker] for ticker in tickers]
+                    self._stats['panels'] += 1
+                frame, copies = _assemble(tickers, entries, start, end)
+            except Exception:
+                self._release(pinned)
+                raise
+            weakref.finalize(frame, self._release, tickers)
+            with self._lock:
+                self._stats['copies'] += copies
+            if record is not None:
+                record.attrs['téléchargés'] = len(fetched)
+                record.attrs['copies'] = copies
+        return frame
+
+    def info(self):
+        """
+        Retourne l'état du magasin
+
+        Returns:
+        --------
+        dict : {'tickers', 'referenced', 'bytes', 'max_bytes', 'hits', 'misses', 'evictions',
+                'panels', 'copies'} ; hits et misses comptent les symboles servis depuis le
+                magasin ou téléchargés, copies les colonnes qui n'ont pas pu être des vues
+        """
+        with self._lock:
+            return dict(
+                self._stats,
+                tickers=len(self._series),
+                referenced=sum(entry['refs'] > 0 for entry in self._series.values()),
+                max_bytes=self.max_bytes
+            )
+
+    def clear(self):
+        """Retire les symboles sans référence"""
+        with self._lock:
+            for ticker in [name for name, entry in self._series.items() if entry['refs'] == 0]:
+                self._stats['bytes'] -= self._series.pop(ticker)['bytes']
+
+
+def get_price_store():
+    """Retourne le magasin des cours partagé par les sessions du processus"""
+    with _STORE_LOCK:
+        if _STORE['instance'] is None:
+            _STORE['instance'] = PriceStore()
+        return _STORE['instance']
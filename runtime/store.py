@@ -0,0 +1,225 @@
+"""
+Historique persistant des optimisations (SQLite), dédupliqué par empreinte des données
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+
+# Chemin par défaut de la base (modifiable par la variable d'environnement RUN_STORE_PATH)
+DEFAULT_STORE_PATH = os.environ.get('RUN_STORE_PATH', 'runs.sqlite')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    fingerprint TEXT NOT NULL,
+    model TEXT NOT NULL,
+    risk_measure TEXT NOT NULL,
+    params_key TEXT NOT NULL,
+    params TEXT NOT NULL,
+    status TEXT NOT NULL,
+    error TEXT,
+    metrics TEXT,
+    timings TEXT,
+    n_obs INTEGER,
+    n_assets INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_runs_lookup ON runs (fingerprint, model, risk_measure, params_key, status);
+CREATE INDEX IF NOT EXISTS idx_runs_model ON runs (model, created_at);
+CREATE TABLE IF NOT EXISTS run_weights (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    asset TEXT NOT NULL,
+    weight REAL NOT NULL,
+    PRIMARY KEY (run_id, asset)
+) WITHOUT ROWID;
+"""
+
+_STORES_LOCK = threading.Lock()
+_STORES = {}
+
+
+def _params_key(params):
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+class RunStore:
+    """
+    Base SQLite des exécutions : paramètres, poids, métriques, statut et durées
+
+    Chaque exécution est indexée par (empreinte des rendements, modèle, mesure de
+    risque, paramètres) : une demande identique à une exécution réussie peut être servie
+    sans ré-optimiser. Les poids sont stockés ligne à ligne (run_weights) pour que les
+    requêtes sur l'historique (dérive des poids d'un modèle) restent des requêtes SQL.
+
+    Parameters:
+    -----------
+    path : str
+        Chemin du fichier SQLite (':memory:' pour une base temporaire)
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        if self.path != ':memory:':
+            self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA foreign_keys=ON')
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def lookup(self, fingerprint, model, risk_measure, params):
+        """
+        Retourne la dernière exécution réussie identique, ou None
+
+        Returns:
+        --------
+        dict ou None : {'id', 'created_at', 'weights' (pd.Series), 'metrics', 'timings'}
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, created_at, metrics, timings FROM runs "
+                "WHERE fingerprint = ? AND model = ? AND risk_measure = ? AND params_key = ? AND status = 'optimal' "
+                "ORDER BY id DESC LIMIT 1",
+                (fingerprint, model, risk_measure, _params_key(params))
+            ).fetchone()
+            if row is None:
+                return None
+            weights = self._conn.execute(
+                "SELECT asset, weight FROM run_weights WHERE run_id = ?", (row[0],)
+            ).fetchall()
+
+        return {
+            'id': row[0],
+            'created_at': row[1],
+            'weights': pd.Series(dict(weights), name='weights', dtype=float),
+            'metrics': json.loads(row[2]) if row[2] else None,
+            'timings': json.loads(row[3]) if row[3] else {}
+        }
+
+    def record(self, fingerprint, model, risk_measure, params, status, weights=None, metrics=None,
+               timings=None, error=None, n_obs=None):
+        """
+        Enregistre une exécution
+
+        Parameters:
+        -----------
+        fingerprint : str
+            Empreinte des rendements
+        model, risk_measure : str
+            Modèle et mesure de risque
+        params : dict
+            Paramètres utilisés par le modèle (taux sans risque compris)
+        status : str
+            Statut de l'optimisation ('optimal', 'infeasible', 'error')
+        weights : pd.Series, pd.DataFrame (une colonne) ou None
+            Poids optimaux
+        metrics, timings : dict ou None
+            Métriques et durées
+        error : str ou None
+            Message d'erreur
+        n_obs : int ou None
+            Nombre d'observations des rendements
+
+        Returns:
+        --------
+        int : identifiant de l'exécution
+        """
+        if isinstance(weights, pd.DataFrame):
+            weights = weights.iloc[:, 0]
+        rows = [] if weights is None else [(str(asset), float(w)) for asset, w in weights.items()]
+
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO runs (created_at, fingerprint, model, risk_measure, params_key, params, status, "
+                "error, metrics, timings, n_obs, n_assets) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (time.time(), fingerprint, model, risk_measure, _params_key(params),
+                 json.dumps(params, default=str), status, error,
+                 json.dumps(metrics, default=float) if metrics is not None else None,
+                 json.dumps(timings or {}), n_obs, len(rows) or None)
+            )
+            run_id = cursor.lastrowid
+            self._conn.executemany(
+                "INSERT INTO run_weights (run_id, asset, weight) VALUES (?, ?, ?)",
+                [(run_id, asset, w) for asset, w in rows]
+            )
+        return run_id
+
+    def history(self, model=None, risk_measure=None, fingerprint=None, limit=100):
+        """
+        Liste les exécutions, des plus récentes aux plus anciennes
+
+        Returns:
+        --------
+        pd.DataFrame : une ligne par exécution (métriques et durées en colonnes)
+        """
+        where, args = self._filters(model, risk_measure, fingerprint)
+        with self._lock:
+            frame = pd.read_sql_query(
+                f"SELECT id, created_at, fingerprint, model, risk_measure, params, status, error, metrics, timings "
+                f"FROM runs {where} ORDER BY id DESC LIMIT ?",
+                self._conn, params=args + [int(limit)]
+            )
+
+        frame['created_at'] = pd.to_datetime(frame['created_at'], unit='s')
+        # Les colonnes JSON sans valeur sont relues comme NaN (chaînes pandas)
+        metrics = pd.DataFrame([json.loads(m) if isinstance(m, str) else {} for m in frame.pop('metrics')],
+                               index=frame.index)
+        timings = pd.DataFrame([json.loads(t) if isinstance(t, str) else {} for t in frame.pop('timings')],
+                               index=frame.index)
+        timings.columns = [f"durée {name} (s)" for name in timings.columns]
+        return pd.concat([frame, metrics, timings], axis=1)
+
+    def weight_drift(self, model, risk_measure=None, fingerprint=None):
+        """
+        Évolution des poids d'un modèle au fil de ses exécutions réussies
+
+        Returns:
+        --------
+        pd.DataFrame : dates d'exécution x actifs (0 pour un actif absent d'une exécution)
+        """
+        where, args = self._filters(model, risk_measure, fingerprint, prefix='r.')
+        where += (" AND " if where else "WHERE ") + "r.status = 'optimal'"
+        with self._lock:
+            frame = pd.read_sql_query(
+                f"SELECT r.id, r.created_at, w.asset, w.weight FROM runs r "
+                f"JOIN run_weights w ON w.run_id = r.id {where} ORDER BY r.id",
+                self._conn, params=args
+            )
+
+        if frame.empty:
+            return pd.DataFrame()
+        drift = frame.pivot_table(index=['id', 'created_at'], columns='asset', values='weight', fill_value=0.0)
+        drift.index = pd.to_datetime(drift.index.get_level_values('created_at'), unit='s')
+        drift.index.name = 'Date'
+        drift.columns.name = None
+        return drift
+
+    def _filters(self, model, risk_measure, fingerprint, prefix=''):
+        clauses, args = [], []
+        for column, value in [('model', model), ('risk_measure', risk_measure), ('fingerprint', fingerprint)]:
+            if value is not None:
+                clauses.append(f"{prefix}{column} = ?")
+                args.append(value)
+        return ("WHERE " + " AND ".join(clauses)) if clauses else "", args
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+
+def get_run_store(path=None):
+    """Retourne la base des exécutions partagée par le processus pour un chemin donné"""
+    path = str(path or DEFAULT_STORE_PATH)
+    with _STORES_LOCK:
+        if path not in _STORES:
+            _STORES[path] = RunStore(path)
+        return _STORES[path]
@@ -0,0 +1,235 @@
+"""
+Chronométrage des étapes (temps réel et temps CPU) et journal au format JSON lines
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+
+# Journal des durées (modifiable par la variable d'environnement TIMINGS_PATH)
+DEFAULT_TIMINGS_PATH = os.environ.get('TIMINGS_PATH', 'timings.jsonl')
+
+# Taille au-delà de laquelle le journal est renommé en <chemin>.1 (ancienne archive
+# remplacée) : au plus deux fois cette taille sur disque ; 0 désactive le journal
+MAX_TIMINGS_BYTES = int(float(os.environ.get('TIMINGS_MAX_MB', 10)) * 2**20)
+
+_CURRENT = contextvars.ContextVar('timeline', default=None)
+_WRITE_LOCK = threading.Lock()
+
+
+@dataclass
+class Span:
+    """
+    Étape chronométrée
+
+    Attributes:
+    -----------
+    name : str
+        Nom de l'étape
+    parent : str ou None
+        Nom de l'étape englobante
+    depth : int
+        Profondeur d'imbrication (0 pour une étape de premier niveau)
+    start : float
+        Début, en secondes depuis la création de la chronologie
+    wall : float
+        Temps réel écoulé (s)
+    cpu : float
+        Temps CPU du thread (s) ; un écart important avec wall signale une attente
+        (réseau, verrou, autre thread)
+    attrs : dict
+        Informations complémentaires (cache, modèle, taille, ...)
+    """
+    name: str
+    parent: str = None
+    depth: int = 0
+    start: float = 0.0
+    wall: float = None
+    cpu: float = None
+    attrs: dict = field(default_factory=dict)
+
+
+class Timeline:
+    """
+    Chronologie des étapes d'une exécution (affichage d'une page, tâche d'arrière-plan)
+
+    Une chronologie est remplie par un seul thread. Activée (`with timeline.activate()`),
+    elle reçoit les étapes ouvertes par `span()` dans le code appelé, sans qu'il faille
+    la transmettre en paramètre.
+
+    Parameters:
+    -----------
+    kind : str
+        Type d'exécution ('page', 'tâche', ...)
+    **attrs
+        Informations communes à toutes les étapes (session, modèle, ...)
+    """
+
+    def __init__(self, kind, **attrs):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.attrs = attrs
+        self.created_at = time.time()
+        self.spans = []
+        self._origin = time.perf_counter()
+        self._stack = []
+        self._index = {}
+
+    @contextmanager
+    def span(self, name, **attrs):
+        """
+        Chronomètre le bloc ; le Span produit peut être complété (attrs) dans le bloc
+
+        Les étapes répétées sous un même parent (une optimisation par rééchantillonnage
+        bootstrap, par exemple) sont cumulées dans un seul Span dont l'attribut 'appels'
+        compte les passages.
+        """
+        parent = self._stack[-1] if self._stack else None
+        key = (id(parent), name)
+        record = self._index.get(key)
+        if record is None:
+            record = Span(
+                name=name,
+                parent=parent.name if parent is not None else None,
+                depth=len(self._stack),
+                start=time.perf_counter() - self._origin,
+                attrs=attrs
+            )
+            self._index[key] = record
+            self.spans.append(record)
+        else:
+            record.attrs['appels'] = record.attrs.get('appels', 1) + 1
+            record.attrs.update(attrs)
+
+        self._stack.append(record)
+        wall_start, cpu_start = time.perf_counter(), time.thread_time()
+        try:
+            yield record
+        finally:
+            record.wall = (record.wall or 0.0) + time.perf_counter() - wall_start
+            record.cpu = (record.cpu or 0.0) + time.thread_time() - cpu_start
+            self._stack.pop()
+
+    @contextmanager
+    def activate(self):
+        """Fait de cette chronologie la destination des étapes ouvertes par span()"""
+        token = _CURRENT.set(self)
+        try:
+            yield self
+        finally:
+            _CURRENT.reset(token)
+
+    @property
+    def total(self):
+        """Temps réel cumulé des étapes de premier niveau (s)"""
+        return sum(s.wall or 0.0 for s in self.spans if s.depth == 0)
+
+    def records(self):
+        """Étapes terminées sous forme de dictionnaires (une ligne JSON chacune)"""
+        return [
+            dict(
+                {'timeline': self.id, 'kind': self.kind, 'created_at': self.created_at},
+                **self.attrs,
+                name=s.name, parent=s.parent, depth=s.depth, start=s.start, wall=s.wall, cpu=s.cpu,
+                attrs=s.attrs
+            )
+            for s in self.spans if s.wall is not None
+        ]
+
+    def frame(self):
+        """
+        Tableau des étapes, dans l'ordre d'exécution, indentées selon leur imbrication
+
+        Returns:
+        --------
+        pd.DataFrame : Étape, Temps réel (s), Temps CPU (s), Détails
+        """
+        rows = [{
+            'Étape': '    ' * s.depth + ('↳ ' if s.depth else '') + s.name,
+            'Temps réel (s)': s.wall,
+            'Temps CPU (s)': s.cpu,
+            'Détails': ', '.join(f"{k}={v}" for k, v in s.attrs.items())
+        } for s in self.spans if s.wall is not None]
+        return pd.DataFrame(rows, columns=['Étape', 'Temps réel (s)', 'Temps CPU (s)', 'Détails'])
+
+
+def current_timeline():
+    """Retourne la chronologie active du contexte courant, ou None"""
+    return _CURRENT.get()
+
+
+@contextmanager
+def span(name, **attrs):
+    """
+    Chronomètre un bloc dans la chronologie active ; sans chronologie active, ne fait rien
+
+    Returns:
+    --------
+    Span ou None (valeur du `with ... as`)
+    """
+    timeline = _CURRENT.get()
+    if timeline is None:
+        yield None
+        return
+    with timeline.span(name, **attrs) as record:
+        yield record
+
+
+def write_timeline(timeline, path=None):
+    """
+    Ajoute les étapes d'une chronologie au journal JSON lines (une ligne par étape)
+
+    Le journal est archivé en <chemin>.1 lorsqu'il dépasse MAX_TIMINGS_BYTES.
+
+    Parameters:
+    -----------
+    timeline : Timeline
+        Chronologie à enregistrer
+    path : str ou None
+        Chemin du journal (DEFAULT_TIMINGS_PATH par défaut)
+
+    Returns:
+    --------
+    int : nombre de lignes écrites
+    """
+    if MAX_TIMINGS_BYTES <= 0:
+        return 0
+    lines = [json.dumps(record, ensure_ascii=False, default=str) for record in timeline.records()]
+    if not lines:
+        return 0
+    path = path or DEFAULT_TIMINGS_PATH
+    with _WRITE_LOCK:
+        if os.path.exists(path) and os.path.getsize(path) >= MAX_TIMINGS_BYTES:
+            os.replace(path, path + '.1')
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+    return len(lines)
+
+
+def read_timings(path=None):
+    """
+    Lit le journal des durées (archive <chemin>.1 comprise) pour l'agréger entre sessions
+
+    Returns:
+    --------
+    pd.DataFrame : une ligne par étape enregistrée (vide si le journal n'existe pas)
+    """
+    path = path or DEFAULT_TIMINGS_PATH
+    paths = [p for p in (path + '.1', path) if os.path.exists(p) and os.path.getsize(p) > 0]
+    if not paths:
+        return pd.DataFrame()
+    frame = pd.concat([
+        pd.read_json(p, lines=True, convert_dates=False, dtype={'timeline': str, 'session': str})
+        for p in paths
+    ], ignore_index=True)
+    if 'created_at' in frame:
+        frame['created_at'] = pd.to_datetime(frame['created_at'], unit='s')
+    return frame
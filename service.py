@@ -0,0 +1,408 @@
+"""
+Service HTTP local d'optimisation de portefeuille (bibliothèque standard uniquement)
+
+Usage :
+    python service.py
+    python service.py --host 127.0.0.1 --port 8765 --workers 4
+
+Endpoints :
+    GET  /health     état du service (workers, requêtes en cours, compteurs)
+    GET  /models     modèles, mesures de risque et paramètres utilisés par modèle
+    POST /optimize   optimise un portefeuille
+
+Requête /optimize (JSON) :
+    {
+        "returns": {"index": ["2024-01-02", ...], "columns": ["AAPL", ...], "data": [[...], ...]},
+        "model": "Portefeuille de Risque Minimum",
+        "risk_measure": "MV",
+        "parameters": {"rf": 0.025, "risk_aversion": 2.0}
+    }
+"prices" (même format) peut remplacer "returns" ; l'index est facultatif.
+
+Réponse : {"status", "error", "weights", "metrics", "timings", "telemetry", "coalesced", "batch_size"}
+
+Les requêtes identiques en cours de calcul sont fusionnées (un seul calcul, même
+réponse). Les requêtes concurrentes portant sur les mêmes rendements sont regroupées
+en un lot envoyé à un seul worker, qui n'estime les moments qu'une fois. Les workers
+sont des processus démarrés avec le service, qui importent Riskfolio-Lib et résolvent
+un petit problème avant la première requête.
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# Délai de regroupement des requêtes portant sur les mêmes rendements (secondes)
+BATCH_WINDOW = 0.01
+
+# Taille maximale d'un lot (un lot complet est envoyé sans attendre)
+MAX_BATCH_SIZE = 32
+
+# Durée maximale d'attente d'une réponse (secondes)
+REQUEST_TIMEOUT = 300
+
+
+def _init_worker():
+    """Importe les modules lourds et résout un petit problème (compilation cvxpy)"""
+    import warnings
+
+    import numpy as np
+    import pandas as pd
+
+    warnings.filterwarnings('ignore')
+    from models import run_model
+
+    rng = np.random.default_rng(0)
+    returns = pd.DataFrame(rng.normal(0.0005, 0.01, (60, 3)), columns=['A', 'B', 'C'])
+    run_model(returns, 'Portefeuille de Risque Minimum', 'MV', 0.0)
+
+
+def _ping():
+    return True
+
+
+def _solve_batch(returns, tasks):
+    """
+    Optimise un lot de tâches partageant les mêmes rendements
+
+    Parameters:
+    -----------
+    returns : pd.DataFrame
+        Rendements communs au lot
+    tasks : list
+        Couples ((modèle, mesure de risque), paramètres)
+
+    Returns:
+    --------
+    list : réponses JSON-sérialisables, dans l'ordre des tâches
+    """
+    from batch import run_task
+
+    responses = []
+    for task, parameters in tasks:
+        outcome = run_task(task, parameters, returns)
+        responses.append({
+            'model': outcome['model'],
+            'risk_measure': outcome['risk_measure'],
+            'status': outcome['status'],
+            'error': outcome['error'],
+            'weights': None if outcome['weights'] is None else {
+                str(asset): float(weight) for asset, weight in outcome['weights'].items()
+            },
+            'metrics': None if outcome['metrics'] is None else {
+                name: float(value) for name, value in outcome['metrics'].items()
+            },
+            'timings': outcome['timings'],
+            'telemetry': outcome['telemetry']
+        })
+    return responses
+
+
+def parse_frame(payload):
+    """
+    Construit les rendements d'une requête à partir de "returns" ou de "prices"
+
+    Returns:
+    --------
+    pd.DataFrame : rendements (dates x actifs)
+    """
+    import pandas as pd
+
+    key = 'returns' if 'returns' in payload else 'prices'
+    spec = payload.get(key)
+    if not isinstance(spec, dict) or 'data' not in spec or 'columns' not in spec:
+        raise ValueError("La requête doit contenir 'returns' ou 'prices' avec 'columns' et 'data'.")
+
+    index = pd.to_datetime(spec['index']) if spec.get('index') is not None else None
+    frame = pd.DataFrame(spec['data'], index=index, columns=[str(c) for c in spec['columns']], dtype=float)
+    if key == 'prices':
+        frame = frame.ffill().bfill().pct_change().dropna()
+    if frame.shape[1] < 2 or len(frame) < 2:
+        raise ValueError("Au moins 2 actifs et 2 observations sont nécessaires.")
+    return frame
+
+
+class OptimizationService:
+    """
+    Fusion, regroupement et répartition des optimisations sur un pool de workers
+
+    Parameters:
+    -----------
+    workers : int
+        Nombre de processus workers
+    batch_window : float
+        Délai de regroupement des requêtes portant sur les mêmes rendements
+    max_batch_size : int
+        Taille maximale d'un lot
+    """
+
+    def __init__(self, workers=2, batch_window=BATCH_WINDOW, max_batch_size=MAX_BATCH_SIZE):
+        self.workers = workers
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self._pool = None
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._batches = {}
+        self._running = 0
+        self.stats = {'requests': 0, 'coalesced': 0, 'batches': 0, 'batched_tasks': 0, 'errors': 0, 'restarts': 0}
+
+    def start(self):
+        """Démarre les workers et attend qu'ils soient tous prêts"""
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        for future in [self._pool.submit(_ping) for _ in range(self.workers)]:
+            future.result()
+        return self
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def submit(self, returns, model, risk_measure, parameters):
+        """
+        Soumet une optimisation, fusionnée avec une requête identique en cours si possible
+
+        Returns:
+        --------
+        tuple : (Future de la réponse, vrai si la requête a été fusionnée)
+        """
+        from models import model_parameters
+        from runtime.fingerprint import fingerprint
+
+        returns_key = fingerprint(returns)
+        # Seuls les paramètres utilisés par le modèle distinguent deux requêtes
+        used = {name: parameters[name] for name in model_parameters(model)}
+        used['rf'] = parameters['rf']
+        key = fingerprint(returns_key, model, risk_measure, used)
+
+        with self._lock:
+            self.stats['requests'] += 1
+            future = self._inflight.get(key)
+            if future is not None:
+                self.stats['coalesced'] += 1
+                return future, True
+
+            future = Future()
+            self._inflight[key] = future
+            batch = self._batches.get(returns_key)
+            if batch is None:
+                batch = self._batches[returns_key] = {'returns': returns, 'tasks': []}
+                self._schedule(returns_key)
+            batch['tasks'].append(((model, risk_measure), parameters, key, future))
+            full = len(batch['tasks']) >= self.max_batch_size
+
+        if full:
+            self._flush(returns_key, force=True)
+        return future, False
+
+    def _schedule(self, returns_key):
+        timer = threading.Timer(self.batch_window, self._flush, args=(returns_key,))
+        timer.daemon = True
+        timer.start()
+
+    def _flush(self, returns_key, force=False):
+        with self._lock:
+            if returns_key not in self._batches:
+                return
+            # Tant que tous les workers sont occupés, le lot continue d'accueillir les
+            # requêtes portant sur les mêmes rendements
+            if not force and self._running >= self.workers:
+                self._schedule(returns_key)
+                return
+            batch = self._batches.pop(returns_key)
+            self._running += 1
+            self.stats['batches'] += 1
+            self.stats['batched_tasks'] += len(batch['tasks'])
+
+        tasks = batch['tasks']
+        pool = self._pool
+        try:
+            work = pool.submit(_solve_batch, batch['returns'], [(task, params) for task, params, _, _ in tasks])
+        except Exception as e:
+            # Pool inutilisable (worker tué, arrêt) : les requêtes du lot reçoivent une
+            # erreur au lieu d'attendre REQUEST_TIMEOUT
+            work = Future()
+            work.set_exception(e)
+            if isinstance(e, BrokenProcessPool):
+                self._restart_pool(pool)
+        work.add_done_callback(lambda done: self._resolve(done, tasks, pool))
+
+    def _restart_pool(self, broken):
+        """Remplace un pool de workers inutilisable (une seule fois par pool cassé)"""
+        with self._lock:
+            if self._pool is not broken:
+                return
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+            self.stats['restarts'] += 1
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def _resolve(self, done, tasks, pool):
+        with self._lock:
+            self._running -= 1
+        try:
+            responses = done.result()
+        except Exception as e:
+            with self._lock:
+                self.stats['errors'] += len(tasks)
+            responses = [{'status': 'error', 'error': f"Erreur du worker: {str(e)}"}] * len(tasks)
+            if isinstance(e, BrokenProcessPool):
+                self._restart_pool(pool)
+
+        for (_, _, key, future), response in zip(tasks, responses):
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_result(dict(response, batch_size=len(tasks)))
+
+    def health(self):
+        with self._lock:
+            return {
+                'status': 'ok',
+                'workers': self.workers,
+                'inflight': len(self._inflight),
+                'running_batches': self._running,
+                'pending_batches': len(self._batches),
+                'stats': dict(self.stats)
+            }
+
+
+def validate_request(payload):
+    """
+    Valide une requête /optimize
+
+    Returns:
+    --------
+    tuple : (model, risk_measure, parameters complétés des valeurs par défaut)
+    """
+    from batch import DEFAULT_PARAMETERS
+    from models import MODEL_FUNCTIONS, risk_measures_for
+
+    model = payload.get('model')
+    if model not in MODEL_FUNCTIONS:
+        raise ValueError(f"Modèle non reconnu: {model}")
+
+    accepted = risk_measures_for(model)
+    risk_measure = payload.get('risk_measure') or next(iter(accepted))
+    if risk_measure not in accepted:
+        raise ValueError(f"Mesure de risque '{risk_measure}' non disponible pour le modèle {model}.")
+
+    parameters = payload.get('parameters') or {}
+    unknown = set(parameters) - set(DEFAULT_PARAMETERS)
+    if unknown:
+        raise ValueError(f"Paramètres non reconnus: {', '.join(sorted(unknown))}")
+    return model, risk_measure, dict(DEFAULT_PARAMETERS, **parameters)
+
+
+class OptimizationHandler(BaseHTTPRequestHandler):
+    """Gestionnaire HTTP ; le service est accessible via self.server.service"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def _send(self, code, body):
+        data = json.dumps(body, ensure_ascii=False, default=str).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send(200, self.server.service.health())
+        elif self.path == '/models':
+            from models import MODEL_FUNCTIONS, model_parameters, risk_measures_for
+
+            self._send(200, {
+                model: {'risk_measures': list(risk_measures_for(model)), 'parameters': model_parameters(model)}
+                for model in MODEL_FUNCTIONS
+            })
+        else:
+            self._send(404, {'error': f"Chemin inconnu: {self.path}"})
+
+    def do_POST(self):
+        if self.path != '/optimize':
+            self._send(404, {'error': f"Chemin inconnu: {self.path}"})
+            return
+
+        start = time.perf_counter()
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length) or b'{}')
+            model, risk_measure, parameters = validate_request(payload)
+            returns = parse_frame(payload)
+        except (ValueError, TypeError, KeyError) as e:
+            self._send(400, {'error': str(e)})
+            return
+
+        future, coalesced = self.server.service.submit(returns, model, risk_measure, parameters)
+        try:
+            response = future.result(timeout=REQUEST_TIMEOUT)
+        except TimeoutError:
+            self._send(504, {'error': "Délai d'attente dépassé."})
+            return
+
+        response = dict(response, coalesced=coalesced)
+        response['timings'] = dict(response.get('timings') or {}, request=time.perf_counter() - start)
+        self._send(200, response)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def serve(host='127.0.0.1', port=8765, workers=2, verbose=False, ready=None):
+    """
+    Démarre le service et traite les requêtes jusqu'à interruption
+
+    Parameters:
+    -----------
+    ready : callable ou None
+        Appelé avec le serveur une fois les workers prêts
+    """
+    # Registre importé avant la première requête (validation des requêtes)
+    import models  # noqa: F401
+
+    service = OptimizationService(workers=workers).start()
+    server = ThreadingHTTPServer((host, port), OptimizationHandler)
+    server.daemon_threads = True
+    server.service = service
+    server.verbose = verbose
+
+    if ready is not None:
+        ready(server)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Service HTTP local d'optimisation de portefeuille")
+    parser.add_argument('--host', default='127.0.0.1', help="Adresse d'écoute")
+    parser.add_argument('--port', type=int, default=8765, help="Port d'écoute")
+    parser.add_argument('--workers', '-w', type=int, default=2, help="Nombre de processus workers")
+    parser.add_argument('--verbose', '-v', action='store_true', help="Journalise chaque requête")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    def ready(server):
+        host, port = server.server_address[:2]
+        print(f"Service prêt sur http://{host}:{port} ({args.workers} workers)", flush=True)
+
+    serve(args.host, args.port, args.workers, args.verbose, ready)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -8,6 +8,9 @@ import numpy as np
 import yfinance as yf
 from datetime import datetime, timedelta
 
+from analytics.frequency import periods_per_year
+from analytics.synthetic import synthetic_prices
+
 # Import des modèles
 from models import (
     optimize_max_return,
@@ -49,30 +52,36 @@ def test_model(model_name, optimize_func, returns, **kwargs):
         print(f"❌ {model_name} - ERROR: {str(e)}")
         return False
 
-def main():
-    """Fonction principale de test"""
+def main(synthetic=False):
+    """Fonction principale de test (données Yahoo Finance, ou synthétiques si synthetic=True)"""
     print("\n" + "="*60)
     print("TEST DE TOUS LES MODÈLES D'OPTIMISATION")
     print("="*60)
     
-    # Télécharger des données de test
-    print("\nTéléchargement des données de test...")
-    tickers = ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'META', 'TSLA', 'NVDA', 'JPM']
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=365*2)
-    
-    try:
-        data = yf.download(tickers, start=start_date, end=end_date, progress=False)
-        prices = data['Close']
-        prices = prices.dropna(how='all').ffill().bfill()
+    if synthetic:
+        # Données reproductibles, sans accès réseau
+        prices = synthetic_prices(n_assets=8, n_periods=504, seed=0)
         returns = prices.pct_change().dropna()
-        print(f"✅ Données téléchargées: {len(prices)} jours, {len(prices.columns)} actifs")
-    except Exception as e:
-        print(f"❌ Erreur lors du téléchargement: {str(e)}")
-        return
-    
-    # Paramètres communs
-    rf = 0.025
+        print(f"\n✅ Données synthétiques: {len(prices)} jours, {len(prices.columns)} actifs")
+    else:
+        # Télécharger des données de test
+        print("\nTéléchargement des données de test...")
+        tickers = ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'META', 'TSLA', 'NVDA', 'JPM']
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=365*2)
+    
+        try:
+            data = yf.download(tickers, start=start_date, end=end_date, progress=False)
+            prices = data['Close']
+            prices = prices.dropna(how='all').ffill().bfill()
+            returns = prices.pct_change().dropna()
+            print(f"✅ Données téléchargées: {len(prices)} jours, {len(prices.columns)} actifs")
+        except Exception as e:
+            print(f"❌ Erreur lors du téléchargement: {str(e)}")
+            return
+    
+    # Paramètres communs (taux sans risque annuel de 2,5 %, converti par période)
+    rf = 0.025 / periods_per_year(returns.index)
     risk_aversion = 2.0
     uncertainty = 0.5
     
@@ -126,7 +135,7 @@ def main():
         ("Hierarchical Equal Risk Contribution (HERC)", optimize_herc, 
          {'risk_measure': 'vol', 'rf': rf, 'linkage': 'ward', 'codependence': 'pearson'}),
         ("Nested Clustered Optimization (NCO)", optimize_nco, 
-         {'risk_measure': 'vol', 'rf': rf, 'obj': 'Sharpe', 'linkage': 'ward', 'codependence': 'pearson'}),
+         {'risk_measure': 'MV', 'rf': rf, 'obj': 'Sharpe', 'linkage': 'ward', 'codependence': 'pearson'}),
     ]
     
     for name, func, params in hierarchical_tests:
@@ -159,4 +168,4 @@ def main():
         sys.exit(0)
 
 if __name__ == "__main__":
-    main()
+    main(synthetic='--synthetic' in sys.argv)
@@ -0,0 +1,24 @@
+"""
+Contributions au risque : la décomposition d'Euler retrouve le risque du portefeuille
+"""
+
+import numpy as np
+import pandas as pd
+
+from analytics import ANALYTIC_CODES, portfolio_risk, risk_contributions, synthetic_returns
+
+
+def test_analytic_contributions_sum_to_risk():
+    returns = synthetic_returns(6, 500, seed=4)
+    rng = np.random.default_rng(0)
+    raw = rng.random((6, 3))
+    weights = pd.DataFrame(raw / raw.sum(axis=0), index=returns.columns, columns=['a', 'b', 'c'])
+
+    for code in ANALYTIC_CODES:
+        if code == 'variance':
+            continue
+        parts = risk_contributions(returns, weights, code, alpha=0.05)
+        expected = portfolio_risk(returns, weights, code, alpha=0.05)
+        assert np.allclose(parts['component'].sum(axis=0).to_numpy(), parts['risk']), code
+        assert np.allclose(parts['risk'], expected), code
+        assert np.allclose(parts['percent'].sum(axis=0).to_numpy(), 1.0), code
@@ -0,0 +1,66 @@
+"""
+Bootstrap : indices reproductibles à graine fixée, moments et ensembles d'incertitude
+"""
+
+import numpy as np
+
+from analytics import (
+    bootstrap_moments,
+    circular_bootstrap_indices,
+    iter_bootstrap_indices,
+    iter_bootstrap_moments,
+    stationary_bootstrap_indices,
+    synthetic_returns
+)
+
+
+def test_indices_deterministic_with_seed():
+    for generate in (stationary_bootstrap_indices, circular_bootstrap_indices):
+        first = generate(250, 20, window=5, rng=42)
+        second = generate(250, 20, window=5, rng=42)
+        assert np.array_equal(first, second)
+        assert first.shape == (20, 250)
+        assert first.min() >= 0 and first.max() < 250
+        assert not np.array_equal(first, generate(250, 20, window=5, rng=43))
+
+
+def test_blocks_are_bounded_and_reproducible():
+    blocks = list(iter_bootstrap_indices(100, 25, window=4, block_size=10, seed=7))
+    assert [len(block) for block in blocks] == [10, 10, 5]
+    again = list(iter_bootstrap_indices(100, 25, window=4, block_size=10, seed=7))
+    assert all(np.array_equal(a, b) for a, b in zip(blocks, again))
+
+
+def test_moments_match_direct_computation():
+    returns = synthetic_returns(4, 120, seed=1)
+    means, covs = bootstrap_moments(returns, n_sim=30, window=3, n_jobs=1, seed=5)
+    indices = np.vstack(list(iter_bootstrap_indices(120, 30, window=3, block_size=30, seed=5)))
+    values = returns.to_numpy()
+    rows, cols = np.triu_indices(4)
+    for k in (0, 17, 29):
+        sample = values[indices[k]]
+        assert np.allclose(means[k], sample.mean(axis=0))
+        assert np.allclose(covs[k], np.cov(sample, rowvar=False)[rows, cols])
+
+
+def test_uncertainty_box_bounds_equal_percentiles():
+    from models.uncertainty import estimate_uncertainty_sets
+
+    returns = synthetic_returns(5, 200, seed=2)
+    sets = estimate_uncertainty_sets(returns, q=0.1, n_sim=301, n_jobs=1, seed=3)
+    means, covs = bootstrap_moments(returns, n_sim=301, window=3, n_jobs=1, seed=3)
+    cov_l, cov_u = np.percentile(covs, [5, 95], axis=0)
+    rows, cols = np.triu_indices(5)
+    assert np.allclose(sets['cov_l'].to_numpy()[rows, cols], cov_l)
+    assert np.allclose(sets['cov_u'].to_numpy()[rows, cols], cov_u)
+    mu_l, mu_u = np.percentile(means, [5, 95], axis=0)
+    assert np.allclose(sets['d_mu'].to_numpy().ravel(), (mu_u - mu_l) / 2)
+
+
+def test_closing_parallel_stream_cancels_pending_blocks():
+    returns = synthetic_returns(4, 120, seed=1)
+    stream = iter_bootstrap_moments(returns, n_sim=400, window=3, n_jobs=2, executor='thread',
+                                    seed=5, max_block_bytes=10 * 4096)
+    next(stream)
+    stream.close()
+    assert stream.gi_frame is None
@@ -0,0 +1,37 @@
+"""
+Fréquence des données : rééchantillonnage et facteur d'annualisation
+"""
+
+import pandas as pd
+import pytest
+
+from analytics import DEFAULT_PERIODS, periods_per_year, resample_prices, synthetic_prices
+
+
+def test_periods_snap_to_standard_frequencies():
+    assert periods_per_year(pd.bdate_range('2020-01-01', periods=600)) == 252
+    assert periods_per_year(pd.date_range('2020-01-01', periods=600, freq='D')) == 365
+    assert periods_per_year(pd.date_range('2020-01-03', periods=150, freq='W-FRI')) == 52
+    assert periods_per_year(pd.date_range('2015-01-31', periods=60, freq='ME')) == 12
+    assert periods_per_year(pd.date_range('2010-03-31', periods=40, freq='QE')) == 4
+
+
+def test_periods_default_without_dates():
+    assert periods_per_year(pd.RangeIndex(500)) == DEFAULT_PERIODS
+    assert periods_per_year(pd.DatetimeIndex(['2024-01-02', '2024-01-03'])) == DEFAULT_PERIODS
+
+
+def test_resampled_prices_keep_last_quote():
+    prices = synthetic_prices(3, 300, seed=0)
+    weekly = resample_prices(prices, 'weekly')
+    assert weekly.index.isin(prices.index).all()
+    assert weekly.equals(prices.loc[weekly.index])
+    assert periods_per_year(weekly.pct_change().dropna().index) == 52
+    assert resample_prices(prices, 'daily') is prices
+
+
+def test_resampling_requires_dates():
+    prices = synthetic_prices(3, 50, seed=0).reset_index(drop=True)
+    assert resample_prices(prices, 'daily') is prices
+    with pytest.raises(ValueError):
+        resample_prices(prices, 'monthly')
@@ -0,0 +1,40 @@
+"""
+Historique des exécutions : enregistrement, relecture et historique mixte
+"""
+
+import pandas as pd
+
+from runtime.store import RunStore
+
+
+def test_record_lookup_round_trip():
+    store = RunStore(':memory:')
+    weights = pd.Series({'A': 0.25, 'B': 0.75})
+    params = {'rf': 0.0001, 'risk_aversion': 2.0}
+    run_id = store.record('abc', 'Modèle', 'MV', params, 'optimal', weights=weights,
+                          metrics={'Ratio de Sharpe': 1.5}, timings={'total': 0.2}, n_obs=100)
+
+    stored = store.lookup('abc', 'Modèle', 'MV', dict(reversed(list(params.items()))))
+    assert stored['id'] == run_id
+    assert stored['weights'].sort_index().to_dict() == {'A': 0.25, 'B': 0.75}
+    assert stored['metrics'] == {'Ratio de Sharpe': 1.5}
+    assert stored['timings'] == {'total': 0.2}
+
+    # Paramètres, mesure ou rendements différents : pas de résultat
+    assert store.lookup('abc', 'Modèle', 'MV', dict(params, rf=0.0)) is None
+    assert store.lookup('abc', 'Modèle', 'CVaR', params) is None
+    assert store.lookup('xyz', 'Modèle', 'MV', params) is None
+    store.close()
+
+
+def test_failed_runs_are_not_served():
+    store = RunStore(':memory:')
+    store.record('abc', 'Modèle', 'MV', {'rf': 0.0}, 'infeasible', error="Pas de solution")
+    assert store.lookup('abc', 'Modèle', 'MV', {'rf': 0.0}) is None
+
+    store.record('abc', 'Modèle', 'MV', {'rf': 0.0}, 'optimal', weights=pd.Series({'A': 1.0}),
+                 metrics={'Ratio de Sharpe': 1.0})
+    history = store.history(model='Modèle')
+    assert list(history['status']) == ['optimal', 'infeasible']
+    assert history['Ratio de Sharpe'].iloc[0] == 1.0
+    store.close()